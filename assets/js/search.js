@@ -0,0 +1,142 @@
+// =====================================================
+// search.js – Client für den statischen Suchindex (build_search.py)
+// =====================================================
+//
+// Lädt index.json und danach nur die Term-Shards der Suchbegriffe und die
+// Dokument-Blöcke der Treffer. Mehrere Begriffe = UND, in Anführungszeichen = Phrase.
+//
+// Einbinden:
+//   <form data-site-search><input name="q"><ol></ol></form>
+//   <script src="/search/search.js" defer></script>
+//   oder per JS: siteSearch("ki automatisierung").then(results => ...)
+
+(function () {
+  var script = document.currentScript;
+  var BASE = script ? new URL(".", script.src).href : "/search/";
+  // URLs im Index sind relativ zur Site-Wurzel (= Verzeichnis über search/), damit
+  // die Treffer auch unter einem Unterpfad wie /website/ stimmen
+  var ROOT = new URL("..", new URL(BASE, location.href)).href;
+  var TRANSLIT = { "ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss" };
+  var cache = {};
+
+  function load(name) {
+    if (!cache[name]) {
+      cache[name] = fetch(BASE + name).then(function (r) {
+        return r.ok ? r.json() : null;
+      });
+    }
+    return cache[name];
+  }
+
+  // Gleiche Normalisierung wie normalize_text() im Build
+  function tokenize(text) {
+    text = text.toLowerCase().replace(/[äöüß]/g, function (c) { return TRANSLIT[c]; });
+    text = text.normalize("NFKD").replace(/[\u0300-\u036f]/g, "");
+    return text.match(/[a-z0-9]+/g) || [];
+  }
+
+  // Positionen der Begriffe relativ zum Phrasenanfang (Stoppwörter zählen mit)
+  function parse(query, meta) {
+    var stop = new Set(meta.stopwords);
+    var groups = [];
+    (query.match(/"[^"]*"|\S+/g) || []).forEach(function (part) {
+      var terms = [];
+      tokenize(part).forEach(function (term, offset) {
+        if (term.length >= meta.prefix && !stop.has(term)) terms.push({ term: term, offset: offset });
+      });
+      if (terms.length) groups.push({ phrase: part.charAt(0) === '"', terms: terms });
+    });
+    return groups;
+  }
+
+  function postings(meta, term) {
+    var key = term.slice(0, meta.prefix);
+    if (meta.shards.indexOf(key) < 0) return Promise.resolve(new Map());
+    return load("terms-" + key + ".json").then(function (shard) {
+      var map = new Map();
+      ((shard && shard[term]) || []).forEach(function (p) { map.set(p[0], p.slice(1)); });
+      return map;
+    });
+  }
+
+  // Dokument → Score für eine Gruppe (Phrase: alle Begriffe im richtigen Abstand)
+  function match(group, lists) {
+    var scores = new Map();
+    lists[0].forEach(function (positions, doc) {
+      var score = 0;
+      if (group.phrase) {
+        positions.forEach(function (start) {
+          var base = start - group.terms[0].offset;
+          var hit = lists.every(function (list, i) {
+            var p = list.get(doc);
+            return p && p.indexOf(base + group.terms[i].offset) >= 0;
+          });
+          if (hit) score += 2;
+        });
+      } else if (lists.every(function (list) { return list.has(doc); })) {
+        lists.forEach(function (list) { score += list.get(doc).length; });
+      }
+      // Treffer im Titel (Position am Anfang) zählen mehr
+      if (score && positions[0] < 8) score += 5;
+      if (score) scores.set(doc, score);
+    });
+    return scores;
+  }
+
+  function siteSearch(query, limit) {
+    limit = limit || 10;
+    return load("index.json").then(function (meta) {
+      var groups = parse(query, meta);
+      if (!groups.length) return [];
+      return Promise.all(groups.map(function (group) {
+        return Promise.all(group.terms.map(function (t) { return postings(meta, t.term); }))
+          .then(function (lists) { return match(group, lists); });
+      })).then(function (results) {
+        var total = results.reduce(function (acc, scores) {
+          var next = new Map();
+          acc.forEach(function (score, doc) {
+            if (scores.has(doc)) next.set(doc, score + scores.get(doc));
+          });
+          return next;
+        });
+        var top = Array.from(total).sort(function (a, b) { return b[1] - a[1] || a[0] - b[0]; }).slice(0, limit);
+        return Promise.all(top.map(function (entry) {
+          return load("docs-" + Math.floor(entry[0] / meta.chunk) + ".json").then(function (docs) {
+            var doc = docs[entry[0] % meta.chunk];
+            return { url: new URL(doc[0], ROOT).href, title: doc[1], score: entry[1] };
+          });
+        }));
+      });
+    });
+  }
+
+  function bind(form) {
+    var input = form.querySelector("input");
+    var list = form.querySelector("ol, ul");
+    var render = function (results) {
+      list.innerHTML = "";
+      results.forEach(function (r) {
+        var li = document.createElement("li");
+        var a = document.createElement("a");
+        a.href = r.url;
+        a.textContent = r.title;
+        li.appendChild(a);
+        list.appendChild(li);
+      });
+    };
+    form.addEventListener("submit", function (e) {
+      e.preventDefault();
+      siteSearch(input.value).then(render);
+    });
+    var params = new URLSearchParams(location.search);
+    if (params.get("q")) {
+      input.value = params.get("q");
+      siteSearch(input.value).then(render);
+    }
+  }
+
+  window.siteSearch = siteSearch;
+  document.addEventListener("DOMContentLoaded", function () {
+    document.querySelectorAll("form[data-site-search]").forEach(bind);
+  });
+})();
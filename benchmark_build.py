@@ -0,0 +1,264 @@
+# =====================================================
+# benchmark_build.py – Synthetischer Skalierungs-Benchmark der Build-Pipeline
+# =====================================================
+#
+# Beispiel:
+#   python benchmark_build.py --scale 1000 --scale 10000 --jobs 4 --output bench.json
+#   python benchmark_build.py --scale 1000 --compare bench.json
+#
+# Erzeugt LANDINGPAGES, SEO_KEYWORDS, PRICING_PLANS und Bilder in einem
+# temporären Verzeichnis und misst jede Stage von build_landingpages() bis precompress().
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from build_watch import snapshot
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BASE_DIR = Path(__file__).parent.resolve()
+INTENTS_PER_KEYWORD = 1000
+PNG_STUB = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR" + b"\x00" * 13 + b"\x00\x00\x00\x00IEND\xaeB`\x82"
+
+# ----------------------------
+# SYNTHETISCHE DATEN
+# ----------------------------
+def make_landingpage(i: int, list_len: int = 5) -> dict:
+    return {
+        "title": f"KI Lösung {i}",
+        "hero": {"headline": f"KI Lösung {i} für Ihr Unternehmen", "subline": f"Automatisierung Nummer {i}", "cta": "Jetzt anfragen"},
+        "problems": [f"Problem {i}.{n}: manuelle Prozesse kosten Zeit" for n in range(list_len)],
+        "solution": {"headline": f"Lösung {i}", "text": "Agenten übernehmen wiederkehrende Aufgaben. " * 5},
+        "benefits": [f"Vorteil {i}.{n}" for n in range(list_len)],
+        "process": [f"Schritt {n}" for n in range(list_len)],
+        "trust": "Über 100 automatisierte Prozesse im Einsatz.",
+        "cta_final": "Kostenlose Analyse anfragen",
+    }
+
+def make_dataset(pages: int) -> dict:
+    """Verteilt die Seitenzahl auf ~5 % Landingpages und ~95 % SEO-Seiten"""
+    landing_count = max(1, pages // 20)
+    seo_count = max(1, pages - landing_count)
+    landingpages = {"ai-automation": make_landingpage(0)}
+    for i in range(1, landing_count):
+        landingpages[f"loesung-{i}"] = make_landingpage(i)
+
+    seo_keywords = {}
+    for k in range(0, seo_count, INTENTS_PER_KEYWORD):
+        seo_keywords[f"keyword-{k // INTENTS_PER_KEYWORD}"] = {
+            "base_title": f"Keyword {k // INTENTS_PER_KEYWORD}",
+            "intents": [f"Intent {n}" for n in range(k, min(seo_count, k + INTENTS_PER_KEYWORD))],
+            "description_template": "Professionelle {kw} – Prozesse automatisieren, Kosten senken, skalieren.",
+        }
+
+    pricing_plans = [
+        {"name": f"Plan {i}", "price": f"ab {499 + i * 100}€", "features": [f"Feature {n}" for n in range(10)], "cta": "Anfrage starten"}
+        for i in range(max(3, pages // 1000))
+    ]
+    return {"LANDINGPAGES": landingpages, "SEO_KEYWORDS": seo_keywords, "PRICING_PLANS": pricing_plans}
+
+def make_images(img_dir: Path, count: int):
+    img_dir.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        (img_dir / f"bild-{i}.png").write_bytes(PNG_STUB)
+
+# ----------------------------
+# MESSUNG
+# ----------------------------
+CLEAR_REFS = Path("/proc/self/clear_refs")
+PROC_STATUS = Path("/proc/self/status")
+
+def _maxrss_kb(who):
+    if resource is None:
+        return 0
+    scale = 1024 if sys.platform == "darwin" else 1  # macOS liefert Bytes
+    return resource.getrusage(who).ru_maxrss // scale
+
+def peak_rss_kb():
+    """Höchststand des RSS (eigener Prozess + beendete Worker) über den ganzen Lauf in KiB"""
+    if resource is None:
+        return None
+    return max(_maxrss_kb(resource.RUSAGE_SELF), _maxrss_kb(resource.RUSAGE_CHILDREN))
+
+def _vm_hwm_kb():
+    for line in PROC_STATUS.read_text().splitlines():
+        if line.startswith("VmHWM:"):
+            return int(line.split()[1])
+    return None
+
+def reset_peak() -> str:
+    """Peak-Zähler vor einer Stage zurücksetzen. Linux: VmHWM per clear_refs auf den aktuellen RSS,
+    sonst tracemalloc – das sieht nur den Python-Heap, aber wenigstens pro Stage."""
+    try:
+        CLEAR_REFS.write_text("5")
+        return "rss"
+    except OSError:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        return "tracemalloc"
+
+def stage_peak(mode: str, workers_before: int) -> dict:
+    """Peak seit reset_peak(); Worker-Prozesse zählen nur, wenn sie in dieser Stage einen neuen Höchststand hatten"""
+    own = _vm_hwm_kb() if mode == "rss" else tracemalloc.get_traced_memory()[1] // 1024
+    workers = _maxrss_kb(resource.RUSAGE_CHILDREN) if resource else 0
+    return {
+        "peak_rss_kb": own,
+        "peak_source": mode,
+        "workers_peak_rss_kb": workers if workers > workers_before else None,
+    }
+
+def bytes_written(before: dict, after: dict) -> int:
+    """Größe aller Dateien, die in der Stage neu entstanden oder geändert wurden"""
+    return sum(sig[1] for path, sig in after.items() if before.get(path) != sig)
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=BASE_DIR, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+def run_benchmark(pages: int, jobs: int, quiet: bool = True) -> dict:
+    workdir = Path(tempfile.mkdtemp(prefix=f"bench-{pages}-"))
+    # Import im leeren Arbeitsverzeichnis, damit keine echten Lead-Dateien angefasst werden
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        sys.path.insert(0, str(BASE_DIR))
+        import build_website as site
+
+        dist = workdir / "dist"
+        data = make_dataset(pages)
+        site.LANDINGPAGES = data["LANDINGPAGES"]
+        site.SEO_KEYWORDS = data["SEO_KEYWORDS"]
+        site.PRICING_PLANS = data["PRICING_PLANS"]
+        site.IMG_DIR = workdir / "images"
+        site.DIST_DIR = dist
+        make_images(site.IMG_DIR, max(1, pages // 100))
+
+        tracer = site.TRACER
+        tracer.reset()
+        site.FRAGMENTS.clear()
+        manifest = site.BuildManifest(dist)
+        related = {}
+        stages = [
+            ("asset copy", lambda: site.copy_images(dist)),
+            ("related", lambda: related.update(site.build_related_index(dist))),
+            ("css", lambda: site.build_shared_css(dist, related)),
+            ("landingpages", lambda: site.build_landingpages(dist, manifest, jobs, related)),
+            ("seo pages", lambda: site.build_seo_pages(dist, manifest, jobs, related)),
+            ("pricing", lambda: (site.build_pricing_page(dist, manifest), site.build_saas_placeholders(dist, manifest))),
+            ("minify", lambda: site.minify_pages(dist, manifest.built_paths, jobs)),
+            ("search", lambda: site.build_search(dist, manifest)),
+            ("sitemap", lambda: site.build_sitemap(dist, manifest)),
+            ("qa", lambda: site.run_qa(dist, jobs)),
+            ("precompress", lambda: site.precompress(dist, jobs)),
+        ]
+        results = []
+        started = time.perf_counter()
+        for name, stage in stages:
+            output = io.StringIO() if quiet else sys.stdout
+            # Scan des Arbeitsverzeichnisses außerhalb der Zeitmessung: tatsächlich geschriebene Bytes
+            before = snapshot([workdir])
+            workers_before = _maxrss_kb(resource.RUSAGE_CHILDREN) if resource else 0
+            mode = reset_peak()
+            with contextlib.redirect_stdout(output), tracer.stage(name) as record:
+                stage()
+            memory = stage_peak(mode, workers_before)
+            results.append({
+                "name": name,
+                "wall": record["wall"],
+                "cpu": record["cpu"],
+                "pages": record["pages"],
+                "pages_per_sec": record["pages"] / record["wall"] if record["wall"] and record["pages"] else None,
+                "bytes": bytes_written(before, snapshot([workdir])),
+                **memory,
+            })
+        total = time.perf_counter() - started
+        rendered = sum(s["pages"] for s in results)
+        return {
+            "scale": pages,
+            "jobs": jobs,
+            "pages": rendered,
+            "total_wall": total,
+            "pages_per_sec": rendered / total if total else None,
+            "peak_rss_kb": peak_rss_kb(),
+            "fragments": site.FRAGMENTS.stats(),
+            "stages": results,
+        }
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+# ----------------------------
+# AUSGABE
+# ----------------------------
+def print_run(run: dict):
+    print(f"\n=== {run['scale']} Seiten, jobs={run['jobs']}: {run['total_wall']:.2f}s, "
+          f"{run['pages_per_sec'] or 0:.0f} Seiten/s, Peak RSS {run['peak_rss_kb']} KiB ===")
+    print(f"{'Stage':<14}{'Wall':>9}{'Seiten/s':>11}{'Bytes':>14}{'RSS KiB':>10}{'Worker KiB':>12}")
+    for s in run["stages"]:
+        print(f"{s['name']:<14}{s['wall']:>8.2f}s{s['pages_per_sec'] or 0:>11.0f}{s['bytes']:>14}"
+              f"{s['peak_rss_kb'] or 0:>10}{s['workers_peak_rss_kb'] or '-':>12}")
+
+def compare(runs: list, baseline: dict, baseline_file: Path):
+    old_runs = {(r["scale"], r["jobs"]): r for r in baseline["runs"]}
+    print(f"\nVergleich mit {baseline_file} (Commit {baseline.get('commit', '?')[:10]})")
+    for run in runs:
+        old = old_runs.get((run["scale"], run["jobs"]))
+        if not old:
+            continue
+        old_stages = {s["name"]: s for s in old["stages"]}
+        for s in run["stages"]:
+            o = old_stages.get(s["name"])
+            if o and o["wall"]:
+                change = (s["wall"] - o["wall"]) / o["wall"] * 100
+                marker = "⚠️" if change > 10 else "✅"
+                print(f"{marker} {run['scale']:>7} {s['name']:<14}{o['wall']:>8.2f}s → {s['wall']:>8.2f}s ({change:+.1f}%)")
+
+# ----------------------------
+# RUN
+# ----------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Synthetischer Build-Benchmark")
+    parser.add_argument("--scale", type=int, action="append", help="Seitenzahl, mehrfach möglich (Standard: 1000)")
+    parser.add_argument("--jobs", "-j", type=int, default=1)
+    parser.add_argument("--output", type=Path, default=Path("bench_results.json"))
+    parser.add_argument("--compare", type=Path, help="Früheres Ergebnis-JSON zum Vergleich")
+    parser.add_argument("--verbose", action="store_true", help="Build-Ausgaben nicht unterdrücken")
+    args = parser.parse_args()
+
+    # Vorher einlesen – --output darf dieselbe Datei sein
+    baseline = json.loads(args.compare.read_text(encoding="utf-8")) if args.compare else None
+
+    runs = []
+    for scale in args.scale or [1000]:
+        run = run_benchmark(scale, args.jobs, quiet=not args.verbose)
+        print_run(run)
+        runs.append(run)
+
+    args.output.write_text(json.dumps({
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "runs": runs,
+    }, indent=2), encoding="utf-8")
+    print(f"\n✅ Ergebnisse gespeichert → {args.output.resolve()}")
+
+    if baseline:
+        compare(runs, baseline, args.compare)
@@ -0,0 +1,205 @@
+# =====================================================
+# build_archive.py – Build direkt in ein tar/zip-Archiv + Vorschau-Server
+# =====================================================
+#
+# Schreiben:  python build_website.py --archive dist.tar.gz
+# Vorschau:   python build_archive.py dist.tar.gz --port 8000
+#
+# Format nach Endung: .zip, .tar, .tar.gz/.tgz, .tar.xz, .tar.bz2
+
+import io
+import mimetypes
+import tarfile
+import time
+import zipfile
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from urllib.parse import unquote
+
+# ----------------------------
+# CONFIG
+# ----------------------------
+TAR_MODES = {
+    ".tar": "w",
+    ".tar.gz": "w:gz",
+    ".tgz": "w:gz",
+    ".tar.xz": "w:xz",
+    ".tar.bz2": "w:bz2",
+}
+
+
+def _archive_kind(path: Path):
+    name = path.name.lower()
+    if name.endswith(".zip"):
+        return "zip", None
+    for suffix, mode in sorted(TAR_MODES.items(), key=lambda item: -len(item[0])):
+        if name.endswith(suffix):
+            return "tar", mode
+    raise ValueError(f"Unbekanntes Archivformat: {path.name}")
+
+# ----------------------------
+# WRITER
+# ----------------------------
+class ArchiveWriter:
+    """Nimmt gerenderte Seiten entgegen, ohne je einen dist-Baum anzulegen."""
+
+    def __init__(self, path: Path, compress: bool = True):
+        self.path = Path(path)
+        self.kind, mode = _archive_kind(self.path)
+        if self.kind == "tar" and not compress and mode != "w":
+            # Die Endung verspricht Kompression – lieber ablehnen als eine falsch benannte Datei schreiben
+            raise ValueError(f"{self.path.name}: compress=False geht nur mit .tar oder .zip")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.mtime = time.time()
+        self.written = set()
+        self.observers = []  # observer(rel_path, data) für jede geschriebene Seite, z.B. der Suchindex
+        if self.kind == "zip":
+            compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+            self._zip = zipfile.ZipFile(self.path, "w", compression=compression, compresslevel=6 if compress else None)
+        else:
+            self._tar = tarfile.open(self.path, mode)
+
+    @contextmanager
+    def open(self, rel_path: str):
+        """Binäre Datei im Archiv – zip wird gestreamt (außer mit Beobachtern), tar puffert im Speicher"""
+        if self.kind == "zip" and not self.observers:
+            info = zipfile.ZipInfo(rel_path, time.localtime(self.mtime)[:6])
+            info.compress_type = self._zip.compression
+            with self._zip.open(info, "w") as f:
+                yield f
+            self.written.add(rel_path)
+        else:
+            # tar braucht die Größe vorab, Beobachter den ganzen Inhalt → im Speicher puffern
+            buffer = io.BytesIO()
+            yield buffer
+            self.write_bytes(rel_path, buffer.getvalue())
+
+    def write_chunks(self, rel_path: str, chunks) -> int:
+        """Streamt Text-Chunks als UTF-8 ins Archiv, liefert die Byte-Größe"""
+        size = 0
+        with self.open(rel_path) as f:
+            for chunk in chunks:
+                data = chunk.encode("utf-8")
+                size += len(data)
+                f.write(data)
+        return size
+
+    def write_bytes(self, rel_path: str, data: bytes) -> int:
+        if self.kind == "zip":
+            self._zip.writestr(zipfile.ZipInfo(rel_path, time.localtime(self.mtime)[:6]), data, self._zip.compression)
+        else:
+            info = tarfile.TarInfo(rel_path)
+            info.size = len(data)
+            info.mtime = self.mtime
+            info.mode = 0o644
+            self._tar.addfile(info, io.BytesIO(data))
+        self.written.add(rel_path)
+        for observer in self.observers:
+            observer(rel_path, data)
+        return len(data)
+
+    def add_file(self, src: Path, rel_path: str):
+        if self.kind == "zip":
+            self._zip.write(src, rel_path)
+        else:
+            # Immer als normale Datei: tar.add() legt die zweite Kopie derselben Quelle
+            # (z.B. Asset unter Hash-Namen) sonst als Hardlink an
+            st = Path(src).stat()
+            info = tarfile.TarInfo(rel_path)
+            info.size = st.st_size
+            info.mtime = st.st_mtime
+            info.mode = 0o644
+            with open(src, "rb") as f:
+                self._tar.addfile(info, f)
+        self.written.add(rel_path)
+
+    def add_tree(self, src_dir: Path, prefix: str):
+        for src in sorted(Path(src_dir).rglob("*")):
+            if src.is_file():
+                self.add_file(src, f"{prefix}/{src.relative_to(src_dir).as_posix()}")
+
+    def close(self):
+        if self.kind == "zip":
+            self._zip.close()
+        else:
+            self._tar.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ----------------------------
+# READER
+# ----------------------------
+class ArchiveReader:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.kind, _ = _archive_kind(self.path)
+        if self.kind == "zip":
+            self._zip = zipfile.ZipFile(self.path)
+            self.names = set(self._zip.namelist())
+        else:
+            self._tar = tarfile.open(self.path, "r:*")
+            # Hardlinks (z.B. aus GNU tar): extractfile() liest das Linkziel
+            self._members = {m.name: m for m in self._tar.getmembers() if m.isfile() or m.islnk()}
+            self.names = set(self._members)
+
+    def resolve(self, url_path: str):
+        """URL → Archivpfad, Verzeichnisse werden auf index.html abgebildet"""
+        name = url_path.split("?", 1)[0].split("#", 1)[0].lstrip("/")
+        for candidate in (name, f"{name}/index.html".lstrip("/"), f"{name}index.html", f"{name}.html"):
+            if candidate in self.names:
+                return candidate
+        return None
+
+    def read(self, name: str) -> bytes:
+        if self.kind == "zip":
+            return self._zip.read(name)
+        return self._tar.extractfile(self._members[name]).read()
+
+    def close(self):
+        if self.kind == "zip":
+            self._zip.close()
+        else:
+            self._tar.close()
+
+
+def serve(path: Path, port: int = 8000):
+    reader = ArchiveReader(path)
+
+    class ArchiveHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            name = reader.resolve(unquote(self.path))
+            if name is None:
+                self.send_response(404)
+                self.end_headers()
+                return
+            data = reader.read(name)
+            self.send_response(200)
+            self.send_header("Content-Type", mimetypes.guess_type(name)[0] or "application/octet-stream")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    print(f"🚀 Vorschau von {path} auf http://localhost:{port} ({len(reader.names)} Dateien)")
+    try:
+        HTTPServer(("localhost", port), ArchiveHandler).serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reader.close()
+
+# ----------------------------
+# RUN
+# ----------------------------
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build-Archiv lokal ansehen")
+    parser.add_argument("archive", type=Path)
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    serve(args.archive, args.port)
@@ -0,0 +1,160 @@
+# =====================================================
+# build_assets.py – Inkrementeller Asset-Sync (Hardlink/Reflink statt Kopie)
+# =====================================================
+#
+# Nur geänderte Dateien werden angefasst (Größe + mtime, bei Bedarf Hash).
+# Neue Dateien werden – wenn das Dateisystem es erlaubt – per Hardlink oder
+# Reflink in den dist-Baum gelegt. Wichtig: Build-Schritte dürfen Assets in dist
+# deshalb nie in-place ändern, sondern immer neu schreiben + ersetzen.
+
+import hashlib
+import json
+import os
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+
+# ----------------------------
+# CONFIG
+# ----------------------------
+FICLONE = 0x40049409  # Linux ioctl für Reflinks (btrfs, xfs, ...)
+
+_HASHES = {}
+
+# ----------------------------
+# HASHING
+# ----------------------------
+def file_hash(path: Path, st=None) -> str:
+    """SHA-256 pro (Pfad, Größe, mtime) nur einmal pro Prozess berechnen"""
+    st = st or path.stat()
+    key = (str(path), st.st_size, st.st_mtime_ns)
+    if key not in _HASHES:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        _HASHES[key] = digest.hexdigest()
+    return _HASHES[key]
+
+# ----------------------------
+# PLATZIEREN
+# ----------------------------
+def _reflink(src: Path, dst: Path):
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError("Reflinks werden auf dieser Plattform nicht unterstützt")
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+    shutil.copystat(src, dst)
+
+def place_file(src: Path, dst: Path) -> str:
+    """Hardlink → Reflink → Kopie, atomar über eine temporäre Datei"""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(dst.name + ".tmp")
+    if tmp.exists():
+        tmp.unlink()
+    try:
+        os.link(src, tmp)
+        mode = "linked"
+    except OSError:
+        try:
+            _reflink(src, tmp)
+            mode = "reflinked"
+        except OSError:
+            if tmp.exists():
+                tmp.unlink()
+            shutil.copy2(src, tmp)
+            mode = "copied"
+    os.replace(tmp, dst)
+    return mode
+
+def _unchanged(src: Path, dst: Path, st, previous) -> bool:
+    if not dst.exists():
+        return False
+    dst_st = dst.stat()
+    if (dst_st.st_dev, dst_st.st_ino) == (st.st_dev, st.st_ino):
+        return True  # bereits Hardlink auf die Quelle
+    if dst_st.st_size != st.st_size:
+        return False
+    if previous and previous[0] == st.st_size and previous[1] == st.st_mtime_ns:
+        return True
+    if dst_st.st_mtime_ns == st.st_mtime_ns:
+        return True
+    # Nur mtime geändert (z.B. git checkout) → Inhalt vergleichen
+    known = previous[2] if previous and previous[2] else file_hash(dst, dst_st)
+    return known == file_hash(src, st)
+
+# ----------------------------
+# ATOMAR SCHREIBEN
+# ----------------------------
+@contextmanager
+def atomic_open(path: Path, mode="wb", **kwargs):
+    """In eine temporäre Datei schreiben und erst nach Erfolg über path legen.
+    Ein Hardlink auf die alte Datei (z.B. die Quelle in images/) bleibt dabei unberührt."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+def write_atomic(path: Path, data):
+    """bytes oder str (UTF-8) atomar schreiben"""
+    if isinstance(data, str):
+        with atomic_open(path, "w", encoding="utf-8") as f:
+            f.write(data)
+    else:
+        with atomic_open(path) as f:
+            f.write(data)
+
+# ----------------------------
+# SYNC
+# ----------------------------
+def sync_file(src: Path, dst: Path, previous=None) -> str:
+    st = src.stat()
+    if _unchanged(src, dst, st, previous):
+        return "unchanged"
+    return place_file(src, dst)
+
+def _state_file(dst_dir: Path) -> Path:
+    return dst_dir.parent / f".assets-{dst_dir.name}.json"
+
+def sync_tree(src_dir: Path, dst_dir: Path) -> dict:
+    """Spiegelt src_dir nach dst_dir; Zustand des letzten Builds liegt neben dst_dir"""
+    src_dir, dst_dir = Path(src_dir), Path(dst_dir)
+    state_path = _state_file(dst_dir)
+    previous = {}
+    if state_path.exists():
+        try:
+            previous = json.loads(state_path.read_text(encoding="utf-8"))
+        except ValueError:
+            previous = {}
+
+    stats = {"unchanged": 0, "linked": 0, "reflinked": 0, "copied": 0, "removed": 0}
+    current = {}
+    for src in src_dir.rglob("*"):
+        if not src.is_file():
+            continue
+        rel = src.relative_to(src_dir).as_posix()
+        st = src.stat()
+        action = sync_file(src, dst_dir / rel, previous.get(rel))
+        stats[action] += 1
+        # Hash nur übernehmen, wenn er ohnehin bekannt ist – sonst bei Bedarf im nächsten Build
+        known = _HASHES.get((str(src), st.st_size, st.st_mtime_ns))
+        if known is None and action == "unchanged" and previous.get(rel):
+            known = previous[rel][2]
+        current[rel] = [st.st_size, st.st_mtime_ns, known]
+
+    for rel in set(previous) - set(current):
+        target = dst_dir / rel
+        if target.exists():
+            target.unlink()
+            stats["removed"] += 1
+
+    write_atomic(state_path, json.dumps(current, indent=2))
+    return stats
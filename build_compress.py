@@ -0,0 +1,139 @@
+# =====================================================
+# build_compress.py – Vorkomprimierte Varianten (.gz, .zst, .br) für dist
+# =====================================================
+#
+# Schreibt neben jede HTML/CSS/JS/XML/SVG-Datei komprimierte Geschwister,
+# die der Webserver direkt ausliefern kann (z.B. nginx gzip_static/brotli_static).
+# zstd und brotli nur, wenn die Pakete installiert sind.
+# Unveränderte Dateien (Größe + mtime, bei Bedarf Hash) werden übersprungen.
+
+import gzip
+import hashlib
+import json
+from pathlib import Path
+
+from build_assets import file_hash, write_atomic
+from build_parallel import parallel_map
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# ----------------------------
+# CONFIG
+# ----------------------------
+COMPRESS_SUFFIXES = {".html", ".css", ".js", ".xml", ".svg"}
+MIN_SIZE = 256  # darunter lohnt sich Kompression nicht
+STATE_NAME = ".precompress.json"
+
+
+def _gzip(data: bytes) -> bytes:
+    # mtime=0 → gleicher Inhalt ergibt byte-identische .gz-Dateien
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+def _zstd(data: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=19).compress(data)
+
+def _brotli(data: bytes) -> bytes:
+    return brotli.compress(data, quality=11)
+
+
+ENCODERS = {".gz": _gzip}
+if zstandard is not None:
+    ENCODERS[".zst"] = _zstd
+if brotli is not None:
+    ENCODERS[".br"] = _brotli
+
+# ----------------------------
+# KOMPRIMIEREN
+# ----------------------------
+def compress_file(path: Path) -> tuple:
+    """Schreibt alle verfügbaren Varianten, liefert (Hash, Eingangs-Bytes, Ausgangs-Bytes)"""
+    data = path.read_bytes()
+    written = 0
+    for suffix, encode in ENCODERS.items():
+        packed = encode(data)
+        write_atomic(path.with_name(path.name + suffix), packed)
+        written += len(packed)
+    return hashlib.sha256(data).hexdigest(), len(data), written
+
+def _compress_job(job):
+    rel, path = job
+    return (rel,) + compress_file(Path(path))
+
+def _remove_siblings(path: Path, suffixes):
+    for suffix in suffixes:
+        sibling = path.with_name(path.name + suffix)
+        if sibling.exists():
+            sibling.unlink()
+
+# ----------------------------
+# STAGE
+# ----------------------------
+def _load_state(state_path: Path) -> dict:
+    if not state_path.exists():
+        return {}
+    try:
+        return json.loads(state_path.read_text(encoding="utf-8"))
+    except ValueError:
+        return {}
+
+def _unchanged(path: Path, st, previous, encodings) -> bool:
+    if not previous or previous[3] != encodings:
+        return False
+    if not all(path.with_name(path.name + suffix).exists() for suffix in encodings):
+        return False
+    if previous[0] == st.st_size and previous[1] == st.st_mtime_ns:
+        return True
+    # Neu geschrieben, aber gleicher Inhalt → nicht erneut komprimieren
+    return previous[2] == file_hash(path, st)
+
+def precompress(base_path: Path, jobs: int = 1) -> dict:
+    """Komprimiert geänderte Dateien, mit jobs > 1 parallel (0 → alle Kerne)"""
+    base_path = Path(base_path)
+    state_path = base_path / STATE_NAME
+    previous = _load_state(state_path)
+    encodings = sorted(ENCODERS)
+
+    current = {}
+    todo = []
+    for path in base_path.rglob("*"):
+        if path.suffix not in COMPRESS_SUFFIXES or not path.is_file():
+            continue
+        st = path.stat()
+        if st.st_size < MIN_SIZE:
+            continue
+        rel = path.relative_to(base_path).as_posix()
+        old = previous.get(rel)
+        if _unchanged(path, st, old, encodings):
+            current[rel] = [st.st_size, st.st_mtime_ns, old[2], encodings]
+        else:
+            todo.append((rel, str(path)))
+            current[rel] = [st.st_size, st.st_mtime_ns, None, encodings]
+
+    stats = {"compressed": len(todo), "unchanged": len(current) - len(todo), "removed": 0, "bytes_in": 0, "bytes_out": 0}
+    for rel, digest, size_in, size_out in parallel_map(_compress_job, todo, jobs):
+        current[rel][2] = digest
+        stats["bytes_in"] += size_in
+        stats["bytes_out"] += size_out
+
+    for rel, entry in previous.items():
+        if rel not in current:
+            # Quelle gelöscht oder zu klein geworden → alle Varianten weg
+            _remove_siblings(base_path / rel, entry[3])
+            stats["removed"] += 1
+            parent = (base_path / rel).parent
+            if parent != base_path and parent.exists() and not any(parent.iterdir()):
+                parent.rmdir()
+        else:
+            # Encoder nicht mehr verfügbar → veraltete Variante nicht liegen lassen
+            _remove_siblings(base_path / rel, set(entry[3]) - set(encodings))
+
+    write_atomic(state_path, json.dumps(current, indent=2))
+    return stats
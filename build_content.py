@@ -0,0 +1,264 @@
+# =====================================================
+# build_content.py – Seitenmodell: alle Inhaltsquellen einmal laden
+# =====================================================
+#
+# Quellen: PAGES, content.json, pages.json, content/pages.json, LANDINGPAGES,
+# PRICING_PLANS und die Unterseiten (SUBPAGES + <name>/content/pages.json).
+# Jede Seite ist ein kompaktes __slots__-Objekt (kein Dict pro Seite), Listen
+# werden zu Tupeln und können zwischen Seiten geteilt werden.
+# Abgeleitete Felder (rel_path, digest, text) werden erst beim Zugriff berechnet.
+
+import json
+import re
+from html import unescape
+from pathlib import Path
+
+from build_manifest import hash_inputs
+
+# ----------------------------
+# CONFIG
+# ----------------------------
+# Format der Einträge aus PAGES (build_website) – JSON-Quellen bringen vollständige Titel mit
+LEGACY_TITLE = "{title} – Lukas AI Solutions"
+LEGACY_DESCRIPTION = "{heading} – Professionelle AI-Lösungen"
+
+# ----------------------------
+# MODELL
+# ----------------------------
+class Record:
+    """Basis: FIELDS sind die Daten, alles in __slots__ mit _ davor ist ein Cache"""
+    __slots__ = ()
+    FIELDS = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.FIELDS, values):
+            setattr(self, name, value)
+        for name in self.__slots__:
+            if name.startswith("_"):
+                setattr(self, name, None)
+
+    def replace(self, **changes):
+        """Kopie mit geänderten Feldern – unveränderte Tupel werden geteilt, nicht kopiert"""
+        return type(self)(*(changes.get(name, getattr(self, name)) for name in self.FIELDS))
+
+    def as_dict(self) -> dict:
+        return {name: _plain(getattr(self, name)) for name in self.FIELDS}
+
+    @property
+    def digest(self) -> str:
+        """Inhalts-Hash für das Build-Manifest"""
+        if self._digest is None:
+            self._digest = hash_inputs(self.as_dict())
+        return self._digest
+
+    def __getstate__(self):
+        # Caches nicht an Worker-Prozesse schicken
+        return tuple(getattr(self, name) for name in self.FIELDS)
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.as_dict() == other.as_dict()
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{n}={getattr(self, n)!r}' for n in self.FIELDS[:2])}, …)"
+
+
+def _plain(value):
+    if isinstance(value, Record):
+        return value.as_dict()
+    if isinstance(value, tuple):
+        return [_plain(v) for v in value]
+    return value
+
+
+class Hero(Record):
+    __slots__ = ("headline", "subline", "cta", "_digest")
+    FIELDS = ("headline", "subline", "cta")
+
+
+class Section(Record):
+    __slots__ = ("headline", "text", "_digest")
+    FIELDS = ("headline", "text")
+
+
+class LandingPage(Record):
+    __slots__ = ("slug", "title", "hero", "problems", "solution", "benefits", "process", "trust", "cta_final",
+                 "_digest")
+    FIELDS = ("slug", "title", "hero", "problems", "solution", "benefits", "process", "trust", "cta_final")
+
+    @classmethod
+    def from_dict(cls, slug: str, data: dict):
+        hero = data.get("hero", {})
+        solution = data.get("solution", {})
+        return cls(
+            slug,
+            data.get("title", ""),
+            Hero(hero.get("headline", ""), hero.get("subline", ""), hero.get("cta", "")),
+            tuple(data.get("problems", ())),
+            Section(solution.get("headline", ""), solution.get("text", "")),
+            tuple(data.get("benefits", ())),
+            tuple(data.get("process", ())),
+            data.get("trust", ""),
+            data.get("cta_final", ""),
+        )
+
+    @property
+    def rel_path(self) -> str:
+        return f"{self.slug}/index.html"
+
+
+class Card(Record):
+    __slots__ = ("title", "desc", "_digest")
+    FIELDS = ("title", "desc")
+
+
+class ContentPage(Record):
+    __slots__ = ("filename", "title", "description", "headline", "body", "cards", "_digest", "_text")
+    FIELDS = ("filename", "title", "description", "headline", "body", "cards")
+
+    @classmethod
+    def from_entry(cls, entry: dict, base=None):
+        """Eintrag aus pages.json – mit base werden nur die im Eintrag gesetzten Felder übernommen"""
+        body = entry.get("body") or (f"<p>{entry['content']}</p>" if entry.get("content") else "")
+        if base is not None:
+            return base.replace(
+                title=entry["title"],
+                description=entry.get("description") or base.description,
+                headline=entry.get("headline") or base.headline,
+                body=body or base.body,
+            )
+        return cls(
+            entry.get("file") or f"{entry['slug']}.html",
+            entry["title"],
+            entry.get("description", ""),
+            entry.get("headline") or entry["title"],
+            body,
+            (),
+        )
+
+    @classmethod
+    def from_legacy(cls, filename: str, page: dict):
+        """Eintrag aus PAGES: content ist Text oder eine Liste von Cards (Services)"""
+        content = page["content"]
+        cards = tuple(Card(c["title"], c["desc"]) for c in content) if isinstance(content, list) else ()
+        return cls(
+            filename,
+            LEGACY_TITLE.format(title=page["title"]),
+            LEGACY_DESCRIPTION.format(heading=page["heading"]),
+            page["heading"],
+            "" if cards else f"<p>{content}</p>",
+            cards,
+        )
+
+    @property
+    def rel_path(self) -> str:
+        return self.filename
+
+    @property
+    def text(self) -> str:
+        """Sichtbarer Text von Body und Cards (ohne Tags)"""
+        if self._text is None:
+            parts = [self.body] + [f"{card.title} {card.desc}" for card in self.cards]
+            self._text = " ".join(unescape(re.sub(r"<[^>]+>", " ", " ".join(parts))).split())
+        return self._text
+
+
+class SubPage(Record):
+    """Seite einer Unterseiten-Site; page ist None, wenn ihre pages.json keinen Eintrag hat"""
+    __slots__ = ("site", "filename", "page", "_digest")
+    FIELDS = ("site", "filename", "page")
+
+    @property
+    def rel_path(self) -> str:
+        return self.filename
+
+
+class PricingPlan(Record):
+    __slots__ = ("name", "price", "features", "cta", "_digest")
+    FIELDS = ("name", "price", "features", "cta")
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(data["name"], data["price"], tuple(data.get("features", ())), data.get("cta", ""))
+
+
+class SiteContent:
+    __slots__ = ("site", "pages", "landingpages", "pricing", "subpages")
+
+    def __init__(self, site, pages, landingpages, pricing, subpages):
+        self.site = site
+        self.pages = pages
+        self.landingpages = landingpages
+        self.pricing = pricing
+        self.subpages = subpages
+
+    def description_for(self, page: ContentPage) -> str:
+        return page.description or self.site.get("description", "")
+
+    def outputs(self) -> dict:
+        """rel_path → Seite für alle Seiten in dist, die direkt aus dem Modell entstehen"""
+        result = {page.rel_path: page for page in self.pages.values()}
+        result.update((page.rel_path, page) for page in self.landingpages.values())
+        return result
+
+# ----------------------------
+# LADEN
+# ----------------------------
+def load_json(path: Path, default):
+    if not path.exists():
+        return default
+    # utf-8-sig: pages.json wird unter Windows mit BOM gespeichert
+    return json.loads(path.read_text(encoding="utf-8-sig"))
+
+def load_content_pages(sources, base=None) -> dict:
+    """Spätere Quellen überschreiben frühere Einträge mit gleicher Datei – feldweise"""
+    pages = dict(base or {})
+    for source in sources:
+        for entry in load_json(source, []):
+            filename = entry.get("file") or f"{entry['slug']}.html"
+            pages[filename] = ContentPage.from_entry(entry, pages.get(filename))
+    return pages
+
+def _signature(path: Path):
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+_CACHE = {}
+
+def load_content(site_file: Path, content_files, legacy_pages: dict, landingpages: dict, pricing_plans,
+                 subpages=()) -> SiteContent:
+    """Parst alle Quellen einmal pro Prozess; erst wenn sich eine Datei oder ein Dict ändert, neu.
+    subpages: (Name, Dateinamen, pages.json der Unterseite)"""
+    subpages = tuple((name, tuple(files), Path(source)) for name, files, source in subpages)
+    files = (site_file, *content_files, *(source for _, _, source in subpages))
+    key = (
+        tuple((str(p), _signature(p)) for p in files),
+        tuple((name, names) for name, names, _ in subpages),
+        id(legacy_pages), len(legacy_pages),
+        id(landingpages), len(landingpages),
+        id(pricing_plans), len(pricing_plans),
+    )
+    if _CACHE.get("key") != key:
+        legacy = {filename: ContentPage.from_legacy(filename, page) for filename, page in legacy_pages.items()}
+        sub_content = {}
+        for name, names, source in subpages:
+            entries = load_content_pages([source])
+            sub_content[name] = tuple(SubPage(name, filename, entries.get(filename)) for filename in names)
+        _CACHE["key"] = key
+        _CACHE["content"] = SiteContent(
+            load_json(site_file, {}),
+            load_content_pages(content_files, legacy),
+            {slug: LandingPage.from_dict(slug, data) for slug, data in landingpages.items()},
+            tuple(PricingPlan.from_dict(plan) for plan in pricing_plans),
+            sub_content,
+        )
+    return _CACHE["content"]
+
+def clear_content_cache():
+    _CACHE.clear()
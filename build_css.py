@@ -0,0 +1,211 @@
+# =====================================================
+# build_css.py – Ein gemeinsames Stylesheet statt <style> in jeder Seite
+# =====================================================
+#
+# 1. Quellen sammeln: verlinkte Stylesheets + <style>-Blöcke aus den Templates
+# 2. Parsen, doppelte Regeln/Deklarationen entfernen (die letzte gewinnt, wie in der Kaskade)
+# 3. Purge: Selektoren, deren Tags/Klassen/IDs in keiner gerenderten Seite vorkommen, fliegen raus
+# 4. Optional: kleiner Critical-CSS-Block (Kopfbereich) zum Inlinen
+#
+# Der Purge ist konservativ: Pseudo-Klassen und Attribut-Selektoren werden ignoriert,
+# ein Selektor bleibt, sobald alle seine Tags/Klassen/IDs irgendwo im Output vorkommen.
+
+import re
+from pathlib import Path
+
+# ----------------------------
+# CONFIG
+# ----------------------------
+CRITICAL_TAGS = {"html", "body", "header", "nav", "h1", "a"}
+CRITICAL_BUDGET = 2048  # Bytes – mehr Inline-CSS kostet auf jeder Seite
+SAFELIST = set()        # per JS gesetzte Klassen etc., z.B. {".is-open"}
+
+STYLE_BLOCK_RE = re.compile(r"<style\b[^>]*>(.*?)</style>", re.S | re.I)
+COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+TAG_RE = re.compile(r"<([a-zA-Z][a-zA-Z0-9-]*)")
+ATTR_RE = re.compile(r"""\b(class|id)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.I)
+PSEUDO_RE = re.compile(r"::?[a-zA-Z-]+(?:\([^)]*\))?|\[[^\]]*\]")
+SELECTOR_TOKEN_RE = re.compile(r"([.#]?)(-?[_a-zA-Z][\w-]*)")
+
+# ----------------------------
+# QUELLEN
+# ----------------------------
+def extract_styles(paths) -> list:
+    """Inhalt aller <style>-Blöcke der übergebenen Dateien (Templates oder fertige Seiten)"""
+    blocks = []
+    for path in sorted(Path(p) for p in paths):
+        blocks += STYLE_BLOCK_RE.findall(path.read_text(encoding="utf-8"))
+    return blocks
+
+# ----------------------------
+# PARSER
+# ----------------------------
+def _split_top(text: str, sep: str) -> list:
+    """An sep trennen – außer in Klammern und Strings (url(...;...), :is(a, b))"""
+    parts, depth, quote, start = [], 0, None, 0
+    for i, ch in enumerate(text):
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == sep and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return [p.strip() for p in parts if p.strip()]
+
+def _declarations(body: str) -> tuple:
+    decls = []
+    for decl in _split_top(body, ";"):
+        prop, _, value = decl.partition(":")
+        decls.append(f"{prop.strip().lower()}:{' '.join(value.split())}")
+    return tuple(decls)
+
+def _matching(css: str, pos: int) -> int:
+    """Index der schließenden Klammer zur öffnenden an pos"""
+    depth = 0
+    for i in range(pos, len(css)):
+        if css[i] == "{":
+            depth += 1
+        elif css[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+    return len(css)
+
+def _parse_block(css: str, pos: int, end: int) -> list:
+    rules = []
+    while pos < end:
+        brace = css.find("{", pos, end)
+        semi = css.find(";", pos, end)
+        prelude = css[pos:brace if brace != -1 else end].strip()
+        if prelude.startswith("@") and semi != -1 and (brace == -1 or semi < brace):
+            # @import, @charset, ...
+            rules.append(("statement", " ".join(css[pos:semi].split()) + ";"))
+            pos = semi + 1
+            continue
+        if brace == -1:
+            break
+        close = _matching(css, brace)
+        prelude = " ".join(prelude.split())
+        if prelude.startswith(("@media", "@supports")):
+            rules.append(("group", prelude, _parse_block(css, brace + 1, close)))
+        elif prelude.startswith("@"):
+            # @font-face, @keyframes, ... unverändert übernehmen
+            rules.append(("raw", prelude, " ".join(css[brace + 1:close].split())))
+        else:
+            selectors = tuple(" ".join(s.split()) for s in _split_top(prelude, ","))
+            rules.append(("style", selectors, _declarations(css[brace + 1:close])))
+        pos = close + 1
+    return rules
+
+def parse_css(css: str) -> list:
+    """→ ("style", Selektoren, Deklarationen) | ("group", "@media ...", Regeln) | ("raw", ...) | ("statement", ...)"""
+    css = COMMENT_RE.sub("", css)
+    return _parse_block(css, 0, len(css))
+
+# ----------------------------
+# DEDUPLIZIEREN
+# ----------------------------
+def _last_wins(items) -> list:
+    """Doppelte Einträge entfernen, die letzte Position bleibt (gleiche Kaskade wie vorher)"""
+    seen = set()
+    result = []
+    for item in reversed(items):
+        if item not in seen:
+            seen.add(item)
+            result.append(item)
+    return result[::-1]
+
+def dedupe_rules(rules) -> list:
+    cleaned = []
+    for rule in rules:
+        if rule[0] == "style":
+            rule = ("style", tuple(_last_wins(rule[1])), tuple(_last_wins(rule[2])))
+        elif rule[0] == "group":
+            rule = ("group", rule[1], tuple(dedupe_rules(rule[2])))
+        cleaned.append(rule)
+    # @import/@charset müssen vorne stehen
+    statements = [r for r in cleaned if r[0] == "statement"]
+    return _last_wins(statements) + _last_wins([r for r in cleaned if r[0] != "statement"])
+
+# ----------------------------
+# PURGE
+# ----------------------------
+def scan_usage(pages) -> set:
+    """Tags (div), Klassen (.hero) und IDs (#main) aller übergebenen HTML-Strings"""
+    used = set()
+    for html in pages:
+        # <style>/<script>-Inhalte sind kein Markup
+        html = re.sub(r"<(style|script)\b[^>]*>.*?</\1>", "", html, flags=re.S | re.I)
+        used.update(tag.lower() for tag in TAG_RE.findall(html))
+        for attr, *values in ATTR_RE.findall(html):
+            prefix = "." if attr.lower() == "class" else "#"
+            used.update(prefix + token for token in "".join(values).split())
+    return used
+
+def selector_tokens(selector: str) -> set:
+    tokens = set()
+    for prefix, name in SELECTOR_TOKEN_RE.findall(PSEUDO_RE.sub(" ", selector)):
+        tokens.add(prefix + (name if prefix else name.lower()))
+    return tokens
+
+def purge_rules(rules, used) -> list:
+    used = used | SAFELIST
+    kept = []
+    for rule in rules:
+        if rule[0] == "style":
+            selectors = tuple(s for s in rule[1] if selector_tokens(s) <= used)
+            if selectors:
+                kept.append(("style", selectors, rule[2]))
+        elif rule[0] == "group":
+            inner = purge_rules(rule[2], used)
+            if inner:
+                kept.append(("group", rule[1], tuple(inner)))
+        else:
+            kept.append(rule)
+    return kept
+
+# ----------------------------
+# AUSGABE
+# ----------------------------
+def serialize(rules) -> str:
+    out = []
+    for rule in rules:
+        if rule[0] == "style":
+            out.append(f"{','.join(rule[1])}{{{';'.join(rule[2])}}}")
+        elif rule[0] == "group":
+            out.append(f"{rule[1]}{{{serialize(rule[2])}}}")
+        elif rule[0] == "raw":
+            out.append(f"{rule[1]}{{{rule[2]}}}")
+        else:
+            out.append(rule[1])
+    return "".join(out)
+
+def critical_rules(rules, budget: int = CRITICAL_BUDGET) -> list:
+    """Top-Level-Regeln, die nur Kopfbereich-Elemente (CRITICAL_TAGS) betreffen, bis zum Budget"""
+    picked, size = [], 0
+    for rule in rules:
+        if rule[0] != "style":
+            continue
+        tokens = set().union(*(selector_tokens(s) for s in rule[1]))
+        if not tokens or not tokens <= CRITICAL_TAGS:
+            continue
+        size += len(serialize([rule]))
+        if size > budget:
+            break
+        picked.append(rule)
+    return picked
+
+def build_stylesheet(sources, used, critical: bool = False) -> tuple:
+    """sources: CSS-Texte in Kaskaden-Reihenfolge → (Stylesheet, Critical-CSS oder "")"""
+    rules = []
+    for css in sources:
+        rules += parse_css(css)
+    rules = purge_rules(dedupe_rules(rules), used)
+    return serialize(rules), serialize(critical_rules(rules)) if critical else ""
@@ -0,0 +1,116 @@
+# =====================================================
+# build_fingerprint.py – Assets mit Inhalts-Hash im Dateinamen
+# =====================================================
+#
+# style.css → style.3f2a1b9c0d.css, images/hero.png → images/hero.8e1f….png
+# Der Name ändert sich nur, wenn sich der Inhalt ändert – solche Dateien dürfen
+# mit "Cache-Control: immutable" ausgeliefert werden.
+#
+# dist/asset-manifest.json ordnet jedem Asset seinen aktuellen Namen zu.
+# Die Seiten bekommen die URLs schon beim Rendern (AssetManifest.url), die alten
+# Hash-Dateien werden erst nach dem Build entfernt (finish).
+
+import json
+from pathlib import Path, PurePosixPath
+
+from build_assets import file_hash, place_file, write_atomic
+
+# ----------------------------
+# CONFIG
+# ----------------------------
+MANIFEST_NAME = "asset-manifest.json"
+HASH_LENGTH = 10
+
+
+def fingerprinted_name(rel_path: str, digest: str) -> str:
+    """images/hero.png + Hash → images/hero.<hash>.png"""
+    path = PurePosixPath(rel_path)
+    return str(path.with_name(f"{path.stem}.{digest[:HASH_LENGTH]}{path.suffix}"))
+
+# ----------------------------
+# MANIFEST
+# ----------------------------
+class AssetManifest:
+    """Logischer Asset-Pfad → Pfad mit Hash (beides relativ zu base_path)"""
+
+    def __init__(self, base_path: Path):
+        self.base_path = Path(base_path)
+        self.path = self.base_path / MANIFEST_NAME
+        self.previous = {}
+        if self.path.exists():
+            try:
+                self.previous = json.loads(self.path.read_text(encoding="utf-8"))
+            except (ValueError, OSError):
+                self.previous = {}
+        self.current = {}
+        self.sources = {}
+        self.placed = 0
+
+    def add(self, src: Path, rel_path: str) -> str:
+        src = Path(src)
+        self.current[rel_path] = fingerprinted_name(rel_path, file_hash(src))
+        self.sources[rel_path] = src
+        return self.current[rel_path]
+
+    def add_tree(self, src_dir: Path, prefix: str):
+        src_dir = Path(src_dir)
+        if not src_dir.exists():
+            return
+        for path in sorted(src_dir.rglob("*")):
+            if path.is_file():
+                self.add(path, f"{prefix}/{path.relative_to(src_dir).as_posix()}")
+
+    def url(self, rel_path: str) -> str:
+        """Unbekannte Assets behalten ihren Namen"""
+        return self.current.get(rel_path, rel_path)
+
+    def files(self):
+        """(Quelle, Pfad mit Hash) für alle Assets dieses Builds"""
+        for rel_path, hashed in self.current.items():
+            yield self.sources[rel_path], hashed
+
+    def place(self) -> int:
+        """Fehlende Hash-Dateien anlegen (Hardlink wenn möglich), vorhandene bleiben unangetastet"""
+        placed = 0
+        for src, hashed in self.files():
+            target = self.base_path / hashed
+            if not target.exists():
+                place_file(src, target)
+                placed += 1
+        self.placed += placed
+        return placed
+
+    def prune(self) -> list:
+        """Hash-Dateien früherer Builds löschen, die kein Asset mehr referenziert"""
+        keep = set(self.current.values())
+        removed = []
+        for hashed in set(self.previous.values()) - keep:
+            target = self.base_path / hashed
+            if target.exists():
+                target.unlink()
+                removed.append(hashed)
+        return removed
+
+    def save(self):
+        data = dict(sorted(self.current.items()))
+        write_atomic(self.path, json.dumps(data, indent=2, ensure_ascii=False))
+        self.previous = data
+
+    def finish(self) -> list:
+        """Nach dem Schreiben der Seiten: Altes entfernen, Manifest speichern"""
+        removed = self.prune()
+        self.save()
+        return removed
+
+# ----------------------------
+# STAGE
+# ----------------------------
+def fingerprint_assets(base_path: Path, css_file: Path = None, img_dir: Path = None) -> AssetManifest:
+    """Stylesheet + Bilder-Ordner erfassen. Angelegt wird mit place(), aufgeräumt mit finish() –
+    dazwischen werden die Seiten mit den neuen URLs geschrieben."""
+    assets = AssetManifest(base_path)
+    if css_file is not None and Path(css_file).exists():
+        assets.add(css_file, Path(css_file).name)
+    if img_dir is not None:
+        assets.add_tree(img_dir, "images")
+    return assets
@@ -0,0 +1,135 @@
+# =====================================================
+# build_images.py – Bild-Index (Maße, Format, Hash) und feste Bildzuordnung
+# =====================================================
+#
+# Breite/Höhe kommen direkt aus dem Dateikopf (PNG IHDR, JPEG SOF, WebP VP8/VP8L/VP8X),
+# es werden keine Pixel dekodiert. Der Index liegt in dist/.image_index.json;
+# unveränderte Dateien (Größe + mtime) werden gar nicht erst geöffnet, bei
+# gleichem Inhalt unter neuem Namen reicht der Hash.
+#
+# Zuordnung Seite → Bild per Rendezvous-Hashing über den Slug: gleicher Slug,
+# gleiches Bild – und ein neues Bild verschiebt nur die Seiten, die es gewinnen.
+
+import hashlib
+import json
+import struct
+from pathlib import Path
+
+from build_assets import file_hash, write_atomic
+from build_content import Record
+
+# ----------------------------
+# CONFIG
+# ----------------------------
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp"}
+INDEX_NAME = ".image_index.json"
+HEADER_BYTES = 64 * 1024  # JPEG: SOF steht nach EXIF/ICC meist in den ersten KB
+
+# SOF0–SOF15 ohne DHT (C4), JPG (C8) und DAC (CC)
+JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+class ImageInfo(Record):
+    __slots__ = ("name", "width", "height", "format", "sha256", "_digest")
+    FIELDS = ("name", "width", "height", "format", "sha256")
+
+# ----------------------------
+# HEADER LESEN
+# ----------------------------
+def _png_size(head: bytes):
+    if head[:8] == b"\x89PNG\r\n\x1a\n" and head[12:16] == b"IHDR":
+        return struct.unpack(">II", head[16:24])
+    return None
+
+def _jpeg_size(head: bytes):
+    if head[:2] != b"\xff\xd8":
+        return None
+    pos = 2
+    while pos + 9 <= len(head):
+        if head[pos] != 0xFF:
+            return None
+        marker = head[pos + 1]
+        if marker == 0xFF:  # Füllbyte
+            pos += 1
+            continue
+        if marker in (0x01, 0xD0, 0xD1, 0xD2, 0xD3, 0xD4, 0xD5, 0xD6, 0xD7):
+            pos += 2  # Marker ohne Länge
+            continue
+        if marker in JPEG_SOF:
+            height, width = struct.unpack(">HH", head[pos + 5:pos + 9])
+            return width, height
+        pos += 2 + struct.unpack(">H", head[pos + 2:pos + 4])[0]
+    return None
+
+def _webp_size(head: bytes):
+    if head[:4] != b"RIFF" or head[8:12] != b"WEBP":
+        return None
+    chunk = head[12:16]
+    if chunk == b"VP8 " and head[23:26] == b"\x9d\x01\x2a":
+        width, height = struct.unpack("<HH", head[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L" and head[20:21] == b"\x2f":
+        bits = int.from_bytes(head[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        return int.from_bytes(head[24:27], "little") + 1, int.from_bytes(head[27:30], "little") + 1
+    return None
+
+PARSERS = (("png", _png_size), ("jpeg", _jpeg_size), ("webp", _webp_size))
+
+def read_header(path: Path) -> tuple:
+    """(Format, Breite, Höhe) – unbekannt/beschädigt → (None, None, None)"""
+    with open(path, "rb") as f:
+        head = f.read(HEADER_BYTES)
+    for fmt, parse in PARSERS:
+        size = parse(head)
+        if size:
+            return (fmt,) + tuple(size)
+    return None, None, None
+
+# ----------------------------
+# INDEX
+# ----------------------------
+def _load_index(path: Path) -> dict:
+    if path is None or not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        return {}
+
+def scan_images(image_dir: Path, cache_dir: Path = None) -> dict:
+    """name → ImageInfo für alle Bilder im Ordner (nicht rekursiv, wie bisher)"""
+    image_dir = Path(image_dir)
+    index_path = Path(cache_dir) / INDEX_NAME if cache_dir is not None else None
+    previous = _load_index(index_path)
+    by_hash = {entry[2]: entry[3:] for entry in previous.values()}
+
+    current, images = {}, {}
+    paths = sorted(p for p in image_dir.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES) if image_dir.exists() else []
+    for path in paths:
+        st = path.stat()
+        old = previous.get(path.name)
+        if old and old[0] == st.st_size and old[1] == st.st_mtime_ns:
+            digest, meta = old[2], old[3:]
+        else:
+            digest = file_hash(path, st)
+            meta = by_hash.get(digest) or list(read_header(path))
+        current[path.name] = [st.st_size, st.st_mtime_ns, digest] + list(meta)
+        images[path.name] = ImageInfo(path.name, meta[1], meta[2], meta[0], digest)
+
+    if index_path is not None and current != previous:
+        write_atomic(index_path, json.dumps(current, indent=2))
+    return images
+
+# ----------------------------
+# ZUORDNUNG
+# ----------------------------
+def _score(key: str, name: str) -> bytes:
+    return hashlib.blake2b(f"{key}\0{name}".encode("utf-8"), digest_size=8).digest()
+
+def pick_image(images, key: str):
+    """Deterministisch: das Bild mit dem höchsten Hash über (key, Bildname); keine Bilder → None"""
+    if not images:
+        return None
+    return max(images, key=lambda info: _score(key, info.name))
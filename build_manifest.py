@@ -0,0 +1,91 @@
+# =====================================================
+# build_manifest.py – Build-Manifest für inkrementelle Builds
+# =====================================================
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+# ----------------------------
+# CONFIG
+# ----------------------------
+MANIFEST_NAME = ".build_manifest.json"
+
+# ----------------------------
+# HASHING
+# ----------------------------
+def _plain(value):
+    # Seitenmodell-Objekte (build_content) bringen ihre eigene Dict-Form mit
+    return value.as_dict() if hasattr(value, "as_dict") else str(value)
+
+def hash_inputs(*parts) -> str:
+    """Stabiler Hash über beliebige JSON-fähige Eingaben (Seiten-Dict, Template-Version, ...)"""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=_plain)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+# ----------------------------
+# MANIFEST
+# ----------------------------
+class BuildManifest:
+    """Ordnet jedem Output-Pfad (relativ zu base_path) den Hash seiner Eingaben zu."""
+
+    def __init__(self, base_path: Path):
+        self.base_path = Path(base_path)
+        self.path = self.base_path / MANIFEST_NAME
+        self.previous = {}
+        self.previous_lastmod = {}
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                self.previous = data.get("outputs", {})
+                self.previous_lastmod = data.get("lastmod", {})
+            except (ValueError, OSError):
+                self.previous = {}
+                self.previous_lastmod = {}
+        self.started = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        self.current = {}
+        self.lastmod = {}
+        self.built_paths = []
+        self.built = 0
+        self.skipped = 0
+
+    def needs_build(self, rel_path: str, digest: str) -> bool:
+        """Merkt den Output für diesen Build vor und prüft, ob er neu gerendert werden muss."""
+        self.current[rel_path] = digest
+        if self.previous.get(rel_path) == digest and (self.base_path / rel_path).exists():
+            self.lastmod[rel_path] = self.previous_lastmod.get(rel_path, self.started)
+            self.skipped += 1
+            return False
+        self.lastmod[rel_path] = self.started
+        self.built_paths.append(rel_path)
+        self.built += 1
+        return True
+
+    def entries(self):
+        """(Output-Pfad, lastmod) – aktueller Build, sonst Stand des letzten gespeicherten Builds"""
+        outputs = self.current or self.previous
+        lastmod = self.lastmod or self.previous_lastmod
+        for rel_path in sorted(outputs):
+            yield rel_path, lastmod.get(rel_path)
+
+    def prune(self) -> list:
+        """Outputs ohne Quelle löschen (inkl. leerer Verzeichnisse)"""
+        removed = []
+        for rel_path in set(self.previous) - set(self.current):
+            target = self.base_path / rel_path
+            if target.exists():
+                target.unlink()
+                removed.append(rel_path)
+            parent = target.parent
+            while parent != self.base_path and parent.exists() and not any(parent.iterdir()):
+                parent.rmdir()
+                parent = parent.parent
+        return removed
+
+    def save(self):
+        self.base_path.mkdir(parents=True, exist_ok=True)
+        data = {"outputs": dict(sorted(self.current.items())), "lastmod": dict(sorted(self.lastmod.items()))}
+        self.path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        self.previous = dict(self.current)
+        self.previous_lastmod = dict(self.lastmod)
@@ -0,0 +1,114 @@
+# =====================================================
+# build_minify.py – HTML-Minifizierung für die gerenderten Seiten
+# =====================================================
+#
+# Sicher statt maximal:
+# - <pre>, <textarea>, <script> und <style> bleiben byte-genau erhalten
+# - Kommentare fliegen raus (außer IE-Conditional-Comments)
+# - Whitespace wird auf ein Leerzeichen reduziert und nur an Block-Elementen
+#   ganz entfernt – zwischen Inline-Elementen (a, span, img, ...) bleibt er stehen
+# - In Tags wird nur Whitespace außerhalb von Attributwerten zusammengefasst
+
+import re
+from pathlib import Path
+
+from build_assets import write_atomic
+from build_parallel import parallel_map
+
+# ----------------------------
+# CONFIG
+# ----------------------------
+MINIFY_VERSION = "1"  # Teil des Seiten-Digests → Änderung am Minifier baut alles neu
+
+# re.split mit Gruppe → gerade Indizes Text, ungerade Markup (Raw-Block, Kommentar oder Tag)
+SPLIT_RE = re.compile(
+    r"""(<(pre|textarea|script|style)\b(?:"[^"]*"|'[^']*'|[^'">])*>.*?</\2\s*>"""
+    r"""|<!--.*?-->"""
+    r"""|<[!/]?[a-zA-Z](?:"[^"]*"|'[^']*'|[^'">])*>)""",
+    re.S | re.I,
+)
+TAG_WS_RE = re.compile(r"""("[^"]*"|'[^']*')|\s+""")
+TAG_END_RE = re.compile(r"\s+(/?>)$")
+WS_RE = re.compile(r"\s+")
+
+# Elemente, an deren Grenzen Whitespace nie sichtbar ist
+BLOCK_TAGS = (
+    "html", "head", "body", "title", "meta", "link", "base", "script", "style", "noscript",
+    "header", "footer", "main", "nav", "section", "article", "aside", "div", "p", "pre", "blockquote",
+    "ul", "ol", "li", "dl", "dt", "dd", "h1", "h2", "h3", "h4", "h5", "h6", "hr", "br", "form",
+    "fieldset", "table", "thead", "tbody", "tfoot", "tr", "td", "th", "figure", "figcaption", "template",
+)
+BLOCK_RE = re.compile(r"<!|</?(?:%s)[\s/>]" % "|".join(BLOCK_TAGS), re.I)
+
+# ----------------------------
+# MINIFY
+# ----------------------------
+def _split(html: str) -> list:
+    """Text/Markup im Wechsel – Kommentare entfallen, der Text davor und danach wird verbunden"""
+    parts = SPLIT_RE.split(html)
+    del parts[2::3]  # Gruppe 2 (Raw-Tag-Name) wird nicht gebraucht
+    if "<!--" not in html:
+        return parts
+    merged = [parts[0]]
+    for i in range(1, len(parts), 2):
+        markup = parts[i]
+        if markup.startswith("<!--") and not markup.startswith("<!--[if"):
+            merged[-1] += parts[i + 1]
+        else:
+            merged += (markup, parts[i + 1])
+    return merged
+
+def _tag(tag: str) -> str:
+    if "\n" not in tag and "\t" not in tag and "  " not in tag and not tag[-2].isspace():
+        return tag
+    tag = TAG_WS_RE.sub(lambda m: m.group(1) or " ", tag)
+    return TAG_END_RE.sub(r"\1", tag)
+
+def _is_block(markup: str) -> bool:
+    return BLOCK_RE.match(markup) is not None
+
+def minify_html(html: str) -> str:
+    parts = _split(html)
+    last = len(parts) - 1
+    for i in range(1, last, 2):
+        markup = parts[i]
+        if not markup.startswith("<!--") and markup[1:4].lower() not in ("pre", "tex", "scr", "sty"):
+            parts[i] = _tag(markup)
+    for i in range(0, last + 1, 2):
+        text = parts[i]
+        if not text or not (text[0].isspace() or text[-1].isspace() or "  " in text or "\n" in text or "\t" in text):
+            continue
+        text = WS_RE.sub(" ", text)
+        # Rand an Block-Elementen bzw. Dokumentanfang/-ende ist unsichtbar
+        if i == 0 or _is_block(parts[i - 1]):
+            text = text.lstrip(" ")
+        if i == last or _is_block(parts[i + 1]):
+            text = text.rstrip(" ")
+        parts[i] = text
+    return "".join(parts)
+
+# ----------------------------
+# STAGE
+# ----------------------------
+def minify_file(path: Path) -> tuple:
+    """Schreibt nur, wenn die Seite kleiner wird; liefert (Bytes vorher, Bytes nachher)"""
+    data = path.read_bytes()
+    packed = minify_html(data.decode("utf-8")).encode("utf-8")
+    if len(packed) >= len(data):
+        return len(data), len(data)
+    write_atomic(path, packed)
+    return len(data), len(packed)
+
+def _minify_job(path):
+    return minify_file(Path(path))
+
+def minify_pages(base_path: Path, rel_paths, jobs: int = 0) -> dict:
+    """Nur die übergebenen Seiten (z.B. manifest.built_paths) – unveränderte sind schon minifiziert"""
+    base_path = Path(base_path)
+    todo = [str(base_path / rel) for rel in rel_paths if rel.endswith(".html")]
+    stats = {"files": len(todo), "bytes_in": 0, "bytes_out": 0}
+    for size_in, size_out in parallel_map(_minify_job, todo, jobs):
+        stats["bytes_in"] += size_in
+        stats["bytes_out"] += size_out
+    stats["saved"] = stats["bytes_in"] - stats["bytes_out"]
+    return stats
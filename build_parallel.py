@@ -0,0 +1,38 @@
+# =====================================================
+# build_parallel.py – Prozess-Pool für die Build-Stages
+# =====================================================
+#
+# Eine Stelle für die Pool-Logik: Render-, Minify-, Kompressions- und QA-Jobs
+# laufen alle über parallel_map().
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+def worker_count(jobs: int) -> int:
+    """--jobs: 0 oder weniger = alle Kerne"""
+    return jobs if jobs > 0 else (os.cpu_count() or 1)
+
+def parallel_map(fn, items, jobs=1, initializer=None, batch=None):
+    """fn(item) für alle items, Ergebnisse in Eingabereihenfolge.
+    fn muss auf Modulebene liegen (pickle). Mit jobs == 1 oder weniger als zwei Items
+    läuft alles im eigenen Prozess. batch: items in Blöcken dieser Größe ziehen,
+    sonst werden sie vorab als Liste gesammelt."""
+    jobs = worker_count(jobs)
+    if jobs > 1 and not batch:
+        items = items if isinstance(items, (list, tuple)) else list(items)
+        if len(items) < 2:
+            jobs = 1  # ein Pool für ein Item kostet mehr, als er bringt
+    if jobs == 1:
+        yield from map(fn, items)
+        return
+
+    items = iter(items)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initializer) as pool:
+        while True:
+            chunk = list(islice(items, batch)) if batch else list(items)
+            if not chunk:
+                break
+            # Kleine Chunks halten alle Worker beschäftigt, große sparen IPC-Overhead
+            chunksize = max(1, len(chunk) // (jobs * 8))
+            yield from pool.map(fn, chunk, chunksize=chunksize)
@@ -0,0 +1,350 @@
+# =====================================================
+# build_qa.py – Schneller Seiten-Extractor für die QA (ohne DOM)
+# =====================================================
+#
+# Ein Durchlauf mit html.parser.HTMLParser-Callbacks sammelt genau das, was die QA
+# braucht: <title>, Meta-Description, alle hrefs und die Textlänge.
+# Ergebnisse wie bisher mit BeautifulSoup:
+# - title: erster <title>, Entities aufgelöst, getrimmt
+# - description: erstes <meta name="description">, getrimmt
+# - links: href jedes <a> mit nicht-leerem href, in Dokumentreihenfolge
+# - content_length: wie len(soup.get_text(strip=True)) – Text in <script>, <style>
+#   und <template> sowie Kommentare zählen nicht
+# - refs: jede Referenz (a/link/area href, src, srcset, poster) mit Zeilennummer
+# - ids: alle id-Attribute (und <a name>) als Sprungziele für #Anker
+# - minhash: Signatur des Inhaltstexts ohne header/nav/footer/aside (build_similar.py)
+#
+# scan_pages() cacht die Fakten je Datei in dist/.qa_cache.json (Größe + mtime,
+# sonst Inhalts-Hash) und parst nur unbekannten Inhalt – parallel im Prozess-Pool.
+# LinkIndex löst danach alle Referenzen gegen die Ausgabedateien und IDs auf,
+# pro Referenz ein Set-Lookup. scan_archive() liest dieselben Fakten aus einem
+# Build-Archiv (--archive), ohne es auszupacken.
+#
+# Berichte: write_json_report() und write_junit_report() schreiben die Befunde
+# (Seite, Zeile, Meldung) einzeln weg, check_thresholds() vergleicht die Zähler mit
+# den Grenzwerten – überschrittene lassen den Build fehlschlagen.
+
+import json
+import os
+import posixpath
+import shutil
+import tempfile
+from html.parser import HTMLParser
+from itertools import groupby
+from pathlib import Path
+from urllib.parse import unquote
+from xml.sax.saxutils import escape as xml_escape, quoteattr as xml_quote
+
+from build_assets import atomic_open, file_hash, write_atomic
+from build_parallel import parallel_map
+from build_similar import minhash
+
+# ----------------------------
+# CONFIG
+# ----------------------------
+CACHE_NAME = ".qa_cache.json"
+CACHE_VERSION = 3  # erhöhen, wenn sich extract_page() ändert
+
+# ----------------------------
+# EXTRACTOR
+# ----------------------------
+HIDDEN_TAGS = {"script", "style", "template"}
+# Auf allen Seiten gleich bzw. pro Seite verschiedene interne Links → zählt nicht für Near-Duplicates
+CHROME_TAGS = {"header", "nav", "footer", "aside"}
+REF_ATTRS = {"href", "src", "srcset", "poster"}
+EXTERNAL = ("http:", "https:", "mailto:", "tel:", "javascript:", "data:", "//")
+
+
+class PageExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = None
+        self.description = None
+        self.links = []
+        self.refs = []
+        self.ids = []
+        self.content_length = 0
+        self.text = []
+        self._title_parts = None
+        self._hidden = 0
+        self._chrome = 0
+
+    def _collect(self, tag, attrs):
+        line = None
+        for name, value in attrs:
+            if not value:
+                continue
+            if name == "id" or (name == "name" and tag == "a"):
+                self.ids.append(value)
+            elif name in REF_ATTRS and (name != "href" or tag in ("a", "link", "area")):
+                line = line or self.getpos()[0]
+                if name == "srcset":
+                    # "bild-400.jpg 400w, bild-800.jpg 800w" → nur die URLs
+                    self.refs += [[c.split()[0], line] for c in value.split(",") if c.strip()]
+                else:
+                    self.refs.append([value.strip(), line])
+
+    def handle_starttag(self, tag, attrs):
+        if attrs:
+            self._collect(tag, attrs)
+        if tag == "a":
+            href = dict(attrs).get("href")
+            if href:
+                self.links.append(href)
+        elif tag == "meta":
+            if self.description is None:
+                attrs = dict(attrs)
+                if attrs.get("name") == "description":
+                    self.description = (attrs.get("content") or "").strip()
+        elif tag == "title":
+            if self.title is None and self._title_parts is None:
+                self._title_parts = []
+        elif tag in HIDDEN_TAGS:
+            self._hidden += 1
+        elif tag in CHROME_TAGS:
+            self._chrome += 1
+
+    def handle_endtag(self, tag):
+        if tag == "title" and self._title_parts is not None:
+            self.title = "".join(self._title_parts).strip()
+            self._title_parts = None
+        elif tag in HIDDEN_TAGS and self._hidden:
+            self._hidden -= 1
+        elif tag in CHROME_TAGS and self._chrome:
+            self._chrome -= 1
+
+    def handle_data(self, data):
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+        if not self._hidden:
+            self.content_length += len(data.strip())
+            if not self._chrome:
+                self.text.append(data)
+
+    def unknown_decl(self, data):
+        # <![CDATA[...]]> zählt bei BeautifulSoup als Text
+        if data.startswith("CDATA[") and not self._hidden:
+            self.content_length += len(data[6:].strip())
+
+    def close(self):
+        super().close()
+        if self._title_parts is not None:  # <title> ohne </title>
+            self.title = "".join(self._title_parts).strip()
+            self._title_parts = None
+
+
+def extract_page(html: str) -> dict:
+    """title, description, links, content_length einer Seite"""
+    parser = PageExtractor()
+    parser.feed(html)
+    parser.close()
+    return {
+        "title": parser.title or "",
+        "description": parser.description or "",
+        "links": parser.links,
+        "refs": parser.refs,
+        "ids": parser.ids,
+        "content_length": parser.content_length,
+        "minhash": minhash(" ".join(parser.text)),
+    }
+
+# ----------------------------
+# INKREMENTELLER SCAN
+# ----------------------------
+def _extract_job(path):
+    return path, extract_page(Path(path).read_text(encoding="utf-8"))
+
+def _load_cache(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        return {}
+    return cache if cache.get("version") == CACHE_VERSION else {}
+
+def _walk(base_path: Path):
+    """(rel_path, Pfad) aller Dateien – os.walk ist deutlich schneller als rglob"""
+    base = str(base_path)
+    for root, _, names in os.walk(base):
+        rel = root[len(base) + 1:].replace(os.sep, "/")
+        prefix = f"{rel}/" if rel else ""
+        for name in names:
+            yield prefix + name, os.path.join(root, name)
+
+def scan_pages(base_path: Path, suffix: str = ".html", jobs: int = 1) -> tuple:
+    """Fakten aller Seiten; unveränderte (Größe + mtime, sonst Inhalts-Hash) kommen aus dem Cache.
+    Liefert (Seiten, alle Ausgabedateien als rel_paths, Statistik) – Seiten als Dicts mit "file"."""
+    base_path = Path(base_path)
+    cache_path = base_path / CACHE_NAME
+    previous = _load_cache(cache_path).get("files", {})
+    by_hash = {entry[2]: entry[3] for entry in previous.values()}
+
+    current, todo, files = {}, {}, set()  # todo: Inhalts-Hash → Pfad (gleicher Inhalt nur einmal parsen)
+    changed = False
+    for rel, path in _walk(base_path):
+        files.add(rel)
+        if not rel.endswith(suffix):
+            continue
+        st = os.stat(path)
+        old = previous.get(rel)
+        if old and old[0] == st.st_size and old[1] == st.st_mtime_ns:
+            current[rel] = old
+            continue
+        # Erst hashen, geparst wird nur unbekannter Inhalt (neu geschrieben oder kopiert → Cache)
+        changed = True
+        digest = file_hash(Path(path), st)
+        current[rel] = [st.st_size, st.st_mtime_ns, digest, by_hash.get(digest)]
+        if current[rel][3] is None:
+            todo.setdefault(digest, path)
+
+    paths = {path: digest for digest, path in todo.items()}
+    for path, facts in parallel_map(_extract_job, list(paths), jobs):
+        by_hash[paths[path]] = facts
+    for entry in current.values():
+        if entry[3] is None:
+            entry[3] = by_hash[entry[2]]
+
+    if changed or len(current) != len(previous):
+        write_atomic(cache_path, json.dumps({"version": CACHE_VERSION, "files": current},
+                                            ensure_ascii=False, separators=(",", ":")))
+    stats = {"pages": len(current), "parsed": len(todo), "cached": len(current) - len(todo)}
+    pages = [{"file": base_path / rel, "rel": rel, **entry[3]} for rel, entry in sorted(current.items())]
+    return pages, files, stats
+
+def scan_archive(reader, suffix: str = ".html") -> tuple:
+    """Wie scan_pages(), aber für ein Build-Archiv (build_archive.ArchiveReader) – ohne Cache"""
+    pages = [
+        {"file": rel, "rel": rel, **extract_page(reader.read(rel).decode("utf-8"))}
+        for rel in sorted(reader.names) if rel.endswith(suffix)
+    ]
+    return pages, set(reader.names), {"pages": len(pages), "parsed": len(pages), "cached": 0}
+
+# ----------------------------
+# LINK-INDEX
+# ----------------------------
+class LinkIndex:
+    """Alle Ausgabedateien + IDs je Seite; resolve() ist pro Referenz ein Dict-Lookup
+
+    base_path: Pfad, unter dem dist/ ausgeliefert wird (z.B. "/website/" auf GitHub Pages) –
+    absolute URLs werden dagegen aufgelöst, alles außerhalb gilt als kaputt.
+    """
+
+    def __init__(self, files, pages, base_path: str = "/"):
+        self.files = set(files)
+        self.base = "/" + base_path.strip("/") + "/" if base_path.strip("/") else "/"
+        self.ids = {page["rel"]: set(page["ids"]) for page in pages}
+        # Absolute URLs sind von der Quellseite unabhängig → einmal pro URL auflösen
+        self._results = {}
+
+    def _target(self, directory: str, path: str):
+        joined = posixpath.join(directory, path)
+        rel = posixpath.normpath(unquote(joined)) if joined else ""
+        if rel == ".":
+            rel = ""
+        if rel.startswith("../") or rel == "..":
+            return None  # zeigt aus dist/ heraus
+        if rel in self.files:
+            return rel
+        # Verzeichnis-URL (/slug/ oder /slug) → slug/index.html
+        index = f"{rel}/index.html" if rel else "index.html"
+        return index if index in self.files else None
+
+    def _resolve(self, source: str, url: str):
+        path, _, fragment = url.partition("#")
+        path = path.partition("?")[0]
+        if path.startswith("/"):
+            if path.startswith(self.base):
+                target = self._target("", path[len(self.base):])
+            elif path == self.base.rstrip("/"):
+                target = self._target("", "")
+            else:
+                return f"außerhalb von {self.base}"
+            if target is None:
+                return "Ziel fehlt"
+        elif path:
+            target = self._target(posixpath.dirname(source), path)
+            if target is None:
+                return "Ziel fehlt"
+        else:
+            target = source
+        if fragment and target in self.ids and unquote(fragment) not in self.ids[target]:
+            return f"Anker #{fragment} fehlt"
+        return None
+
+    def resolve(self, source: str, url: str):
+        """None, wenn die Referenz aufgelöst wird – sonst der Grund"""
+        if url[:1] == "/" or url.startswith(EXTERNAL):
+            key = url
+        elif url[:1] == "#":
+            key = (source, url)
+        else:
+            key = (posixpath.dirname(source), url)
+        try:
+            return self._results[key]
+        except KeyError:
+            result = None if url.startswith(EXTERNAL) else self._resolve(source, url)
+            self._results[key] = result
+            return result
+
+def find_broken_links(pages, index: LinkIndex):
+    """(Seite, Zeile, URL, Grund) für jede nicht auflösbare Referenz"""
+    for page in pages:
+        source = page["rel"]
+        for url, line in page["refs"]:
+            reason = index.resolve(source, url)
+            if reason:
+                yield source, line, url, reason
+
+# ----------------------------
+# BERICHTE (JSON, JUnit)
+# ----------------------------
+# results: Check → Iterable von (Seite, Zeile oder None, Meldung), Befunde einer Seite
+# stehen zusammen; timings: Check → Sekunden. Beide Formate werden Befund für Befund
+# in die Datei geschrieben – die Befunde dürfen Generatoren sein, auch bei 100k Seiten
+# entsteht kein kompletter Bericht im Speicher.
+
+def write_json_report(path: Path, summary: dict, timings: dict, results: dict):
+    with atomic_open(path, "w", encoding="utf-8") as f:
+        f.write('{"summary": %s,\n"timings": %s,\n"findings": [' % (
+            json.dumps(summary, ensure_ascii=False), json.dumps({k: round(v, 4) for k, v in timings.items()})))
+        sep = "\n"
+        for check, findings in results.items():
+            for page, line, message in findings:
+                f.write(sep + json.dumps({"check": check, "page": page, "line": line, "message": message},
+                                         ensure_ascii=False))
+                sep = ",\n"
+        f.write("\n]}\n")
+
+def _write_testcases(f, check: str, findings) -> int:
+    """Ein fehlgeschlagener <testcase> pro Seite (aufeinanderfolgende Befunde), liefert die Anzahl"""
+    count = 0
+    for page, group in groupby(findings, key=lambda finding: finding[0]):
+        messages = [f"{page}:{line}: {message}" if line else message for _, line, message in group]
+        f.write(f'<testcase classname="qa.{xml_escape(check)}" name={xml_quote(page)}>'
+                f'<failure message={xml_quote(messages[0])}>{xml_escape(chr(10).join(messages))}'
+                f'</failure></testcase>\n')
+        count += 1
+    return count
+
+def write_junit_report(path: Path, timings: dict, results: dict):
+    """Ein <testsuite> pro Check, ein fehlgeschlagener <testcase> pro betroffener Seite"""
+    with atomic_open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<testsuites name="qa">\n')
+        for check, findings in results.items():
+            # Die Anzahl steht im <testsuite>-Kopf → Testcases erst in eine Temp-Datei streamen
+            with tempfile.TemporaryFile("w+", encoding="utf-8") as body:
+                failures = _write_testcases(body, check, findings)
+                f.write(f'<testsuite name="{xml_escape(check)}" tests="{max(1, failures)}" '
+                        f'failures="{failures}" time="{timings.get(check, 0):.4f}">\n')
+                if not failures:
+                    f.write(f'<testcase classname="qa.{xml_escape(check)}" name="alle Seiten"/>\n')
+                body.seek(0)
+                shutil.copyfileobj(body, f)
+            f.write("</testsuite>\n")
+        f.write("</testsuites>\n")
+
+def check_thresholds(counts: dict, limits: dict) -> list:
+    """Überschrittene Grenzwerte als Meldungen; None = keine Grenze"""
+    return [f"{name}: {counts.get(name, 0)} > {limit}" for name, limit in limits.items()
+            if limit is not None and counts.get(name, 0) > limit]
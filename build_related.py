@@ -0,0 +1,225 @@
+# =====================================================
+# build_related.py – Verwandte Seiten für automatische interne Links
+# =====================================================
+#
+# 1. Jeder Text → Hashing-Vektor (Wort → Bucket), TF-IDF-gewichtet
+# 2. SimHash (64 Bit, Random Hyperplanes): die Projektion ist linear, also wird
+#    jeder Text nur einmal projiziert – der Basistext, den alle SEO-Seiten teilen,
+#    kostet damit nur einmal, egal wie viele Seiten es gibt
+# 3. LSH: 8 Bänder à 8 Bit + die nach Signatur sortierte Liste; verglichen werden
+#    nur Nachbarn innerhalb eines Fensters → O(n · Bänder · Fenster) statt O(n²)
+# 4. Top-k nach Hamming-Abstand der Signaturen
+#
+# Die Tokenisierung wird pro Text in dist/.related_index.npz gecacht; ändert sich
+# keine Seite, wird auch das Ergebnis des letzten Builds übernommen.
+
+import hashlib
+import json
+import re
+import zlib
+from pathlib import Path
+
+from build_assets import atomic_open
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAS_NUMPY = np is not None  # ohne NumPy keine internen Links – build_website warnt
+
+# ----------------------------
+# CONFIG
+# ----------------------------
+TOP_K = 5
+DIM_BITS = 20          # 2^20 Hash-Buckets für Wörter
+BANDS = 8
+BAND_BITS = 8          # BANDS * BAND_BITS = 64 Bit Signatur
+WINDOW = 64            # Vergleichsfenster je Band und Seite
+CHUNK = 4096           # Texte bzw. Seiten pro NumPy-Block (begrenzt den Speicher)
+CACHE_NAME = ".related_index.npz"
+
+WORD_RE = re.compile(r"\w{3,}")
+
+# ----------------------------
+# VEKTORISIERUNG
+# ----------------------------
+def _tokenize(text: str) -> tuple:
+    counts = {}
+    mask = (1 << DIM_BITS) - 1
+    for word in WORD_RE.findall(text.lower()):
+        bucket = zlib.crc32(word.encode("utf-8")) & mask
+        counts[bucket] = counts.get(bucket, 0) + 1
+    buckets = np.fromiter(counts.keys(), dtype=np.uint32, count=len(counts))
+    values = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+    return buckets, values
+
+def _text_key(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+def _hyperplanes(buckets):
+    """64 Zufallsbits pro Bucket, deterministisch aus dem Bucket berechnet (splitmix64)"""
+    z = buckets.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+def _segment_sums(rows, offsets):
+    """Summe je Segment [offsets[i], offsets[i+1]) – leere Segmente ergeben 0"""
+    sums = np.zeros((len(offsets) - 1, rows.shape[1]), dtype=np.float32)
+    nonempty = offsets[1:] > offsets[:-1]
+    if nonempty.any():
+        sums[nonempty] = np.add.reduceat(rows, offsets[:-1][nonempty] - offsets[0], axis=0)
+    return sums
+
+def _project(offsets, buckets, values, idf):
+    """Gewichtete Summe der ±1-Hyperebenen je Text (T × 64)"""
+    shifts = np.arange(64, dtype=np.uint64)
+    n = len(offsets) - 1
+    projections = np.zeros((n, 64), dtype=np.float32)
+    for start in range(0, n, CHUNK):
+        stop = min(n, start + CHUNK)
+        lo, hi = offsets[start], offsets[stop]
+        if lo == hi:
+            continue
+        weights = np.log1p(values[lo:hi]) * idf[buckets[lo:hi]]
+        bits = ((_hyperplanes(buckets[lo:hi])[:, None] >> shifts) & np.uint64(1)).astype(np.float32)
+        projections[start:stop] = _segment_sums((bits * 2 - 1) * weights[:, None], offsets[start:stop + 1])
+    return projections
+
+def _signatures(projections, refs, ref_offsets):
+    """Seite = Summe ihrer Texte; Signatur = Vorzeichenbits"""
+    shifts = np.arange(64, dtype=np.uint64)
+    n = len(ref_offsets) - 1
+    signatures = np.zeros(n, dtype=np.uint64)
+    for start in range(0, n, CHUNK):
+        stop = min(n, start + CHUNK)
+        rows = projections[refs[ref_offsets[start]:ref_offsets[stop]]]
+        sums = _segment_sums(rows, ref_offsets[start:stop + 1])
+        signatures[start:stop] = ((sums > 0).astype(np.uint64) << shifts).sum(axis=1, dtype=np.uint64)
+    return signatures
+
+# ----------------------------
+# LSH
+# ----------------------------
+def _popcount(x):
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(x).astype(np.int64)
+    return np.unpackbits(x.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+def _offer(best_j, best_d, i, j, dist):
+    """Kandidat j für Seite i übernehmen, wenn er besser als der bisher schlechteste ist"""
+    known = (best_j[i] == j[:, None]).any(axis=1)
+    worst_d, worst_j = best_d[i, -1], best_j[i, -1]
+    # Gleicher Abstand → niedrigerer Index gewinnt, damit das Ergebnis stabil ist
+    better = ~known & ((dist < worst_d) | ((dist == worst_d) & (j < worst_j)))
+    if not better.any():
+        return
+    i, j, dist = i[better], j[better], dist[better]
+    cand_j = np.concatenate([best_j[i], j[:, None]], axis=1)
+    cand_d = np.concatenate([best_d[i], dist[:, None]], axis=1)
+    order = np.lexsort((cand_j, cand_d))[:, :-1]
+    best_j[i] = np.take_along_axis(cand_j, order, axis=1)
+    best_d[i] = np.take_along_axis(cand_d, order, axis=1)
+
+def _neighbours(signatures, k):
+    n = len(signatures)
+    k = min(k, n - 1)
+    best_j = np.full((n, k), n, dtype=np.int64)   # n = noch leer
+    best_d = np.full((n, k), 65, dtype=np.int64)  # größer als jeder Hamming-Abstand
+
+    # Sortierungen: nach voller Signatur + je Band nach dessen Bits (stabil → nach Index)
+    orders = [(np.argsort(signatures, kind="stable"), None)]
+    for b in range(BANDS):
+        keys = (signatures >> np.uint64(b * BAND_BITS)) & np.uint64((1 << BAND_BITS) - 1)
+        order = np.argsort(keys, kind="stable")
+        orders.append((order, keys[order]))
+
+    for order, keys in orders:
+        for d in range(1, min(WINDOW // 2, n - 1) + 1):
+            i, j = order[:-d], order[d:]
+            if keys is not None:
+                same = keys[:-d] == keys[d:]
+                i, j = i[same], j[same]
+            if not len(i):
+                continue
+            dist = _popcount(signatures[i] ^ signatures[j])
+            _offer(best_j, best_d, i, j, dist)
+            _offer(best_j, best_d, j, i, dist)
+    return [[int(j) for j in row if j < n] for row in best_j]
+
+# ----------------------------
+# CACHE
+# ----------------------------
+def _load_cache(path):
+    if path is None or not path.exists():
+        return {}, {}
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            offsets, buckets, values = data["offsets"], data["buckets"], data["values"]
+        tokens = {
+            key: (buckets[offsets[i]:offsets[i + 1]], values[offsets[i]:offsets[i + 1]])
+            for i, key in enumerate(meta.pop("texts"))
+        }
+        return tokens, meta
+    except (OSError, ValueError, KeyError):
+        return {}, {}
+
+def _save_cache(path, keys, offsets, buckets, values, meta):
+    if path is None:
+        return
+    meta = np.array(json.dumps(dict(meta, texts=keys)))
+    with atomic_open(path) as f:
+        np.savez(f, meta=meta, offsets=offsets, buckets=buckets, values=values)
+
+# ----------------------------
+# INDEX
+# ----------------------------
+def build_related(docs, cache_dir=None, k=TOP_K) -> dict:
+    """docs: (slug, title, digest, texts) → {slug: ((relative URL, title), ...)}; ohne NumPy leer"""
+    if np is None:
+        return {}
+    docs = sorted(docs, key=lambda d: d[0])
+    if len(docs) < 2:
+        return {}
+    cache_path = Path(cache_dir) / CACHE_NAME if cache_dir is not None else None
+    cached, meta = _load_cache(cache_path)
+
+    # Gleiche Seiten mit gleichen Digests → Ergebnis des letzten Builds übernehmen
+    corpus = hashlib.sha256(json.dumps([[d[0], d[2]] for d in docs]).encode("utf-8")).hexdigest()
+    if meta.get("corpus") == corpus and meta.get("k") == k:
+        related = meta["related"]
+    else:
+        # Texte deduplizieren (Dict über str nutzt den gecachten String-Hash)
+        text_ids, refs, ref_offsets = {}, [], [0]
+        for doc in docs:
+            for text in doc[3]:
+                refs.append(text_ids.setdefault(text, len(text_ids)))
+            ref_offsets.append(len(refs))
+        refs = np.array(refs, dtype=np.int64)
+        ref_offsets = np.array(ref_offsets, dtype=np.int64)
+
+        keys = [_text_key(text) for text in text_ids]
+        parts = [cached.get(key) or _tokenize(text) for key, text in zip(keys, text_ids)]
+        offsets = np.zeros(len(parts) + 1, dtype=np.int64)
+        np.cumsum([len(p[0]) for p in parts], out=offsets[1:])
+        buckets = np.concatenate([p[0] for p in parts])
+        values = np.concatenate([p[1] for p in parts])
+
+        # IDF: Dokumentfrequenz je Bucket = Summe der Seiten, die den Text verwenden
+        usage = np.bincount(refs, minlength=len(parts)).astype(np.float32)
+        df = np.bincount(buckets, weights=np.repeat(usage, np.diff(offsets)), minlength=1 << DIM_BITS)
+        idf = (np.log((1 + len(docs)) / (1 + df)) + 1).astype(np.float32)
+
+        signatures = _signatures(_project(offsets, buckets, values, idf), refs, ref_offsets)
+        related = _neighbours(signatures, k)
+        meta = {"corpus": corpus, "k": k, "related": related}
+        _save_cache(cache_path, keys, offsets, buckets, values, meta)
+
+    # Alle Seiten liegen unter <slug>/index.html → relativ verlinken, damit die Links
+    # auch unter dem Deploy-Unterpfad (BASE_URL) stimmen
+    return {
+        docs[i][0]: tuple((f"../{docs[j][0]}/", docs[j][1]) for j in neighbours)
+        for i, neighbours in enumerate(related)
+    }
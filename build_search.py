@@ -0,0 +1,207 @@
+# =====================================================
+# build_search.py – Statischer Suchindex (invertierter Index mit Positionen)
+# =====================================================
+#
+# dist/search/index.json          → Metadaten: Anzahl Dokumente, Shards, Stoppwörter
+# dist/search/terms-<xy>.json     → {Term: [[Dok-ID, Position, ...], ...]} für alle Terme mit Präfix xy
+# dist/search/docs-<n>.json       → [[URL, Titel], ...] für Dok-IDs n*DOC_CHUNK ...
+#                                   (URL relativ zur Site-Wurzel, search.js löst sie auf –
+#                                   die Site läuft unter einem Unterpfad, siehe BASE_URL)
+# dist/search/search.js           → Client: lädt nur die Shards der Suchbegriffe
+#
+# Inkrementell: Terme pro Seite werden mit dem Digest aus dem Build-Manifest gecacht,
+# nur neu gebaute Seiten werden gelesen. Dok-IDs bleiben stabil (frei gewordene werden
+# wiederverwendet), geschrieben werden nur Shards, deren Inhalt sich geändert hat.
+# Im Archiv-Modus sammelt SearchCollector die Terme beim Schreiben der Seiten.
+
+import hashlib
+import json
+import re
+import unicodedata
+from html import unescape
+from pathlib import Path
+
+from build_assets import write_atomic
+from build_sitemap import page_url
+
+# ----------------------------
+# CONFIG
+# ----------------------------
+INDEX_DIR = "search"
+CACHE_NAME = ".search_cache.json"
+INDEX_VERSION = 2  # erhöhen, wenn sich page_terms() ändert
+DOC_CHUNK = 1000
+MAX_POSITIONS = 16  # mehr Positionen pro Term und Seite bringen für Phrasen kaum etwas
+PREFIX = 2          # Shard-Schlüssel = die ersten Zeichen des Terms
+
+# Muss mit search.js übereinstimmen (wird über index.json mitgeliefert)
+STOPWORDS = {
+    "der", "die", "das", "den", "dem", "des", "ein", "eine", "einer", "einen", "und", "oder", "in", "im",
+    "mit", "fuer", "von", "zu", "zum", "zur", "auf", "an", "am", "ist", "sind", "wir", "sie", "es", "als",
+    "auch", "bei", "nicht", "the", "and", "of", "to",
+}
+TRANSLIT = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+TERM_RE = re.compile(r"[a-z0-9]+")
+SKIP_RE = re.compile(r"<(script|style|header|nav|footer|aside|form)\b.*?</\1\s*>", re.S | re.I)
+TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.S | re.I)
+BODY_RE = re.compile(r"<body[^>]*>(.*)</body>", re.S | re.I)
+TAG_RE = re.compile(r"<[^>]+>")
+
+# ----------------------------
+# TEXT
+# ----------------------------
+def normalize_text(text: str) -> str:
+    text = text.lower().translate(TRANSLIT)
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+
+def tokenize(text: str) -> list:
+    return TERM_RE.findall(normalize_text(text))
+
+def page_text(html: str) -> tuple:
+    """(Titel, sichtbarer Inhalt) – Navigation, Footer, interne Links, Formulare und Skripte zählen nicht"""
+    title = TITLE_RE.search(html)
+    body = BODY_RE.search(html)
+    text = SKIP_RE.sub(" ", body.group(1) if body else html)
+    title = " ".join(unescape(title.group(1)).split()) if title else ""
+    return title, unescape(TAG_RE.sub(" ", text))
+
+def page_terms(html: str) -> tuple:
+    """(Titel, {Term: [Positionen]}) – Positionen zählen Stoppwörter mit, damit Phrasen passen"""
+    title, text = page_text(html)
+    terms = {}
+    for pos, term in enumerate(tokenize(f"{title} {text}")):
+        if len(term) < PREFIX or term in STOPWORDS:
+            continue
+        positions = terms.setdefault(term, [])
+        if len(positions) < MAX_POSITIONS:
+            positions.append(pos)
+    return title, terms
+
+# ----------------------------
+# CACHE
+# ----------------------------
+def _load_cache(path: Path) -> dict:
+    if path.exists():
+        try:
+            cache = json.loads(path.read_text(encoding="utf-8"))
+            if cache.get("version") == INDEX_VERSION:
+                return cache
+        except ValueError:
+            pass
+    return {"version": INDEX_VERSION, "pages": {}, "ids": {}, "files": {}}
+
+def _assign_ids(previous: dict, rel_paths) -> dict:
+    """Bekannte Seiten behalten ihre ID, neue bekommen freie IDs (zuerst Lücken)"""
+    ids = {rel: previous[rel] for rel in rel_paths if rel in previous}
+    taken = set(ids.values())
+    free = (i for i in range(len(rel_paths) + len(previous) + 1) if i not in taken)
+    for rel in rel_paths:
+        if rel not in ids:
+            ids[rel] = next(free)
+    return ids
+
+# ----------------------------
+# INDEX
+# ----------------------------
+def _payload(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def _write_if_changed(path: Path, data, files: dict, written: set) -> bool:
+    payload = _payload(data)
+    digest = hashlib.sha256(payload).hexdigest()
+    written.add(path.name)
+    if files.get(path.name) == digest and path.exists():
+        return False
+    write_atomic(path, payload)
+    files[path.name] = digest
+    return True
+
+def index_files(pages: dict, ids: dict) -> dict:
+    """pages: rel_path → [Digest, Titel, Terme] → Dateiname unter search/ → JSON-Daten"""
+    shards, docs = {}, {}
+    for rel in sorted(pages, key=ids.get):
+        doc = ids[rel]
+        _, title, terms = pages[rel]
+        docs.setdefault(doc // DOC_CHUNK, {})[doc % DOC_CHUNK] = [page_url(rel, "").lstrip("/"), title or rel]
+        for term, positions in terms.items():
+            shards.setdefault(term[:PREFIX], {}).setdefault(term, []).append([doc] + positions)
+
+    files = {f"terms-{key}.json": dict(sorted(terms.items())) for key, terms in shards.items()}
+    for chunk, entries in docs.items():
+        # Lücken (gelöschte Seiten) als null, damit Dok-ID % DOC_CHUNK der Listenindex bleibt
+        files[f"docs-{chunk}.json"] = [entries.get(i) for i in range(max(entries) + 1)]
+    files["index.json"] = {
+        "version": INDEX_VERSION, "docs": len(pages), "chunk": DOC_CHUNK, "prefix": PREFIX,
+        "shards": sorted(shards), "stopwords": sorted(STOPWORDS),
+    }
+    return files
+
+def _stats(pages: dict, files: dict) -> dict:
+    return {"docs": len(pages), "terms": sum(len(data) for name, data in files.items() if name.startswith("terms-")),
+            "shards": len(files["index.json"]["shards"])}
+
+def build_search_index(base_path: Path, outputs: dict, exclude=()) -> dict:
+    """outputs: rel_path → Digest (manifest.current); nur HTML-Seiten werden indexiert"""
+    base_path = Path(base_path)
+    index_dir = base_path / INDEX_DIR
+    index_dir.mkdir(parents=True, exist_ok=True)
+    cache_path = base_path / CACHE_NAME
+    cache = _load_cache(cache_path)
+
+    pages = {}
+    parsed = 0
+    for rel, digest in outputs.items():
+        if not rel.endswith(".html") or rel in exclude:
+            continue
+        old = cache["pages"].get(rel)
+        if old and old[0] == digest:
+            pages[rel] = old
+            continue
+        path = base_path / rel
+        if not path.exists():
+            continue
+        title, terms = page_terms(path.read_text(encoding="utf-8"))
+        pages[rel] = [digest, title, terms]
+        parsed += 1
+
+    ids = _assign_ids(cache["ids"], sorted(pages))
+    index = index_files(pages, ids)
+    files, written, changed = cache["files"], set(), 0
+    for name, data in index.items():
+        changed += _write_if_changed(index_dir / name, data, files, written)
+
+    # Shards, die es nicht mehr gibt (Term-Präfix oder Dokument-Block verschwunden)
+    removed = 0
+    for name in set(files) - written:
+        stale = index_dir / name
+        if stale.exists():
+            stale.unlink()
+            removed += 1
+        del files[name]
+
+    cache.update(pages=pages, ids=ids, files=files)
+    write_atomic(cache_path, _payload(cache))
+    return dict(_stats(pages, index), parsed=parsed, written=changed, removed=removed)
+
+# ----------------------------
+# ARCHIV
+# ----------------------------
+class SearchCollector:
+    """Beobachter für ArchiveWriter: Terme jeder HTML-Seite beim Schreiben sammeln –
+    ein Archiv lässt sich während des Builds nicht wieder lesen"""
+
+    def __init__(self, exclude=()):
+        self.exclude = set(exclude)
+        self.pages = {}
+
+    def __call__(self, rel_path: str, data: bytes):
+        if rel_path.endswith(".html") and rel_path not in self.exclude:
+            title, terms = page_terms(data.decode("utf-8"))
+            self.pages[rel_path] = [None, title, terms]
+
+    def write(self, archive) -> dict:
+        """Kompletter Index ins Archiv – ohne Cache, IDs in Pfad-Reihenfolge"""
+        index = index_files(self.pages, _assign_ids({}, sorted(self.pages)))
+        for name, data in index.items():
+            archive.write_bytes(f"{INDEX_DIR}/{name}", _payload(data))
+        return dict(_stats(self.pages, index), parsed=len(self.pages), written=len(index), removed=0)
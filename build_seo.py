@@ -0,0 +1,83 @@
+# =====================================================
+# build_seo.py – Kombinatorische SEO-Expansion (Keyword × Intent × Region × Branche)
+# =====================================================
+#
+# SEO_KEYWORDS-Eintrag:
+#   "ki-automatisierung": {
+#       "base_title": "KI Automatisierung",
+#       "intents": [...],
+#       "regions": ["Berlin", "München"],      # optional
+#       "industries": ["Handwerk", "Logistik"], # optional
+#       "description_template": "Professionelle {kw} – ..."
+#   }
+#
+# Die Kombinationen werden einzeln erzeugt – das kartesische Produkt liegt nie
+# komplett im Speicher. Doppelte Slugs (auch gegen andere Seiten) werden verworfen.
+
+import re
+import unicodedata
+from itertools import product
+
+# ----------------------------
+# SLUGS
+# ----------------------------
+TRANSLIT = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+NON_SLUG = re.compile(r"[^a-z0-9]+")
+
+def normalize_slug(*parts) -> str:
+    """'KI Automatisierung', 'für KMU' → 'ki-automatisierung-fuer-kmu'"""
+    text = " ".join(p for p in parts if p).lower().translate(TRANSLIT)
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return NON_SLUG.sub("-", text).strip("-")
+
+
+class SlugSet:
+    """Kompaktes Seen-Set: nur der 64-Bit-Hash je Slug wird gehalten, nicht der String"""
+    __slots__ = ("_seen", "duplicates")
+
+    def __init__(self, slugs=()):
+        self._seen = set()
+        self.duplicates = 0
+        for slug in slugs:
+            self.add(slug)
+
+    def add(self, slug: str) -> bool:
+        """True, wenn der Slug neu ist"""
+        # hash() ist pro Prozess stabil – das Set lebt nur für einen Build
+        key = hash(slug)
+        if key in self._seen:
+            self.duplicates += 1
+            return False
+        self._seen.add(key)
+        return True
+
+    def __len__(self):
+        return len(self._seen)
+
+# ----------------------------
+# EXPANSION
+# ----------------------------
+DIMENSIONS = ("intents", "industries", "regions")
+
+def keyword_phrase(intent, industry=None, region=None) -> str:
+    phrase = intent
+    if industry:
+        phrase += f" – {industry}"
+    if region:
+        phrase += f" in {region}"
+    return phrase
+
+def expand_keyword(base_slug: str, seo: dict):
+    """Liefert (slug, phrase, intent, industry, region) – itertools.product arbeitet lazy"""
+    # Fehlende Dimensionen zählen als ein leerer Wert, damit das Produkt nicht leer wird
+    dims = [seo.get(name) or (None,) for name in DIMENSIONS]
+    for intent, industry, region in product(*dims):
+        slug = normalize_slug(base_slug, intent, industry, region)
+        yield slug, keyword_phrase(intent, industry, region), intent, industry, region
+
+def expand_all(seo_keywords: dict, seen: SlugSet):
+    """Alle Keywords nacheinander, Duplikate werden übersprungen (seen.duplicates zählt mit)"""
+    for base_slug, seo in seo_keywords.items():
+        for combo in expand_keyword(base_slug, seo):
+            if seen.add(combo[0]):
+                yield base_slug, seo, combo
@@ -0,0 +1,125 @@
+# =====================================================
+# build_similar.py – Near-Duplicate-Erkennung (MinHash + LSH)
+# =====================================================
+#
+# 1. Sichtbarer Seitentext → Wort-Shingles (SHINGLE Wörter am Stück), crc32 je Shingle
+# 2. MinHash: NUM_PERM Hashfunktionen (Multiply-Shift), je Funktion das Minimum
+#    → Anteil gleicher Einträge zweier Signaturen ≈ Jaccard-Ähnlichkeit der Shingles
+# 3. LSH: Signatur in Bänder teilen; Seiten mit einem gleichen Band sind Kandidaten.
+#    Pro Bucket wird nur gegen das erste Mitglied verglichen (vektorisiert), Cluster per Union-Find
+#    → nahezu linear statt n² Paarvergleiche
+#
+# Die Signatur wird beim QA-Scan pro Seite berechnet und mit den anderen Fakten
+# in dist/.qa_cache.json gecacht (hex-kodiert, NUM_PERM * 4 Bytes).
+
+import re
+import zlib
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAS_NUMPY = np is not None  # ohne NumPy keine Signaturen – build_website warnt bzw. lässt das Gate scheitern
+
+# ----------------------------
+# CONFIG
+# ----------------------------
+NUM_PERM = 64
+SHINGLE = 3            # Wörter pro Shingle – kurze Seiten haben sonst kaum gemeinsame Shingles
+THRESHOLD = 0.6        # ab dieser geschätzten Jaccard-Ähnlichkeit gilt eine Seite als Near-Duplicate
+CHUNK = 65536          # Kandidatenpaare pro NumPy-Block (begrenzt den Speicher)
+
+WORD_RE = re.compile(r"\w+")
+
+def _permutations():
+    """NUM_PERM feste (a, b) für h(x) = (a·x + b) >> 32 – deterministisch, damit der Cache gültig bleibt"""
+    x = np.arange(1, 2 * NUM_PERM + 1, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+    x ^= x >> np.uint64(30)
+    x *= np.uint64(0xBF58476D1CE4E5B9)
+    x ^= x >> np.uint64(27)
+    x *= np.uint64(0x94D049BB133111EB)
+    x ^= x >> np.uint64(31)
+    return x[:NUM_PERM] | np.uint64(1), x[NUM_PERM:]
+
+PERM_A, PERM_B = _permutations() if np is not None else (None, None)
+
+# ----------------------------
+# SIGNATUR
+# ----------------------------
+def shingles(text: str) -> set:
+    words = WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE:
+        return set()
+    return {zlib.crc32(" ".join(words[i:i + SHINGLE]).encode("utf-8"))
+            for i in range(len(words) - SHINGLE + 1)}
+
+def minhash(text: str) -> str:
+    """Hex-Signatur des Textes – "" ohne NumPy oder bei zu wenig Text"""
+    if np is None:
+        return ""
+    hashes = shingles(text)
+    if not hashes:
+        return ""
+    x = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+    with np.errstate(over="ignore"):
+        h = (x[:, None] * PERM_A + PERM_B) >> np.uint64(32)
+    return h.min(axis=0).astype("<u4").tobytes().hex()
+
+# ----------------------------
+# LSH
+# ----------------------------
+def lsh_rows(threshold: float) -> int:
+    """Zeilen pro Band: größte Bandbreite, deren Kandidaten-Schwelle (1/b)^(1/r) noch unter threshold liegt"""
+    rows = 1
+    for r in range(1, NUM_PERM + 1):
+        if NUM_PERM % r == 0 and (r / NUM_PERM) ** (1 / r) <= threshold * 0.9:
+            rows = r
+    return rows
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+def near_duplicates(signatures: dict, threshold: float = THRESHOLD) -> list:
+    """signatures: rel_path → Hex-Signatur → [(min. Ähnlichkeit, [rel_paths])], größte Cluster zuerst"""
+    if np is None:
+        return []
+    names = sorted(rel for rel, sig in signatures.items() if sig)
+    if len(names) < 2:
+        return []
+    sig = np.frombuffer(bytes.fromhex("".join(signatures[rel] for rel in names)), dtype="<u4")
+    sig = sig.reshape(len(names), NUM_PERM)
+    rows = lsh_rows(threshold)
+    parent = list(range(len(names)))
+    pairs = []  # (Cluster-Mitglied, Ähnlichkeit) jedes Treffers → kleinste Ähnlichkeit je Cluster
+
+    for start in range(0, NUM_PERM, rows):
+        band = np.ascontiguousarray(sig[:, start:start + rows]).view(f"V{rows * 4}").ravel()
+        order = np.argsort(band, kind="stable")
+        starts = np.flatnonzero(np.r_[True, band[order][1:] != band[order][:-1]])
+        # Jedes Bucket-Mitglied nur gegen das erste Mitglied vergleichen – Cluster sind transitiv
+        first = order[np.repeat(starts, np.diff(np.r_[starts, len(order)]))]
+        candidates = first != order
+        first, other = first[candidates], order[candidates]
+        scores = np.empty(len(first))
+        for lo in range(0, len(first), CHUNK):
+            block = slice(lo, lo + CHUNK)
+            scores[block] = (sig[first[block]] == sig[other[block]]).mean(axis=1)
+        hits = scores >= threshold
+        for i, j, score in zip(first[hits].tolist(), other[hits].tolist(), scores[hits].tolist()):
+            a, b = _find(parent, i), _find(parent, j)
+            if a != b:
+                parent[b] = a
+            pairs.append((i, score))
+
+    clusters, lowest = {}, {}
+    for i in range(len(names)):
+        clusters.setdefault(_find(parent, i), []).append(names[i])
+    for i, score in pairs:
+        root = _find(parent, i)
+        lowest[root] = min(lowest.get(root, 1.0), score)
+    result = [(round(lowest[root], 3), members) for root, members in clusters.items() if len(members) > 1]
+    return sorted(result, key=lambda c: (-len(c[1]), c[1][0]))
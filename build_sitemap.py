@@ -0,0 +1,122 @@
+# =====================================================
+# build_sitemap.py – Gesplittete, gestreamte Sitemaps mit Sitemap-Index
+# =====================================================
+#
+# dist/sitemap_index.xml      → verweist auf alle Teil-Sitemaps
+# dist/sitemap-1.xml.gz, ...  → je höchstens 50.000 URLs (Protokoll-Limit)
+#
+# Einträge werden direkt in die gzip-Datei geschrieben, die komplette
+# URL-Liste liegt nie als XML-String im Speicher. Statt in dist kann auch in
+# ein Build-Archiv geschrieben werden (open_file=ArchiveWriter.open).
+
+import gzip
+import re
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import quote
+from xml.sax.saxutils import escape
+
+from build_assets import atomic_open
+
+# ----------------------------
+# CONFIG
+# ----------------------------
+BASE_URL = "https://lukas69571.github.io/website/"
+SHARD_LIMIT = 50000
+INDEX_NAME = "sitemap_index.xml"
+SHARD_PATTERN = re.compile(r"sitemap-(\d+)\.xml\.gz$")
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+URLSET_OPEN = '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+INDEX_OPEN = '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+
+# ----------------------------
+# URLS
+# ----------------------------
+def page_url(rel_path: str, base_url: str = BASE_URL) -> str:
+    """slug/index.html → slug/, index.html → Startseite, Umlaute werden kodiert"""
+    if rel_path == "index.html":
+        rel_path = ""
+    elif rel_path.endswith("/index.html"):
+        rel_path = rel_path[: -len("index.html")]
+    return base_url.rstrip("/") + "/" + quote(rel_path, safe="/")
+
+def scan_entries(base_path: Path):
+    """Fallback ohne Manifest: alle HTML-Dateien, lastmod aus der mtime"""
+    base_path = Path(base_path)
+    for path in sorted(base_path.rglob("*.html")):
+        mtime = datetime.fromtimestamp(path.stat().st_mtime, timezone.utc)
+        yield path.relative_to(base_path).as_posix(), mtime.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def _url_entry(loc: str, lastmod) -> str:
+    if lastmod:
+        return f"<url><loc>{escape(loc)}</loc><lastmod>{lastmod}</lastmod></url>\n"
+    return f"<url><loc>{escape(loc)}</loc></url>\n"
+
+# ----------------------------
+# SCHREIBEN
+# ----------------------------
+class _Shard:
+    def __init__(self, name: str, open_file):
+        self.name = name
+        self._stack = ExitStack()
+        raw = self._stack.enter_context(open_file(name))
+        # mtime=0 und ohne Dateiname im Header → unveränderte Shards bleiben byte-identisch
+        self.file = self._stack.enter_context(
+            gzip.GzipFile(filename="", mode="wb", compresslevel=9, fileobj=raw, mtime=0))
+        self.file.write((XML_HEADER + URLSET_OPEN).encode("utf-8"))
+        self.count = 0
+        self.lastmod = None
+
+    def add(self, loc: str, lastmod):
+        self.file.write(_url_entry(loc, lastmod).encode("utf-8"))
+        self.count += 1
+        if lastmod and (self.lastmod is None or lastmod > self.lastmod):
+            self.lastmod = lastmod
+
+    def close(self):
+        self.file.write(b"</urlset>\n")
+        self._stack.close()
+
+def write_sitemaps(base_path: Path, entries, base_url: str = BASE_URL, limit: int = SHARD_LIMIT,
+                   open_file=None) -> dict:
+    """entries: (rel_path, lastmod) – nur HTML-Outputs landen in der Sitemap.
+    open_file(name) liefert eine binäre Datei als Kontextmanager; ohne wird atomar nach base_path geschrieben."""
+    archive_mode = open_file is not None
+    if not archive_mode:
+        base_path = Path(base_path)
+
+        def open_file(name):
+            return atomic_open(base_path / name)
+    shards = []
+    shard = None
+    urls = 0
+    for rel_path, lastmod in entries:
+        if not rel_path.endswith(".html"):
+            continue
+        if shard is None or shard.count >= limit:
+            if shard:
+                shard.close()
+            shard = _Shard(f"sitemap-{len(shards) + 1}.xml.gz", open_file)
+            shards.append(shard)
+        shard.add(page_url(rel_path, base_url), lastmod)
+        urls += 1
+    if shard:
+        shard.close()
+
+    if not archive_mode:
+        # Shards aus früheren, größeren Builds entfernen
+        for path in base_path.glob("sitemap-*.xml.gz"):
+            match = SHARD_PATTERN.match(path.name)
+            if match and int(match.group(1)) > len(shards):
+                path.unlink()
+
+    with open_file(INDEX_NAME) as f:
+        f.write((XML_HEADER + INDEX_OPEN).encode("utf-8"))
+        for s in shards:
+            loc = escape(base_url.rstrip("/") + "/" + s.name)
+            lastmod = f"<lastmod>{s.lastmod}</lastmod>" if s.lastmod else ""
+            f.write(f"<sitemap><loc>{loc}</loc>{lastmod}</sitemap>\n".encode("utf-8"))
+        f.write(b"</sitemapindex>\n")
+    return {"urls": urls, "shards": len(shards), "index": INDEX_NAME}
@@ -1,9 +1,14 @@
-from pathlib import Path
+from pathlib import Path, PurePosixPath
+from build_assets import write_atomic
+from build_css import build_stylesheet, scan_usage
+from build_fingerprint import AssetManifest
+from build_templates import render_template
 
 # ---------------- VERZEICHNISSE ----------------
 ROOT = Path.cwd()  # Aktuelles Verzeichnis: C:\Users\lukas\website
-IMG_DIR = ROOT / "assets/images"
-CSS_FILE = ROOT / "assets/css/style.css"
+ASSET_DIR = ROOT / "assets"
+IMG_DIR = ASSET_DIR / "images"
+CSS_FILE = ASSET_DIR / "css/style.css"
 
 # Unterseiten-Inhalt
 SUBPAGES = {
@@ -60,48 +65,44 @@ img {
 
 # ---------------- FUNKTIONEN ----------------
 def update_css():
-    CSS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    CSS_FILE.write_text(CSS_CONTENT, encoding="utf-8")
+    # Nur Regeln, die eine der Unterseiten tatsächlich nutzt – doppelte fallen weg.
+    # Atomar: die Hash-Kopie unter assets/ ist ein Hardlink auf CSS_FILE
+    used = scan_usage(render_template("design_page.html", content=content) for content in SUBPAGES.values())
+    css, _ = build_stylesheet([CSS_CONTENT], used)
+    write_atomic(CSS_FILE, css)
 
-def add_images_and_content():
+def add_placeholder_images():
     IMG_DIR.mkdir(parents=True, exist_ok=True)
-    for page, content in SUBPAGES.items():
-        html_path = ROOT / page
-        html = f"""
-<html>
-<head>
-    <meta charset='UTF-8'>
-    <title>{content['headline']}</title>
-    <link rel='stylesheet' href='assets/css/style.css'>
-</head>
-<body>
-    <nav>
-        <a href='index.html'>Home</a> |
-        <a href='services.html'>Services</a> |
-        <a href='about.html'>About</a> |
-        <a href='contact.html'>Contact</a>
-    </nav>
-    <header>
-        <h1>{content['headline']}</h1>
-    </header>
-    <main>
-        <section>
-            <p>{content['text']}</p>
-            <img src='assets/images/{content['image']}' alt='{content['headline']}'>
-        </section>
-    </main>
-    <footer>
-        © 2025 Lukas
-    </footer>
-</body>
-</html>
-"""
-        html_path.write_text(html, encoding="utf-8")
-        # Platzhalterbild erzeugen
+    for content in SUBPAGES.values():
         img_path = IMG_DIR / content['image']
         if not img_path.exists():
             img_path.write_bytes(b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR" + b"\x00"*13 + b"\x00\x00\x00\x00IEND\xaeB`\x82")
 
+def fingerprint_design_assets() -> AssetManifest:
+    """Hash-Namen unter assets/ – Manifest liegt in assets/asset-manifest.json"""
+    assets = AssetManifest(ASSET_DIR)
+    assets.add(CSS_FILE, "css/style.css")
+    for content in SUBPAGES.values():
+        assets.add(IMG_DIR / content['image'], f"images/{content['image']}")
+    assets.place()
+    return assets
+
+def add_images_and_content():
+    # Bilder zuerst, damit ihr Hash beim Rendern feststeht
+    add_placeholder_images()
+    assets = fingerprint_design_assets()
+    for page, content in SUBPAGES.items():
+        html_path = ROOT / page
+        image = PurePosixPath(assets.url(f"images/{content['image']}")).name
+        html = render_template(
+            "design_page.html",
+            content={**content, "image": image},
+            css_href="assets/" + assets.url("css/style.css"),
+        )
+        html_path.write_text(html, encoding="utf-8")
+    # Alte Hash-Namen erst entfernen, wenn keine Seite mehr auf sie zeigt
+    assets.finish()
+
 # ---------------- MAIN ----------------
 def main():
     print("=== BUILD MODERN SUBPAGES + DESIGN ===")
@@ -0,0 +1,406 @@
+# =====================================================
+# build_templates.py – Vorkompilierte Templates mit Cache
+# =====================================================
+#
+# Mini-Template-Sprache (Ausdrücke sind normales Python, wie in den f-Strings):
+#   {{ data['title'] }}                   Ausdruck ausgeben
+#   {% if x %} / {% elif y %} / {% else %} / {% endif %}
+#   {% for p in data['problems'] %} ... {% endfor %}
+#   {% extends "base.html" %}             muss das erste Tag sein
+#   {% block name %} ... {% endblock %}   überschreibbarer Bereich
+#   {% include "partials/nav.html" %}
+#   {% cache %} ... {% endcache %}        Fragment einmal pro Build rendern (siehe unten)
+#   {# Kommentar #}
+#
+# Jedes Template wird einmal geparst, zu einer Python-Generatorfunktion kompiliert
+# und im Speicher + als Bytecode unter .template_cache/ gehalten.
+#
+# Fragment-Cache: Schlüssel sind die Werte aller Ausdrücke, die im cache-Bereich vorkommen.
+# Statischer Text ist ohnehin schon eine Konstante im Bytecode – lohnend ist der Cache
+# für Partials mit Eingaben (Meta-Tags, Nav, ...), die auf vielen Seiten gleich sind.
+
+import ast
+import builtins
+import hashlib
+import importlib.util
+import marshal
+import re
+from pathlib import Path
+
+# ----------------------------
+# CONFIG
+# ----------------------------
+BASE_DIR = Path(__file__).parent.resolve()
+TEMPLATE_DIR = BASE_DIR / "templates"
+CACHE_DIR = BASE_DIR / ".template_cache"
+ENGINE_VERSION = "2"
+MAX_FRAGMENTS = 2048  # darüber wird nicht mehr gespeichert, nur noch gerendert
+
+# Block-Tags schlucken führende Einrückung und den Zeilenumbruch danach (wie trim/lstrip_blocks)
+TOKEN_RE = re.compile(
+    r"(?P<tag>(?:^[ \t]*)?\{%\s*(?P<stmt>.*?)\s*%\}\n?)"
+    r"|(?P<comment>(?:^[ \t]*)?\{#.*?#\}\n?)"
+    r"|\{\{\s*(?P<expr>.*?)\s*\}\}",
+    re.S | re.M,
+)
+
+_TEMPLATES = {}
+
+
+class TemplateError(Exception):
+    pass
+
+
+class FragmentCache:
+    """Gerenderte Fragmente pro (Template-Stelle, Eingaben) – mit Hit/Miss-Statistik"""
+
+    def __init__(self):
+        self.fragments = {}
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+
+    def fetch(self, key, render) -> str:
+        try:
+            fragment = self.fragments.get(key)
+        except TypeError:
+            # Nicht hashbare Eingaben (Listen, Dicts) → direkt rendern
+            self.uncached += 1
+            return "".join(render())
+        if fragment is not None:
+            self.hits += 1
+            return fragment
+        self.misses += 1
+        fragment = "".join(render())
+        if len(self.fragments) < MAX_FRAGMENTS:
+            self.fragments[key] = fragment
+        return fragment
+
+    def drain(self) -> tuple:
+        """Zähler abholen und zurücksetzen (Worker melden so an den Hauptprozess)"""
+        stats = (self.hits, self.misses, self.uncached)
+        self.hits = self.misses = self.uncached = 0
+        return stats
+
+    def merge(self, stats):
+        self.hits += stats[0]
+        self.misses += stats[1]
+        self.uncached += stats[2]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "uncached": self.uncached,
+            "entries": len(self.fragments),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        self.fragments.clear()
+        self.drain()
+
+
+FRAGMENTS = FragmentCache()
+
+# ----------------------------
+# PARSER
+# ----------------------------
+def _read(name: str, deps: dict) -> str:
+    path = TEMPLATE_DIR / name
+    if not path.is_file():
+        raise TemplateError(f"Template nicht gefunden: {name}")
+    source = path.read_text(encoding="utf-8")
+    deps[name] = hashlib.sha256(source.encode("utf-8")).hexdigest()
+    return source
+
+def _tokenize(source: str):
+    pos = 0
+    for m in TOKEN_RE.finditer(source):
+        if m.start() > pos:
+            yield "text", source[pos:m.start()]
+        if m.group("tag"):
+            yield "tag", m.group("stmt")
+        elif m.group("expr") is not None:
+            yield "expr", m.group("expr")
+        pos = m.end()
+    if pos < len(source):
+        yield "text", source[pos:]
+
+def _parse(source: str, name: str):
+    """Liefert (parent, nodes). Knoten: text, expr, if, for, block, include, cache."""
+    root = []
+    stack = [("root", root, None)]
+    parent = None
+
+    for kind, value in _tokenize(source):
+        body = stack[-1][1]
+        if kind != "tag":
+            body.append((kind, value))
+            continue
+
+        word, _, rest = value.partition(" ")
+        rest = rest.strip()
+        if word == "extends":
+            if root or len(stack) > 1:
+                raise TemplateError(f"{name}: extends muss das erste Tag sein")
+            parent = ast.literal_eval(rest)
+        elif word == "include":
+            body.append(("include", ast.literal_eval(rest)))
+        elif word == "block":
+            node = ("block", rest, [])
+            body.append(node)
+            stack.append(("block", node[2], node))
+        elif word == "cache":
+            node = ("cache", [])
+            body.append(node)
+            stack.append(("cache", node[1], node))
+        elif word == "for":
+            target, sep, iterable = rest.partition(" in ")
+            if not sep:
+                raise TemplateError(f"{name}: ungültige Schleife '{value}'")
+            node = ("for", target.strip(), iterable.strip(), [])
+            body.append(node)
+            stack.append(("for", node[3], node))
+        elif word == "if":
+            node = ("if", [(rest, [])], [])
+            body.append(node)
+            stack.append(("if", node[1][0][1], node))
+        elif word in ("elif", "else"):
+            if stack[-1][0] != "if":
+                raise TemplateError(f"{name}: {word} ohne if")
+            node = stack.pop()[2]
+            if word == "elif":
+                node[1].append((rest, []))
+                stack.append(("if", node[1][-1][1], node))
+            else:
+                stack.append(("else", node[2], node))
+        elif word in ("endblock", "endfor", "endif", "endcache"):
+            expected = word[3:]
+            if stack[-1][0] not in (expected, "else" if expected == "if" else expected):
+                raise TemplateError(f"{name}: unerwartetes {word}")
+            stack.pop()
+        else:
+            raise TemplateError(f"{name}: unbekanntes Tag '{word}'")
+
+    if len(stack) > 1:
+        raise TemplateError(f"{name}: nicht geschlossenes {stack[-1][0]}")
+    if parent is not None:
+        # Text außerhalb von Blöcken wird bei Kind-Templates ignoriert
+        root = [n for n in root if n[0] == "block"]
+    return parent, root
+
+def _collect_blocks(nodes, blocks):
+    for node in nodes:
+        if node[0] == "block":
+            blocks.setdefault(node[1], node[2])
+            _collect_blocks(node[2], blocks)
+        elif node[0] == "for":
+            _collect_blocks(node[3], blocks)
+        elif node[0] == "cache":
+            _collect_blocks(node[1], blocks)
+        elif node[0] == "if":
+            for _, body in node[1]:
+                _collect_blocks(body, blocks)
+            _collect_blocks(node[2], blocks)
+
+def _substitute(nodes, blocks, deps):
+    """Blöcke durch die Version des tiefsten Kind-Templates ersetzen, Includes einsetzen"""
+    out = []
+    for node in nodes:
+        kind = node[0]
+        if kind == "block":
+            out.extend(_substitute(blocks.get(node[1], node[2]), blocks, deps))
+        elif kind == "include":
+            out.extend(_resolve(node[1], {}, deps))
+        elif kind == "for":
+            out.append(("for", node[1], node[2], _substitute(node[3], blocks, deps)))
+        elif kind == "cache":
+            out.append(("cache", _substitute(node[1], blocks, deps)))
+        elif kind == "if":
+            branches = [(cond, _substitute(body, blocks, deps)) for cond, body in node[1]]
+            out.append(("if", branches, _substitute(node[2], blocks, deps)))
+        else:
+            out.append(node)
+    return out
+
+def _resolve(name: str, overrides: dict, deps: dict):
+    parent, nodes = _parse(_read(name, deps), name)
+    blocks = {}
+    _collect_blocks(nodes, blocks)
+    blocks.update(overrides)
+    if parent is not None:
+        return _resolve(parent, blocks, deps)
+    return _substitute(nodes, blocks, deps)
+
+# ----------------------------
+# COMPILER
+# ----------------------------
+def _names(expr: str, names: set):
+    try:
+        tree = ast.parse(expr, mode="eval")
+    except SyntaxError as e:
+        raise TemplateError(f"Ungültiger Ausdruck '{expr}': {e}") from None
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+            names.add(node.id)
+
+def _key_exprs(nodes, exprs: set, targets: set):
+    """Alle Ausdrücke eines cache-Bereichs; Schleifenvariablen werden gesondert gesammelt"""
+    for node in nodes:
+        kind = node[0]
+        if kind == "expr":
+            exprs.add(node[1])
+        elif kind == "for":
+            exprs.add(node[2])
+            _names(node[1], targets)
+            _key_exprs(node[3], exprs, targets)
+        elif kind == "cache":
+            _key_exprs(node[1], exprs, targets)
+        elif kind == "if":
+            for cond, body in node[1]:
+                exprs.add(cond)
+                _key_exprs(body, exprs, targets)
+            _key_exprs(node[2], exprs, targets)
+
+def _cache_key(nodes) -> list:
+    """Schlüssel = Werte der Ausdrücke, die nicht von Schleifenvariablen abhängen"""
+    exprs, targets = set(), set()
+    _key_exprs(nodes, exprs, targets)
+    key = []
+    for expr in sorted(exprs):
+        used = set()
+        _names(expr, used)
+        if not used & targets:
+            key.append(expr)
+    return key
+
+def _generate(nodes, lines, indent, names, site=None):
+    pad = "    " * indent
+    parts = []
+    site = site if site is not None else {"name": "", "count": 0}
+
+    def flush():
+        if parts:
+            lines.append(f"{pad}yield {' + '.join(parts)}")
+            parts.clear()
+
+    for node in nodes:
+        kind = node[0]
+        if kind == "text":
+            parts.append(repr(node[1]))
+        elif kind == "expr":
+            _names(node[1], names)
+            parts.append(f"_str({node[1]})")
+        elif kind == "for":
+            flush()
+            _names(node[2], names)
+            lines.append(f"{pad}for {node[1]} in {node[2]}:")
+            _generate(node[3], lines, indent + 1, names, site)
+        elif kind == "cache":
+            flush()
+            site["count"] += 1
+            fn = f"_fragment{site['count']}"
+            lines.append(f"{pad}def {fn}():")
+            _generate(node[1], lines, indent + 1, names, site)
+            lines.append(f"{pad}    yield from ()")
+            key = [repr(f"{site['name']}:{site['count']}")] + [f"({expr})" for expr in _cache_key(node[1])]
+            lines.append(f"{pad}yield _fragments.fetch(({', '.join(key)},), {fn})")
+        elif kind == "if":
+            flush()
+            for i, (cond, body) in enumerate(node[1]):
+                _names(cond, names)
+                lines.append(f"{pad}{'if' if i == 0 else 'elif'} {cond}:")
+                _generate(body, lines, indent + 1, names, site)
+            if node[2]:
+                lines.append(f"{pad}else:")
+                _generate(node[2], lines, indent + 1, names, site)
+    flush()
+    if not lines or lines[-1].endswith(":"):
+        lines.append(f"{pad}pass")
+
+def _compile(name: str):
+    deps = {}
+    nodes = _resolve(name, {}, deps)
+    body, names = [], set()
+    _generate(nodes, body, 1, names, {"name": name, "count": 0})
+
+    # Kontextvariablen einmal als lokale Namen binden, Builtins bleiben erreichbar
+    header = ["def render(_ctx):", "    _get = _ctx.get", "    _str = str"]
+    for var in sorted(names):
+        if hasattr(builtins, var):
+            header.append(f"    {var} = _ctx[{var!r}] if {var!r} in _ctx else _builtins.{var}")
+        else:
+            header.append(f"    {var} = _get({var!r})")
+    source = "\n".join(header + body + ["    yield from ()"]) + "\n"
+    return compile(source, f"<template {name}>", "exec"), deps
+
+# ----------------------------
+# CACHE
+# ----------------------------
+def _cache_file(name: str) -> Path:
+    return CACHE_DIR / (hashlib.sha1(name.encode("utf-8")).hexdigest() + ".bin")
+
+def _load_cached(name: str):
+    path = _cache_file(name)
+    if not path.exists():
+        return None
+    try:
+        version, magic, deps, code = marshal.loads(path.read_bytes())
+    except (ValueError, EOFError, TypeError):
+        return None
+    if version != ENGINE_VERSION or magic != importlib.util.MAGIC_NUMBER:
+        return None
+    for dep, digest in deps.items():
+        current = {}
+        try:
+            _read(dep, current)
+        except TemplateError:
+            return None
+        if current[dep] != digest:
+            return None
+    return code
+
+def _store_cached(name: str, code, deps: dict):
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _cache_file(name).write_bytes(marshal.dumps((ENGINE_VERSION, importlib.util.MAGIC_NUMBER, deps, code)))
+    except OSError:
+        pass  # Cache ist optional
+
+def load_template(name: str):
+    """Kompilierte Render-Funktion: Speicher-Cache → Platten-Cache → neu kompilieren"""
+    render = _TEMPLATES.get(name)
+    if render is not None:
+        return render
+    code = _load_cached(name)
+    if code is None:
+        code, deps = _compile(name)
+        _store_cached(name, code, deps)
+    namespace = {"_builtins": builtins, "_fragments": FRAGMENTS}
+    exec(code, namespace)
+    render = _TEMPLATES[name] = namespace["render"]
+    return render
+
+def clear_cache():
+    _TEMPLATES.clear()
+    FRAGMENTS.clear()
+
+def templates_digest() -> str:
+    """Hash über alle Templates – ändert sich ein Template, sind alle Seiten veraltet"""
+    digest = hashlib.sha256(ENGINE_VERSION.encode("utf-8"))
+    if TEMPLATE_DIR.exists():
+        for path in sorted(TEMPLATE_DIR.rglob("*.html")):
+            digest.update(path.relative_to(TEMPLATE_DIR).as_posix().encode("utf-8"))
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+# ----------------------------
+# RENDERING
+# ----------------------------
+def stream_template(name: str, **ctx):
+    return load_template(name)(ctx)
+
+def render_template(name: str, **ctx) -> str:
+    return "".join(load_template(name)(ctx))
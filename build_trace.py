@@ -0,0 +1,103 @@
+# =====================================================
+# build_trace.py – Zeitmessung pro Stage und Seite, JSON- und Chrome-Trace
+# =====================================================
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def _cpu_time() -> float:
+    """CPU-Zeit inkl. beendeter Kindprozesse (Worker aus dem ProcessPool)"""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+class BuildTracer:
+    def __init__(self):
+        # Einträge pro Seite nur für --trace/--chrome-trace – bei 1M Seiten sonst ungebremst wachsender Speicher
+        self.record_pages = False
+        self.reset()
+
+    def reset(self):
+        self.started = time.perf_counter()
+        self.stages = []
+        self.pages = []
+        self._stack = []
+
+    @contextmanager
+    def stage(self, name: str):
+        record = {"name": name, "start": time.perf_counter() - self.started, "bytes": 0, "pages": 0}
+        cpu = _cpu_time()
+        self._stack.append(record)
+        try:
+            yield record
+        finally:
+            self._stack.pop()
+            record["wall"] = time.perf_counter() - self.started - record["start"]
+            record["cpu"] = _cpu_time() - cpu
+            self.stages.append(record)
+            if self._stack:
+                self._stack[-1]["bytes"] += record["bytes"]
+                self._stack[-1]["pages"] += record["pages"]
+
+    def page(self, rel_path: str, render: float, write: float, size: int):
+        """Wird im Hauptprozess aufgerufen – Worker liefern ihre Messwerte als Rückgabewert"""
+        if self.record_pages:
+            stage = self._stack[-1]["name"] if self._stack else None
+            self.pages.append({"path": rel_path, "stage": stage, "render": render, "write": write, "bytes": size})
+        if self._stack:
+            self._stack[-1]["bytes"] += size
+            self._stack[-1]["pages"] += 1
+
+    def add_bytes(self, size: int):
+        if self._stack:
+            self._stack[-1]["bytes"] += size
+
+    # ----------------------------
+    # EXPORT
+    # ----------------------------
+    def summary(self) -> dict:
+        return {
+            "total_wall": time.perf_counter() - self.started,
+            "stages": self.stages,
+            "pages": self.pages,
+        }
+
+    def write_json(self, path: Path):
+        Path(path).write_text(json.dumps(self.summary(), indent=2, ensure_ascii=False), encoding="utf-8")
+
+    def write_chrome_trace(self, path: Path):
+        """Format für chrome://tracing bzw. Perfetto (Zeiten in Mikrosekunden)"""
+        events = [
+            {
+                "name": s["name"], "cat": "stage", "ph": "X", "pid": 1, "tid": 1,
+                "ts": s["start"] * 1e6, "dur": s["wall"] * 1e6,
+                "args": {"cpu": s["cpu"], "bytes": s["bytes"], "pages": s["pages"]},
+            }
+            for s in self.stages
+        ]
+        # Seiten ohne eigene Startzeit (Worker) landen hintereinander auf eigener Spur
+        offsets = {}
+        stage_starts = {s["name"]: s["start"] for s in self.stages}
+        for p in self.pages:
+            ts = offsets.get(p["stage"], stage_starts.get(p["stage"], 0.0))
+            dur = p["render"] + p["write"]
+            offsets[p["stage"]] = ts + dur
+            events.append({
+                "name": p["path"], "cat": "page", "ph": "X", "pid": 1, "tid": 2,
+                "ts": ts * 1e6, "dur": dur * 1e6,
+                "args": {"render": p["render"], "write": p["write"], "bytes": p["bytes"]},
+            })
+        Path(path).write_text(json.dumps({"traceEvents": events}), encoding="utf-8")
+
+    def report(self) -> str:
+        lines = [f"{'Stage':<20}{'Wall':>9}{'CPU':>9}{'Seiten':>8}{'Bytes':>12}"]
+        for s in self.stages:
+            lines.append(f"{s['name']:<20}{s['wall']:>8.2f}s{s['cpu']:>8.2f}s{s['pages']:>8}{s['bytes']:>12}")
+        return "\n".join(lines)
+
+
+TRACER = BuildTracer()
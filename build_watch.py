@@ -0,0 +1,79 @@
+# =====================================================
+# build_watch.py – Dateien beobachten und gezielt neu bauen
+# =====================================================
+
+import os
+import time
+from pathlib import Path
+
+# ----------------------------
+# CONFIG
+# ----------------------------
+POLL_INTERVAL = 0.5  # Sekunden zwischen zwei Scans
+DEBOUNCE = 0.2       # Wartezeit, damit Editoren fertig speichern können
+
+# ----------------------------
+# SNAPSHOTS
+# ----------------------------
+def _scan(path: Path, state: dict):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return
+    if not os.path.isdir(path):
+        state[str(path)] = (st.st_mtime_ns, st.st_size)
+        return
+    # os.scandir liefert stat-Infos meist ohne extra Syscall
+    stack = [str(path)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    st = entry.stat()
+                    state[entry.path] = (st.st_mtime_ns, st.st_size)
+
+def snapshot(paths) -> dict:
+    state = {}
+    for path in paths:
+        _scan(Path(path), state)
+    return state
+
+def diff_snapshots(old: dict, new: dict) -> set:
+    changed = {p for p, sig in new.items() if old.get(p) != sig}
+    changed |= set(old) - set(new)
+    return {Path(p) for p in changed}
+
+def touches(changed, watched) -> bool:
+    """Betrifft eine der Änderungen die Datei bzw. das Verzeichnis watched?"""
+    watched = Path(watched)
+    return any(p == watched or watched in p.parents for p in changed)
+
+# ----------------------------
+# WATCH LOOP
+# ----------------------------
+def watch(paths, rebuild, interval=POLL_INTERVAL, once=False):
+    """Sammelt alle Änderungen eines Speichervorgangs und ruft rebuild(changed) genau einmal auf (Strg+C beendet)"""
+    paths = [Path(p) for p in paths]
+    state = snapshot(paths)
+    print(f"👀 Beobachte {len(paths)} Pfade ({len(state)} Dateien) …")
+    try:
+        while True:
+            time.sleep(interval)
+            new_state = snapshot(paths)
+            changed = diff_snapshots(state, new_state)
+            if not changed:
+                continue
+            time.sleep(DEBOUNCE)
+            new_state = snapshot(paths)
+            changed |= diff_snapshots(state, new_state)
+            state = new_state
+
+            started = time.perf_counter()
+            rebuild(changed)
+            print(f"🔁 {len(changed)} Änderung(en) verarbeitet in {time.perf_counter() - started:.2f}s")
+            if once:
+                return
+    except KeyboardInterrupt:
+        print("Watch beendet")
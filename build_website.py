@@ -1,116 +1,40 @@
 # =====================================================
-# build_website.py – KOMPLETTER EFFIZIENTER BUILD
-# =====================================================
-
-import os
-import shutil
-from pathlib import Path
-
-# ----------------------------
-# CONFIG
-# ----------------------------
-BASE_DIR = Path(__file__).parent.resolve()
-DIST_DIR = BASE_DIR / "dist"
-SUBPAGES = {
-    "ai-solutions": ["index.html", "services.html", "contact.html"]
-}
-CSS_FILE = BASE_DIR / "style.css"
-IMG_DIR = BASE_DIR / "images"
-
-# ----------------------------
-# UTILITY
-# ----------------------------
-def ensure_dir(path: Path):
-    path.mkdir(parents=True, exist_ok=True)
-
-def copy_css(target_dir: Path):
-    if CSS_FILE.exists():
-        shutil.copy(CSS_FILE, target_dir / CSS_FILE.name)
-
-def copy_images(target_dir: Path):
-    if IMG_DIR.exists():
-        shutil.copytree(IMG_DIR, target_dir / "images", dirs_exist_ok=True)
-
-def log(msg: str):
-    print(f"✅ {msg}")
-
-# ----------------------------
-# PAGE GENERATOR
-# ----------------------------
-def build_page(content: str, target_file: Path):
-    ensure_dir(target_file.parent)
-    with open(target_file, "w", encoding="utf-8") as f:
-        f.write(content)
-    log(f"Seite gebaut: {target_file}")
-
-# ----------------------------
-# TEMPLATES
-# ----------------------------
-def get_template(page_name: str, subpage: str = None) -> str:
-    title = page_name.replace("-", " ").title()
-    css_link = f'<link rel="stylesheet" href="style.css">'
-    subpath_prefix = "" if subpage is None else "./"
-    html = f"""<!DOCTYPE html>
-<html lang="de">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
-    {css_link}
-</head>
-<body>
-    <header><h1>{title}</h1></header>
-    <main>
-        <p>Willkommen auf der Seite {title}.</p>
-    </main>
-    <footer><p>&copy; 2026 Lukas</p></footer>
-</body>
-</html>"""
-    return html
-
-# ----------------------------
-# BUILD LOGIC
-# ----------------------------
-def build_main_site():
-    ensure_dir(DIST_DIR)
-    copy_css(DIST_DIR)
-    copy_images(DIST_DIR)
-    
-    for page in ["index", "services", "contact"]:
-        target_file = DIST_DIR / f"{page}.html"
-        content = get_template(page)
-        build_page(content, target_file)
-    
-    log(f"Website komplett gebaut inkl. CSS → {DIST_DIR}")
-
-def build_subpages():
-    for subpage, pages in SUBPAGES.items():
-        sub_dir = BASE_DIR / subpage / "dist"
-        ensure_dir(sub_dir)
-        copy_css(sub_dir)
-        copy_images(sub_dir)
-        
-        for page in pages:
-            page_name = page.split(".")[0]
-            target_file = sub_dir / page
-            content = get_template(page_name, subpage=subpage)
-            build_page(content, target_file)
-        
-        log(f"Website '{BASE_DIR / subpage}' fertig inkl. CSS → {sub_dir}")
-
-# ----------------------------
-# RUN
-# ----------------------------
-if __name__ == "__main__":
-    build_main_site()
-    build_subpages()
-# =====================================================
-# build_website.py – KOMPLETTE FERTIGE WEBSITE
+# build_website.py – Profi Multi-Page Website + Automatische Bilder
 # =====================================================
-
-import os
-import shutil
+#
+# Jede Ausgabedatei hat genau einen Builder:
+# - PAGES + pages.json + content/pages.json: index.html, services.html, contact.html, ...
+# - Landingpages (LANDINGPAGES) und SEO-Seiten (SEO_KEYWORDS): <slug>/index.html
+# - Preise, SaaS-Platzhalter, Danke-Seite
+# - SUBPAGES: eigene kleine Sites unter <name>/dist
+#
+# python build_website.py [build|watch] --jobs N
+# python build_website.py --archive dist.tar.gz   (ohne dist-Baum, Vorschau: build_archive.py)
+
+import hashlib
+import time
 from pathlib import Path
+from urllib.parse import urlsplit
+from build_archive import ArchiveReader, ArchiveWriter
+from build_assets import sync_file, sync_tree, write_atomic
+from build_compress import ENCODERS, precompress
+from build_content import Hero, LandingPage, load_content
+from build_css import build_stylesheet, extract_styles, scan_usage
+from build_fingerprint import AssetManifest, fingerprint_assets, fingerprinted_name
+from build_images import pick_image, scan_images
+from build_manifest import BuildManifest, hash_inputs
+from build_minify import MINIFY_VERSION, minify_pages
+from build_parallel import parallel_map, worker_count
+from build_qa import (LinkIndex, check_thresholds, find_broken_links, scan_archive, scan_pages, write_json_report,
+                      write_junit_report)
+from build_related import HAS_NUMPY as RELATED_NUMPY, build_related
+from build_search import INDEX_DIR, SearchCollector, build_search_index
+from build_seo import SlugSet, expand_all
+from build_similar import HAS_NUMPY as SIMILAR_NUMPY, THRESHOLD, near_duplicates
+from build_sitemap import BASE_URL, scan_entries, write_sitemaps
+from build_trace import TRACER
+from build_templates import FRAGMENTS, TEMPLATE_DIR, clear_cache, render_template, stream_template, templates_digest
+from build_watch import touches, watch
 
 # ----------------------------
 # CONFIG
@@ -121,859 +45,529 @@ SUBPAGES = {
     "ai-solutions": ["index.html", "services.html", "contact.html"]
 }
 CSS_FILE = BASE_DIR / "style.css"
-IMG_DIR = BASE_DIR / "images"
-
-# ----------------------------
-# UTILITY
-# ----------------------------
-def ensure_dir(path: Path):
-    path.mkdir(parents=True, exist_ok=True)
-
-def copy_css(target_dir: Path):
-    if CSS_FILE.exists():
-        shutil.copy(CSS_FILE, target_dir / CSS_FILE.name)
-
-def copy_images(target_dir: Path):
-    if IMG_DIR.exists():
-        shutil.copytree(IMG_DIR, target_dir / "images", dirs_exist_ok=True)
-
-def log(msg: str):
-    print(f"✅ {msg}")
-
-# ----------------------------
-# PAGE GENERATOR
-# ----------------------------
-def build_page(content: str, target_file: Path):
-    ensure_dir(target_file.parent)
-    with open(target_file, "w", encoding="utf-8") as f:
-        f.write(content)
-    log(f"Seite gebaut: {target_file}")
-
-# ----------------------------
-# TEMPLATES
-# ----------------------------
-def get_template(page_name: str, subpage: str = None) -> str:
-    title = page_name.replace("-", " ").title()
-    css_link = f'<link rel="stylesheet" href="style.css">'
-    
-    # Modernes Layout mit Header, Main, Sections, Footer
-    html = f"""<!DOCTYPE html>
-<html lang="de">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
-    <meta name="description" content="Professionelle AI Services – {title}">
-    {css_link}
-</head>
-<body>
-    <header style="padding:20px; text-align:center; background:#1e1e1e; color:white;">
-        <h1>{title}</h1>
-        <nav>
-            <a href="index.html">Home</a> |
-            <a href="services.html">Services</a> |
-            <a href="contact.html">Kontakt</a>
-        </nav>
-    </header>
-    
-    <main style="padding:20px;">
-        <section style="margin-bottom:40px;">
-            <h2>Willkommen auf der Seite {title}</h2>
-            <p>Wir bieten professionelle Lösungen rund um AI, Automatisierung und Web-Services an.</p>
-        </section>
-        
-        <section style="margin-bottom:40px;">
-            <h3>Unsere Services</h3>
-            <ul>
-                <li>AI-gestützte Videoerstellung</li>
-                <li>Website-Building & Automatisierung</li>
-                <li>Voice Agents & SaaS-Lösungen</li>
-            </ul>
-        </section>
-        
-        <section style="margin-bottom:40px;">
-            <h3>Kontakt</h3>
-            <p>Schreiben Sie uns: <a href="mailto:info@lukawebsite.de">info@lukawebsite.de</a></p>
-        </section>
-    </main>
-    
-    <footer style="padding:20px; text-align:center; background:#1e1e1e; color:white;">
-        <p>&copy; 2026 Lukas – Alle Rechte vorbehalten</p>
-    </footer>
-</body>
-</html>"""
-    return html
-
-# ----------------------------
-# BUILD LOGIC
-# ----------------------------
-def build_main_site():
-    ensure_dir(DIST_DIR)
-    copy_css(DIST_DIR)
-    copy_images(DIST_DIR)
-    
-    for page in ["index", "services", "contact"]:
-        target_file = DIST_DIR / f"{page}.html"
-        content = get_template(page)
-        build_page(content, target_file)
-    
-    log(f"Website komplett gebaut inkl. CSS → {DIST_DIR}")
-
-def build_subpages():
-    for subpage, pages in SUBPAGES.items():
-        sub_dir = BASE_DIR / subpage / "dist"
-        ensure_dir(sub_dir)
-        copy_css(sub_dir)
-        copy_images(sub_dir)
-        
-        for page in pages:
-            page_name = page.split(".")[0]
-            target_file = sub_dir / page
-            content = get_template(page_name, subpage=subpage)
-            build_page(content, target_file)
-        
-        log(f"Website '{BASE_DIR / subpage}' fertig inkl. CSS → {sub_dir}")
-
-# ----------------------------
-# RUN
-# ----------------------------
-if __name__ == "__main__":
-    build_main_site()
-    build_subpages()
-# =====================================================
-# build_website.py – Single-Page Website
-# =====================================================
-
-import os
-import shutil
-from pathlib import Path
-
-# ----------------------------
-# CONFIG
-# ----------------------------
-BASE_DIR = Path(__file__).parent.resolve()
-DIST_DIR = BASE_DIR / "dist"
-CSS_FILE = BASE_DIR / "style.css"
-IMG_DIR = BASE_DIR / "images"
-
-# ----------------------------
-# UTILITY
-# ----------------------------
-def ensure_dir(path: Path):
-    path.mkdir(parents=True, exist_ok=True)
-
-def copy_css(target_dir: Path):
-    if CSS_FILE.exists():
-        shutil.copy(CSS_FILE, target_dir / CSS_FILE.name)
-
-def copy_images(target_dir: Path):
-    if IMG_DIR.exists():
-        shutil.copytree(IMG_DIR, target_dir / "images", dirs_exist_ok=True)
-
-def log(msg: str):
-    print(f"✅ {msg}")
-
-# ----------------------------
-# PAGE GENERATOR
-# ----------------------------
-def build_single_page():
-    ensure_dir(DIST_DIR)
-    copy_css(DIST_DIR)
-    copy_images(DIST_DIR)
-
-    html = f"""<!DOCTYPE html>
-<html lang="de">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Lukas AI Solutions</title>
-    <meta name="description" content="Professionelle AI-Services und Automatisierungslösungen">
-    <link rel="stylesheet" href="style.css">
-    <style>
-        body {{ font-family: Arial, sans-serif; margin:0; }}
-        header {{ background:#1e1e1e; color:white; padding:20px; text-align:center; position:sticky; top:0; }}
-        nav a {{ color:white; margin:0 15px; text-decoration:none; }}
-        section {{ padding:60px 20px; }}
-        footer {{ background:#1e1e1e; color:white; text-align:center; padding:20px; }}
-    </style>
-</head>
-<body>
-    <header>
-        <h1>Lukas AI Solutions</h1>
-        <nav>
-            <a href="#home">Home</a>
-            <a href="#services">Services</a>
-            <a href="#contact">Kontakt</a>
-        </nav>
-    </header>
-
-    <section id="home" style="background:#f4f4f4;">
-        <h2>Willkommen</h2>
-        <p>Wir bieten professionelle Lösungen rund um AI, Automatisierung und Web-Services an.</p>
-    </section>
-
-    <section id="services">
-        <h2>Unsere Services</h2>
-        <ul>
-            <li>AI-gestützte Videoerstellung</li>
-            <li>Website-Building & Automatisierung</li>
-            <li>Voice Agents & SaaS-Lösungen</li>
-        </ul>
-    </section>
-
-    <section id="contact" style="background:#f4f4f4;">
-        <h2>Kontakt</h2>
-        <p>Schreiben Sie uns: <a href="mailto:info@lukawebsite.de">info@lukawebsite.de</a></p>
-    </section>
-
-    <footer>
-        <p>&copy; 2026 Lukas – Alle Rechte vorbehalten</p>
-    </footer>
-</body>
-</html>"""
-
-    target_file = DIST_DIR / "index.html"
-    with open(target_file, "w", encoding="utf-8") as f:
-        f.write(html)
-    log(f"Single-Page Website gebaut → {target_file}")
-
-# ----------------------------
-# RUN
-# ----------------------------
-if __name__ == "__main__":
-    build_single_page()
-# =====================================================
-# build_website.py – Multi-Page Website mit Unterseiten
-# =====================================================
-
-import os
-import shutil
-from pathlib import Path
-
-# ----------------------------
-# CONFIG
-# ----------------------------
-BASE_DIR = Path(__file__).parent.resolve()
-DIST_DIR = BASE_DIR / "dist"
-CSS_FILE = BASE_DIR / "style.css"
-IMG_DIR = BASE_DIR / "images"
-
-PAGES = {
-    "index.html": {"title": "Home", "content": "Willkommen auf unserer Home-Seite."},
-    "services.html": {"title": "Services", "content": "Unsere AI-gestützten Services."},
-    "contact.html": {"title": "Kontakt", "content": "Schreiben Sie uns eine Nachricht."}
-}
-
-# ----------------------------
-# UTILITY
-# ----------------------------
-def ensure_dir(path: Path):
-    path.mkdir(parents=True, exist_ok=True)
-
-def copy_css(target_dir: Path):
-    if CSS_FILE.exists():
-        shutil.copy(CSS_FILE, target_dir / CSS_FILE.name)
-
-def copy_images(target_dir: Path):
-    if IMG_DIR.exists():
-        shutil.copytree(IMG_DIR, target_dir / "images", dirs_exist_ok=True)
-
-def log(msg: str):
-    print(f"✅ {msg}")
-
-# ----------------------------
-# PAGE GENERATOR
-# ----------------------------
-def build_page(filename: str, title: str, content_text: str):
-    html = f"""<!DOCTYPE html>
-<html lang="de">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
-    <meta name="description" content="{title} - Professionelle AI-Lösungen">
-    <link rel="stylesheet" href="style.css">
-    <style>
-        body {{ font-family: Arial, sans-serif; margin:0; padding:0; }}
-        header {{ background:#1e1e1e; color:white; padding:20px; text-align:center; }}
-        nav a {{ color:white; margin:0 15px; text-decoration:none; }}
-        main {{ padding:40px 20px; }}
-        footer {{ background:#1e1e1e; color:white; text-align:center; padding:20px; }}
-    </style>
-</head>
-<body>
-    <header>
-        <h1>Lukas AI Solutions</h1>
-        <nav>
-            <a href="index.html">Home</a> |
-            <a href="services.html">Services</a> |
-            <a href="contact.html">Kontakt</a>
-        </nav>
-    </header>
-    <main>
-        <h2>{title}</h2>
-        <p>{content_text}</p>
-    </main>
-    <footer>
-        <p>&copy; 2026 Lukas – Alle Rechte vorbehalten</p>
-    </footer>
-</body>
-</html>"""
-    target_file = DIST_DIR / filename
-    ensure_dir(DIST_DIR)
-    with open(target_file, "w", encoding="utf-8") as f:
-        f.write(html)
-    log(f"Seite gebaut: {target_file}")
-
-# ----------------------------
-# BUILD ALL PAGES
-# ----------------------------
-def build_website():
-    ensure_dir(DIST_DIR)
-    copy_css(DIST_DIR)
-    copy_images(DIST_DIR)
-
-    for filename, page in PAGES.items():
-        build_page(filename, page["title"], page["content"])
-    
-    log(f"Website komplett gebaut inkl. CSS → {DIST_DIR}")
-
-# ----------------------------
-# RUN
-# ----------------------------
-if __name__ == "__main__":
-    build_website()
-# =====================================================
-# build_website.py – Professionelle Multi-Page Website
-# =====================================================
-
-import os
-import shutil
-from pathlib import Path
-
-# ----------------------------
-# CONFIG
-# ----------------------------
-BASE_DIR = Path(__file__).parent.resolve()
-DIST_DIR = BASE_DIR / "dist"
-CSS_FILE = BASE_DIR / "style.css"
-IMG_DIR = BASE_DIR / "images"
+IMG_DIR = BASE_DIR / "images"  # Die Fabrik sucht hier automatisch alle Bilder
+SITE_FILE = BASE_DIR / "content.json"
+CONTENT_DIR = BASE_DIR / "content"
+# Spätere Quellen überschreiben frühere Einträge mit gleicher Datei (feldweise, PAGES ist die Basis)
+CONTENT_FILES = [BASE_DIR / "pages.json", CONTENT_DIR / "pages.json"]
 
 PAGES = {
     "index.html": {
         "title": "Home",
         "heading": "Willkommen bei Lukas AI Solutions",
-        "content": "Wir bieten professionelle AI-Lösungen, Automatisierung und Web-Services für Ihr Business."
+        "content": "Automatisierte AI-Lösungen für moderne Unternehmen – Video, Website, Voice Agents."
     },
     "services.html": {
         "title": "Services",
         "heading": "Unsere Services",
-        "content": "<ul><li>AI-gestützte Videoerstellung</li><li>Website-Building & Automatisierung</li><li>Voice Agents & SaaS-Lösungen</li></ul>"
+        "content": [
+            {"title": "AI-Video-Erstellung", "desc": "Automatisch generierte Videos auf Knopfdruck."},
+            {"title": "Website & Automation", "desc": "Websites bauen & Prozesse automatisieren."},
+            {"title": "Voice Agents & SaaS", "desc": "Individuelle Sprachagenten für Kundenlösungen."}
+        ]
     },
     "contact.html": {
         "title": "Kontakt",
         "heading": "Kontakt",
-        "content": "Schreiben Sie uns: <a href='mailto:info@lukawebsite.de'>info@lukawebsite.de</a>"
+        "content": "Jetzt anfragen: <a href='mailto:info@lukawebsite.de'>info@lukawebsite.de</a>"
     }
 }
 
 # ----------------------------
 # UTILITY
 # ----------------------------
-def ensure_dir(path: Path):
-    path.mkdir(parents=True, exist_ok=True)
-
 def copy_css(target_dir: Path):
     if CSS_FILE.exists():
-        shutil.copy(CSS_FILE, target_dir / CSS_FILE.name)
+        sync_file(CSS_FILE, target_dir / CSS_FILE.name)
 
 def copy_images(target_dir: Path):
     if IMG_DIR.exists():
-        shutil.copytree(IMG_DIR, target_dir / "images", dirs_exist_ok=True)
+        stats = sync_tree(IMG_DIR, target_dir / "images")
+        log(f"Bilder synchronisiert → {target_dir / 'images'} ({stats})")
+
+def get_all_images(cache_dir=DIST_DIR):
+    """Alle Bilder im Images-Ordner (jpg, png, webp) – mit Maßen aus dem Bild-Index in cache_dir"""
+    return list(scan_images(IMG_DIR, cache_dir).values())
 
 def log(msg: str):
     print(f"✅ {msg}")
 
-# ----------------------------
-# PAGE GENERATOR
-# ----------------------------
-def build_page(filename: str, title: str, heading: str, content_html: str):
-    html = f"""<!DOCTYPE html>
-<html lang="de">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title} – Lukas AI Solutions</title>
-    <meta name="description" content="{heading} – Professionelle AI-Lösungen">
-    <link rel="stylesheet" href="style.css">
-    <style>
-        body {{ font-family: Arial, Helvetica, sans-serif; margin:0; padding:0; line-height:1.6; }}
-        header {{ background:#1e1e1e; color:white; padding:20px; text-align:center; position:sticky; top:0; z-index:100; }}
-        nav a {{ color:white; margin:0 15px; text-decoration:none; font-weight:bold; }}
-        nav a:hover {{ text-decoration:underline; }}
-        main {{ padding:40px 20px; max-width:1000px; margin:auto; }}
-        section {{ padding:60px 0; }}
-        h1, h2 {{ margin-bottom:20px; }}
-        footer {{ background:#1e1e1e; color:white; text-align:center; padding:20px; margin-top:40px; }}
-        a.button {{ display:inline-block; padding:10px 20px; background:#ff6600; color:white; text-decoration:none; border-radius:5px; }}
-        a.button:hover {{ background:#ff8533; }}
-    </style>
-    <script>
-        // Smooth Scrolling
-        document.addEventListener('DOMContentLoaded', function() {{
-            const links = document.querySelectorAll('nav a[href^="#"], nav a[href$=".html"]');
-            links.forEach(link => {{
-                link.addEventListener('click', function(e) {{
-                    if(this.hash) {{
-                        e.preventDefault();
-                        document.querySelector(this.hash).scrollIntoView({{ behavior: 'smooth' }});
-                    }}
-                }});
-            }});
-        }});
-    </script>
-</head>
-<body>
-    <header>
-        <h1>Lukas AI Solutions</h1>
-        <nav>
-            <a href="index.html">Home</a> |
-            <a href="services.html">Services</a> |
-            <a href="contact.html">Kontakt</a>
-        </nav>
-    </header>
-    <main>
-        <section>
-            <h2>{heading}</h2>
-            {content_html}
-        </section>
-    </main>
-    <footer>
-        <p>&copy; 2026 Lukas – Alle Rechte vorbehalten</p>
-    </footer>
-</body>
-</html>"""
-    target_file = DIST_DIR / filename
-    ensure_dir(DIST_DIR)
-    with open(target_file, "w", encoding="utf-8") as f:
-        f.write(html)
-    log(f"Seite gebaut: {target_file}")
+def warn(msg: str):
+    print(f"⚠️ {msg}")
 
 # ----------------------------
-# BUILD ALL PAGES
+# ASSET-FINGERPRINTS
 # ----------------------------
-def build_website():
-    ensure_dir(DIST_DIR)
-    copy_css(DIST_DIR)
-    copy_images(DIST_DIR)
-
-    # QA Checks
-    if not CSS_FILE.exists():
-        log("❌ WARNUNG: style.css fehlt!")
-    if not IMG_DIR.exists():
-        log("⚠️ WARNUNG: images Ordner fehlt!")
-
-    for filename, page in PAGES.items():
-        build_page(filename, page["title"], page["heading"], page["content"])
-    
-    log(f"Website komplett gebaut inkl. CSS und Bilder → {DIST_DIR}")
+ASSETS = None
 
-# ----------------------------
-# RUN
-# ----------------------------
-if __name__ == "__main__":
-    build_website()
-# =====================================================
-# build_website.py – Profi Multi-Page Website + SEO/Accessibility
-# =====================================================
+def fingerprint_site(base_path) -> AssetManifest:
+    """Hash-Namen für style.css + images/ – Seiten bekommen sie beim Rendern über asset_url()"""
+    global ASSETS
+    ASSETS = fingerprint_assets(base_path, CSS_FILE, IMG_DIR)
+    return ASSETS
 
-import os
-import shutil
-from pathlib import Path
+def asset_url(rel_path: str) -> str:
+    """Ohne Fingerprint-Stage (z.B. einzelne Builder) bleibt der feste Name"""
+    return ASSETS.url(rel_path) if ASSETS else rel_path
 
 # ----------------------------
-# CONFIG
+# INKREMENTELLER BUILD
 # ----------------------------
-BASE_DIR = Path(__file__).parent.resolve()
-DIST_DIR = BASE_DIR / "dist"
-CSS_FILE = BASE_DIR / "style.css"
-IMG_DIR = BASE_DIR / "images"
+# Ändert sich ein Template (oder die Engine), werden alle Seiten neu gebaut
+def page_version(minify=False):
+    """Template-Stand (+ Minifier, wenn aktiv) – minifizierte und rohe Seiten haben verschiedene Digests"""
+    version = templates_digest()
+    return hash_inputs(version, "minify", MINIFY_VERSION) if minify else version
 
-PAGES = {
-    "index.html": {
-        "title": "Home",
-        "heading": "Willkommen bei Lukas AI Solutions",
-        "content": "Wir bieten professionelle AI-Lösungen, Automatisierung und Web-Services für Ihr Business.",
-        "image": "home.jpg"
-    },
-    "services.html": {
-        "title": "Services",
-        "heading": "Unsere Services",
-        "content": "<ul><li>AI-gestützte Videoerstellung</li><li>Website-Building & Automatisierung</li><li>Voice Agents & SaaS-Lösungen</li></ul>",
-        "image": "services.jpg"
-    },
-    "contact.html": {
-        "title": "Kontakt",
-        "heading": "Kontakt",
-        "content": "Schreiben Sie uns: <a href='mailto:info@lukawebsite.de'>info@lukawebsite.de</a>",
-        "image": "contact.jpg"
-    }
-}
+TEMPLATE_VERSION = page_version()
 
-# ----------------------------
-# UTILITY
-# ----------------------------
-def ensure_dir(path: Path):
-    path.mkdir(parents=True, exist_ok=True)
+def is_stale(manifest, rel_path, inputs):
+    """Ohne Manifest ist jede Seite veraltet, sonst nur bei geändertem Eingabe-Hash"""
+    if manifest is None:
+        return True
+    return manifest.needs_build(rel_path, hash_inputs(TEMPLATE_VERSION, inputs))
 
-def copy_css(target_dir: Path):
-    if CSS_FILE.exists():
-        shutil.copy(CSS_FILE, target_dir / CSS_FILE.name)
-
-def copy_images(target_dir: Path):
-    if IMG_DIR.exists():
-        shutil.copytree(IMG_DIR, target_dir / "images", dirs_exist_ok=True)
+WRITE_BUFFER = 1 << 16
 
-def log(msg: str):
-    print(f"✅ {msg}")
+def render_to_file(base_path, rel_path, render, args):
+    """render darf einen String oder einen Generator von Chunks liefern – Chunks gehen direkt in die Datei.
+    Liefert (rel_path, Renderzeit, Schreibzeit, Bytes) für den Build-Trace."""
+    clock = time.perf_counter
+    started = clock()
+    target = Path(base_path) / rel_path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    result = render(*args)
+    chunks = (result,) if isinstance(result, str) else result
+    write_time = 0.0
+    f = open(target, "w", encoding="utf-8", buffering=WRITE_BUFFER)
+    try:
+        for chunk in chunks:
+            t = clock()
+            f.write(chunk)
+            write_time += clock() - t
+    finally:
+        t = clock()
+        size = f.tell()
+        f.close()
+        write_time += clock() - t
+    return rel_path, clock() - started - write_time, write_time, size
+
+def render_to_bytes(rel_path, render, args):
+    """Für den Archiv-Modus: Seite im Worker rendern, geschrieben wird im Hauptprozess"""
+    started = time.perf_counter()
+    result = render(*args)
+    html = result if isinstance(result, str) else "".join(result)
+    return rel_path, time.perf_counter() - started, html.encode("utf-8")
+
+def render_to_archive(archive, rel_path, render, args):
+    started = time.perf_counter()
+    result = render(*args)
+    size = archive.write_chunks(rel_path, (result,) if isinstance(result, str) else result)
+    return rel_path, time.perf_counter() - started, 0.0, size
+
+def write_page(base_path, rel_path, render, args, inputs, manifest=None):
+    """Seite nur rendern + schreiben, wenn sich ihre Eingaben seit dem letzten Build geändert haben"""
+    if not is_stale(manifest, rel_path, inputs):
+        return False
+    if isinstance(base_path, ArchiveWriter):
+        TRACER.page(*render_to_archive(base_path, rel_path, render, args))
+    else:
+        TRACER.page(*render_to_file(base_path, rel_path, render, args))
+    return True
 
 # ----------------------------
-# PAGE GENERATOR
+# PARALLELER BUILD
 # ----------------------------
-def build_page(filename: str, page: dict):
-    img_tag = f"<img src='images/{page['image']}' alt='{page['heading']}' style='max-width:100%; height:auto;' />" if 'image' in page else ""
-    
-    html = f"""<!DOCTYPE html>
-<html lang="de">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{page['title']} – Lukas AI Solutions</title>
-    <meta name="description" content="{page['heading']} – Professionelle AI-Lösungen">
-    <link rel="stylesheet" href="style.css">
-    
-    <!-- Open Graph / Social -->
-    <meta property="og:title" content="{page['title']} – Lukas AI Solutions">
-    <meta property="og:description" content="{page['heading']} – Professionelle AI-Lösungen">
-    <meta property="og:type" content="website">
-    <meta property="og:image" content="images/{page.get('image','') }">
-    
-    <!-- Twitter Card -->
-    <meta name="twitter:card" content="summary_large_image">
-    <meta name="twitter:title" content="{page['title']} – Lukas AI Solutions">
-    <meta name="twitter:description" content="{page['heading']} – Professionelle AI-Lösungen">
-    <meta name="twitter:image" content="images/{page.get('image','')}">
-
-    <style>
-        body {{ font-family: Arial, Helvetica, sans-serif; margin:0; padding:0; line-height:1.6; }}
-        header {{ background:#1e1e1e; color:white; padding:20px; text-align:center; position:sticky; top:0; z-index:100; }}
-        nav a {{ color:white; margin:0 15px; text-decoration:none; font-weight:bold; }}
-        nav a:hover {{ text-decoration:underline; }}
-        main {{ padding:40px 20px; max-width:1000px; margin:auto; }}
-        section {{ padding:60px 0; }}
-        h1, h2 {{ margin-bottom:20px; }}
-        footer {{ background:#1e1e1e; color:white; text-align:center; padding:20px; margin-top:40px; }}
-        a.button {{ display:inline-block; padding:10px 20px; background:#ff6600; color:white; text-decoration:none; border-radius:5px; }}
-        a.button:hover {{ background:#ff8533; }}
-    </style>
-</head>
-<body>
-    <header>
-        <h1>Lukas AI Solutions</h1>
-        <nav>
-            <a href="index.html">Home</a> |
-            <a href="services.html">Services</a> |
-            <a href="contact.html">Kontakt</a>
-        </nav>
-    </header>
-    <main>
-        <section>
-            <h2>{page['heading']}</h2>
-            {img_tag}
-            <p>{page['content']}</p>
-        </section>
-    </main>
-    <footer>
-        <p>&copy; 2026 Lukas – Alle Rechte vorbehalten</p>
-    </footer>
-</body>
-</html>"""
-    
-    target_file = DIST_DIR / filename
-    ensure_dir(DIST_DIR)
-    with open(target_file, "w", encoding="utf-8") as f:
-        f.write(html)
-    log(f"Seite gebaut: {target_file}")
+def _init_worker():
+    # Geforkte Worker erben die Zähler des Hauptprozesses – nicht doppelt melden
+    FRAGMENTS.drain()
 
-# ----------------------------
-# SITEMAP GENERATOR
-# ----------------------------
-def build_sitemap():
-    urls = [f"<url><loc>http://example.com/{filename}</loc></url>" for filename in PAGES.keys()]
-    sitemap_content = f"<?xml version='1.0' encoding='UTF-8'?><urlset xmlns='http://www.sitemaps.org/schemas/sitemap/0.9'>{''.join(urls)}</urlset>"
-    sitemap_file = DIST_DIR / "sitemap.xml"
-    with open(sitemap_file, "w", encoding="utf-8") as f:
-        f.write(sitemap_content)
-    log(f"Sitemap erstellt → {sitemap_file}")
+def _render_job(job):
+    # Worker liefern ihre Messwerte als Rückgabewert, gezählt wird im Hauptprozess.
+    # Der Fragment-Cache lebt pro Worker – seine Zähler gehen mit dem Ergebnis mit.
+    return render_to_file(*job), FRAGMENTS.drain()
 
-# ----------------------------
-# BUILD WEBSITE
-# ----------------------------
-def build_website():
-    ensure_dir(DIST_DIR)
-    copy_css(DIST_DIR)
-    copy_images(DIST_DIR)
-    
-    if not CSS_FILE.exists():
-        log("❌ WARNUNG: style.css fehlt!")
-    if not IMG_DIR.exists():
-        log("⚠️ WARNUNG: images Ordner fehlt!")
-
-    for filename, page in PAGES.items():
-        build_page(filename, page)
-    
-    build_sitemap()
-    log(f"Website komplett gebaut inkl. SEO, Bilder und Sitemap → {DIST_DIR}")
+def _render_bytes_job(job):
+    return render_to_bytes(*job), FRAGMENTS.drain()
 
-# ----------------------------
-# RUN
-# ----------------------------
-if __name__ == "__main__":
-    build_website()
-# =====================================================
-# build_website.py – Profi Multi-Page Website + Automatische Bilder
-# =====================================================
+def _archive_result(archive, result):
+    rel_path, render_time, data = result
+    started = time.perf_counter()
+    archive.write_bytes(rel_path, data)
+    return rel_path, render_time, time.perf_counter() - started, len(data)
 
-import os
-import shutil
-from pathlib import Path
-import random
+PROGRESS_STEP = 1000
+RENDER_BATCH = 4096
 
-# ----------------------------
-# CONFIG
-# ----------------------------
-BASE_DIR = Path(__file__).parent.resolve()
-DIST_DIR = BASE_DIR / "dist"
-CSS_FILE = BASE_DIR / "style.css"
-IMAGES_DIR = BASE_DIR / "images"  # Die Fabrik sucht hier automatisch alle Bilder
+def log_progress(done, label, final=False):
+    if final or done % PROGRESS_STEP == 0:
+        log(f"{label}: {done} Seiten")
 
-PAGES = {
-    "index.html": {
-        "title": "Home",
-        "heading": "Willkommen bei Lukas AI Solutions",
-        "content": "Automatisierte AI-Lösungen für moderne Unternehmen – Video, Website, Voice Agents."
-    },
-    "services.html": {
-        "title": "Services",
-        "heading": "Unsere Services",
-        "content": [
-            {"title": "AI-Video-Erstellung", "desc": "Automatisch generierte Videos auf Knopfdruck."},
-            {"title": "Website & Automation", "desc": "Websites bauen & Prozesse automatisieren."},
-            {"title": "Voice Agents & SaaS", "desc": "Individuelle Sprachagenten für Kundenlösungen."}
-        ]
-    },
-    "contact.html": {
-        "title": "Kontakt",
-        "heading": "Kontakt",
-        "content": "Jetzt anfragen: <a href='mailto:info@lukawebsite.de'>info@lukawebsite.de</a>"
-    }
-}
+def render_pages(base_path, specs, manifest=None, jobs=1, label="Seiten"):
+    """specs: (rel_path, render, args, inputs) – render(*args) muss auf Modulebene liegen (pickle).
+    specs wird lazy in Batches abgearbeitet, auch Millionen Seiten liegen nie komplett im Speicher."""
+    todo = (
+        (base_path, rel_path, render, args)
+        for rel_path, render, args, inputs in specs
+        if is_stale(manifest, rel_path, inputs)
+    )
+    # Archiv-Modus: Worker rendern nur, ins (nicht picklebare) Archiv schreibt der Hauptprozess.
+    # Ohne Worker wird direkt ins Archiv gestreamt, statt jede Seite erst als Bytes zu sammeln.
+    archive = base_path if isinstance(base_path, ArchiveWriter) else None
+    if archive and worker_count(jobs) == 1:
+        # Ohne Worker zählt FRAGMENTS direkt im Hauptprozess mit
+        results = ((render_to_archive(archive, *job[1:]), (0, 0, 0)) for job in todo)
+    elif archive:
+        results = ((_archive_result(archive, result), fragment_stats) for result, fragment_stats in
+                   parallel_map(_render_bytes_job, (job[1:] for job in todo), jobs,
+                                initializer=_init_worker, batch=RENDER_BATCH))
+    else:
+        results = parallel_map(_render_job, todo, jobs, initializer=_init_worker, batch=RENDER_BATCH)
+    done = 0
+    for result, fragment_stats in results:
+        FRAGMENTS.merge(fragment_stats)
+        TRACER.page(*result)
+        done += 1
+        log_progress(done, label)
+    log_progress(done, label, final=True)
+    return done
 
 # ----------------------------
-# UTILITY
+# SEITENMODELL (PAGES, pages.json, content/pages.json, content.json, ...)
 # ----------------------------
-def ensure_dir(path: Path):
-    path.mkdir(parents=True, exist_ok=True)
+def subpage_sources():
+    return [(name, pages, BASE_DIR / name / "content" / "pages.json") for name, pages in SUBPAGES.items()]
 
-def get_all_images():
-    """Alle Bilder im Images-Ordner finden (jpg, png, webp)"""
-    ensure_dir(IMAGES_DIR)
-    return [f for f in IMAGES_DIR.iterdir() if f.suffix.lower() in ['.jpg', '.jpeg', '.png', '.webp']]
+def site_content():
+    """Gemeinsames Seitenmodell für alle Renderer und die QA – wird nur bei Änderungen neu geparst"""
+    return load_content(SITE_FILE, CONTENT_FILES, PAGES, LANDINGPAGES, PRICING_PLANS, subpage_sources())
 
-def log(msg: str):
-    print(f"✅ {msg}")
+def page_context(page, description: str) -> dict:
+    """Template-Variablen von content_page.html aus einer ContentPage"""
+    return {"title": page.title, "description": description, "heading": page.headline, "body": page.body}
 
 # ----------------------------
 # PAGE GENERATOR
 # ----------------------------
-def build_page(filename: str, page: dict, images: list):
-    # Bild automatisch wählen
-    img_file = random.choice(images) if images else None
-    img_tag = f"<img src='images/{img_file.name}' alt='{page['heading']}' style='max-width:100%; height:auto;' />" if img_file else ""
-
-    if filename == "services.html":
-        # Services als Card-Layout
-        cards_html = ""
-        for service in page['content']:
-            service_img = random.choice(images) if images else None
-            service_img_tag = f"<img src='images/{service_img.name}' alt='{service['title']}' style='max-width:100%; height:auto;' />" if service_img else ""
-            cards_html += f"""
-            <div class='card'>
-                {service_img_tag}
-                <h3>{service['title']}</h3>
-                <p>{service['desc']}</p>
-            </div>"""
-        content_html = f"<div class='cards'>{cards_html}</div>"
-    else:
-        content_html = f"{img_tag}<p>{page['content']}</p>"
-
-    html = f"""<!DOCTYPE html>
-<html lang="de">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{page['title']} – Lukas AI Solutions</title>
-    <meta name="description" content="{page['heading']} – Professionelle AI-Lösungen">
-    <link rel="stylesheet" href="style.css">
-
-    <!-- Open Graph / Social -->
-    <meta property="og:title" content="{page['title']} – Lukas AI Solutions">
-    <meta property="og:description" content="{page['heading']} – Professionelle AI-Lösungen">
-    <meta property="og:type" content="website">
-    <meta property="og:image" content="images/{img_file.name if img_file else ''}">
-    
-    <!-- Twitter Card -->
-    <meta name="twitter:card" content="summary_large_image">
-    <meta name="twitter:title" content="{page['title']} – Lukas AI Solutions">
-    <meta name="twitter:description" content="{page['heading']} – Professionelle AI-Lösungen">
-    <meta name="twitter:image" content="images/{img_file.name if img_file else ''}">
-
-    <style>
-        body {{ font-family: Arial, Helvetica, sans-serif; margin:0; padding:0; line-height:1.6; }}
-        header {{ background:#1e1e1e; color:white; padding:20px; text-align:center; position:sticky; top:0; z-index:100; }}
-        nav a {{ color:white; margin:0 15px; text-decoration:none; font-weight:bold; }}
-        nav a:hover {{ text-decoration:underline; }}
-        main {{ padding:40px 20px; max-width:1000px; margin:auto; }}
-        section {{ padding:60px 0; }}
-        h1, h2 {{ margin-bottom:20px; }}
-        footer {{ background:#1e1e1e; color:white; text-align:center; padding:20px; margin-top:40px; }}
-        a.button {{ display:inline-block; padding:10px 20px; background:#ff6600; color:white; text-decoration:none; border-radius:5px; }}
-        a.button:hover {{ background:#ff8533; }}
-        /* Services Cards */
-        .cards {{ display:flex; flex-wrap:wrap; gap:20px; justify-content:center; }}
-        .card {{ flex:1 1 300px; padding:20px; border:1px solid #ddd; border-radius:8px; box-shadow:0 2px 6px rgba(0,0,0,0.1); text-align:center; }}
-        .card img {{ max-width:100%; height:auto; border-radius:5px; }}
-        .card h3 {{ margin-top:15px; }}
-        .card p {{ margin-top:10px; }}
-    </style>
-</head>
-<body>
-    <header>
-        <h1>Lukas AI Solutions</h1>
-        <nav>
-            <a href="index.html">Home</a> |
-            <a href="services.html">Services</a> |
-            <a href="contact.html">Kontakt</a>
-        </nav>
-    </header>
-    <main>
-        <section>
-            <h2>{page['heading']}</h2>
-            {content_html}
-        </section>
-    </main>
-    <footer>
-        <p>&copy; 2026 Lukas – Alle Rechte vorbehalten</p>
-    </footer>
-</body>
-</html>"""
-
-    target_file = DIST_DIR / filename
-    ensure_dir(DIST_DIR)
-    with open(target_file, "w", encoding="utf-8") as f:
-        f.write(html)
-    log(f"Seite gebaut: {target_file}")
+def image_context(image):
+    if image is None:
+        return None
+    return {"src": asset_url(f"images/{image.name}"), "width": image.width, "height": image.height}
+
+def page_images(page, images: list):
+    """Bild fest über den Dateinamen wählen → gleiche Seite, gleiches Bild in jedem Build"""
+    image = image_context(pick_image(images, page.filename))
+    cards = [
+        {"title": card.title, "desc": card.desc,
+         "image": image_context(pick_image(images, f"{page.filename}#{card.title}"))}
+        for card in page.cards
+    ]
+    return image, cards
+
+def iter_page(page, description: str, image, cards: list, styles=None):
+    """Streaming-Renderer: content_page.html liefert Kopf, Inhalt und jede Card einzeln"""
+    return stream_template(
+        "content_page.html",
+        image=image,
+        cards=cards,
+        **(styles or {"css_href": "style.css"}),
+        **page_context(page, description)
+    )
+
+def build_page(page, description: str, images: list, base_path=DIST_DIR, manifest=None):
+    # Nur die gewählten Bilder (samt Maßen und Hash-URL) zählen – ein neues Bild baut nur die
+    # Seiten neu, die es bekommen; ein neues Stylesheet alle Seiten, die es einbinden
+    image, cards = page_images(page, images)
+    styles = page_styles(page.rel_path)
+    inputs = {"page": page.digest, "description": description, "image": image, "cards": cards, "styles": styles}
+    args = (page, description, image, cards, styles)
+    if write_page(base_path, page.rel_path, iter_page, args, inputs, manifest):
+        log(f"Seite gebaut: {page.rel_path}")
 
 # ----------------------------
 # SITEMAP GENERATOR
 # ----------------------------
-def build_sitemap():
-    urls = [f"<url><loc>http://example.com/{filename}</loc></url>" for filename in PAGES.keys()]
-    sitemap_content = f"<?xml version='1.0' encoding='UTF-8'?><urlset xmlns='http://www.sitemaps.org/schemas/sitemap/0.9'>{''.join(urls)}</urlset>"
-    sitemap_file = DIST_DIR / "sitemap.xml"
-    with open(sitemap_file, "w", encoding="utf-8") as f:
-        f.write(sitemap_content)
-    log(f"Sitemap erstellt → {sitemap_file}")
+def build_sitemap(base_path=DIST_DIR, manifest=None):
+    """Alle Outputs des Builds (lastmod aus dem Manifest) → gzip-Shards + sitemap_index.xml"""
+    if isinstance(base_path, ArchiveWriter):
+        # Im Archiv gibt es kein Manifest: alle geschriebenen Seiten, lastmod = Build-Zeit
+        lastmod = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(base_path.mtime))
+        entries = [(rel_path, lastmod) for rel_path in sorted(base_path.written)]
+        result = write_sitemaps(None, entries, open_file=base_path.open)
+        log(f"Sitemap erstellt → {result['index']} im Archiv ({result['urls']} URLs, {result['shards']} Shard(s))")
+        return
+    base_path = Path(base_path)
+    manifest = manifest or BuildManifest(base_path)
+    entries = manifest.entries() if (manifest.current or manifest.previous) else scan_entries(base_path)
+    result = write_sitemaps(base_path, entries)
+    legacy = base_path / "sitemap.xml"
+    if legacy.exists():
+        legacy.unlink()  # alte Einzel-Sitemap mit Platzhalter-Domain
+    log(f"Sitemap erstellt → {base_path / result['index']} ({result['urls']} URLs, {result['shards']} Shard(s))")
+
+# ----------------------------
+# VERWANDTE SEITEN (interne Links)
+# ----------------------------
+def landing_texts(page):
+    return (
+        page.title, page.hero.headline, page.hero.subline,
+        page.solution.headline, page.solution.text, page.trust,
+        " ".join(page.problems), " ".join(page.benefits), " ".join(page.process)
+    )
+
+def related_docs():
+    """(slug, Titel, Digest, Texte) für alle Landing- und SEO-Seiten"""
+    content = site_content()
+    for page in content.landingpages.values():
+        yield page.slug, page.title, page.digest, landing_texts(page)
+    # Basistext ist für alle SEO-Seiten dasselbe Tupel → wird nur einmal tokenisiert
+    base_texts = landing_texts(content.landingpages["ai-automation"])
+    for slug, phrase, seo, inputs in seo_pages():
+        title, description = seo_title(seo["base_title"], phrase, seo["description_template"])
+        yield slug, title, hash_inputs(inputs), (title, description) + base_texts
+
+def build_related_index(base_path):
+    if not RELATED_NUMPY:
+        warn("NumPy fehlt – keine verwandten Seiten (pip install -r requirements.txt)")
+        return {}
+    cache_dir = None if isinstance(base_path, ArchiveWriter) else base_path
+    related = build_related(related_docs(), cache_dir)
+    log(f"Verwandte Seiten: {len(related)} Seiten verlinkt")
+    return related
+
+# ----------------------------
+# GEMEINSAMES STYLESHEET
+# ----------------------------
+SHARED_CSS = "site.css"
+INLINE_CRITICAL_CSS = False
+STYLES = {}
+SHARED_STYLESHEET = None  # Inhalt von site.css aus dem letzten Durchlauf – die Unterseiten binden es auch ein
+
+def page_styles(rel_path: str = "index.html") -> dict:
+    """Template-Kontext fürs CSS – ohne CSS-Stage wie bisher style.css + <style> im head.
+    Der Link ist relativ zur Seite, damit er auch unter dem Deploy-Unterpfad stimmt."""
+    styles = dict(STYLES or {"css_href": asset_url(CSS_FILE.name)})
+    styles["css_href"] = "../" * rel_path.count("/") + styles["css_href"]
+    return styles
+
+def styled_pages(related=None, images=()):
+    """HTML aller Seiten, die das Stylesheet einbinden – für den Purge.
+    SEO-Seiten unterscheiden sich nur in Titel und Hero-Text → je eine mit und ohne verwandte Links."""
+    related = related or {}
+    content = site_content()
+    for page in content.pages.values():
+        image, cards = page_images(page, images)
+        yield "".join(iter_page(page, content.description_for(page), image, cards))
+    for page in content.landingpages.values():
+        yield "".join(iter_landingpage(page.slug, page, related.get(page.slug, ())))
+    shapes = set()
+    for slug, phrase, seo, _ in seo_pages():
+        links = related.get(slug, ())
+        if bool(links) not in shapes:
+            shapes.add(bool(links))
+            yield "".join(render_seo_page(slug, seo["base_title"], phrase, seo["description_template"], links))
+    yield render_pricing_page()
+    for headline in SAAS_PLACEHOLDERS.values():
+        yield render_saas_placeholder(headline)
+    yield render_thankyou_page()
+    yield "".join(render_search_page({}))
+    for pages in content.subpages.values():
+        for sub in pages:
+            yield render_subpage(sub.page) if sub.page else get_template(sub.filename.split(".")[0])
+
+def place_shared_css(base_path, assets) -> str:
+    """site.css nach base_path schreiben (nur wenn sie sich geändert hat) → Pfad mit Hash"""
+    target = Path(base_path) / SHARED_CSS
+    data = SHARED_STYLESHEET.encode("utf-8")
+    if not target.exists() or target.read_bytes() != data:
+        write_atomic(target, data)
+    href = assets.add(target, SHARED_CSS)
+    assets.place()
+    return href
+
+def build_shared_css(base_path, related=None):
+    """style.css + alle <style>-Blöcke der Templates → ein Stylesheet, gepurgt gegen alle Seiten, die es einbinden"""
+    global STYLES, SHARED_STYLESHEET
+    sources = [CSS_FILE.read_text(encoding="utf-8")] if CSS_FILE.exists() else []
+    sources += extract_styles(TEMPLATE_DIR.rglob("*.html"))
+    # Gerendert wird ohne Stylesheet-Kontext – die <style>-Blöcke im head ignoriert scan_usage
+    images = get_all_images(None if isinstance(base_path, ArchiveWriter) else base_path)
+    used = scan_usage(styled_pages(related, images))
+    SHARED_STYLESHEET, critical = build_stylesheet(sources, used, INLINE_CRITICAL_CSS)
+
+    if isinstance(base_path, ArchiveWriter):
+        data = SHARED_STYLESHEET.encode("utf-8")
+        href = fingerprinted_name(SHARED_CSS, hashlib.sha256(data).hexdigest())
+        base_path.write_bytes(SHARED_CSS, data)
+        base_path.write_bytes(href, data)
+    else:
+        # Ohne build_website() davor (Tests, Benchmark) gehört ASSETS evtl. zu einem anderen Ziel
+        same_target = ASSETS is not None and ASSETS.base_path == Path(base_path)
+        href = place_shared_css(base_path, ASSETS if same_target else fingerprint_site(base_path))
+    STYLES = {"css_href": href, "css_extracted": True, "critical_css": critical}
+    log(f"Stylesheet: {sum(map(len, sources))} → {len(SHARED_STYLESHEET.encode('utf-8'))} Bytes ({href}"
+        f"{f', {len(critical)} Bytes Critical CSS' if critical else ''})")
 
 # ----------------------------
-# BUILD WEBSITE
+# SUCHE
 # ----------------------------
-def build_website():
-    ensure_dir(DIST_DIR)
-    copy_css(DIST_DIR)
-    copy_images(DIST_DIR)
+SEARCH_PAGE = "suche.html"
+SEARCH_JS = BASE_DIR / "assets" / "js" / "search.js"
 
-    images = get_all_images()
-    if not images:
-        log("⚠️ WARNUNG: Keine Bilder gefunden, Seiten werden ohne Bilder gebaut!")
+def render_search_page(styles):
+    return stream_template("search.html", search_js=f"{INDEX_DIR}/search.js", **styles)
 
-    for filename, page in PAGES.items():
-        build_page(filename, page, images)
-    
-    build_sitemap()
-    log(f"Website komplett gebaut inkl. Bilder, Cards, SEO und Sitemap → {DIST_DIR}")
+def build_search_page(base_path, manifest=None):
+    styles = page_styles(SEARCH_PAGE)
+    write_page(base_path, SEARCH_PAGE, render_search_page, (styles,), {"styles": styles}, manifest)
+
+def build_search(base_path, manifest):
+    """Suchindex über alle HTML-Outputs des Builds – gelesen werden nur neu gebaute Seiten"""
+    sync_file(SEARCH_JS, Path(base_path) / INDEX_DIR / SEARCH_JS.name)
+    stats = build_search_index(base_path, manifest.current, exclude={SEARCH_PAGE})
+    log(f"Suchindex: {stats['docs']} Seiten ({stats['parsed']} neu gelesen), {stats['terms']} Terme "
+        f"in {stats['shards']} Shards, {stats['written']} Dateien geschrieben, {stats['removed']} entfernt")
 
 # ----------------------------
-# RUN
+# BUILD WEBSITE
 # ----------------------------
-if __name__ == "__main__":
-    build_website()
+def build_content_pages(base_path=DIST_DIR, manifest=None):
+    # Im Archiv gibt es keinen Platz für den Bild-Index → jedes Mal die Dateiköpfe lesen
+    images = get_all_images(None if isinstance(base_path, ArchiveWriter) else base_path)
+    if not images:
+        warn("Keine Bilder gefunden, Seiten werden ohne Bilder gebaut!")
+
+    content = site_content()
+    for page in content.pages.values():
+        build_page(page, content.description_for(page), images, base_path, manifest)
+
+def build_all_pages(base_path=DIST_DIR, manifest=None, jobs=1):
+    """Alle Seiten-Stages von dist – mit Manifest wird nur gerendert, was sich geändert hat"""
+    with TRACER.stage("related"):
+        related = build_related_index(base_path)
+    with TRACER.stage("css"):
+        build_shared_css(base_path, related)
+    with TRACER.stage("page render"):
+        build_content_pages(base_path, manifest)
+        build_landingpages(base_path, manifest, jobs, related)
+    with TRACER.stage("seo pages"):
+        build_seo_pages(base_path, manifest, jobs, related)
+    with TRACER.stage("pricing"):
+        build_pricing_page(base_path, manifest)
+        build_saas_placeholders(base_path, manifest)
+        build_thankyou_page(base_path, manifest)
+        build_search_page(base_path, manifest)
+
+def build_website(base_path=DIST_DIR, manifest=None, jobs=1):
+    """Assets + alle Seiten; die alten Hash-Namen räumt der Aufrufer nach manifest.save() weg"""
+    with TRACER.stage("asset copy"):
+        copy_css(base_path)
+        copy_images(base_path)
+        assets = fingerprint_site(base_path)
+        assets.place()
+    build_all_pages(base_path, manifest, jobs)
+    return assets
+
+# ----------------------------
+# SUBPAGES (eigene Sites unter <name>/dist)
+# ----------------------------
+def get_template(page_name: str, styles=None) -> str:
+    title = page_name.replace("-", " ").title()
+    return render_template(
+        "service_page.html",
+        title=title,
+        description=f"Professionelle AI Services – {title}",
+        **(styles or {"css_href": "style.css"})
+    )
+
+def render_subpage(page, styles=None) -> str:
+    return render_template("content_page.html", image=None, cards=(), **(styles or {"css_href": "style.css"}),
+                           **page_context(page, page.description))
+
+def build_subpages():
+    for subpage, pages in site_content().subpages.items():
+        sub_dir = BASE_DIR / subpage / "dist"
+        # Jede Unterseite hat ihr eigenes Manifest im eigenen dist-Verzeichnis
+        manifest = BuildManifest(sub_dir)
+        copy_css(sub_dir)
+        copy_images(sub_dir)
+        # Die Unterseiten binden nur das Stylesheet ein, Bilder referenzieren sie nicht
+        assets = fingerprint_assets(sub_dir, CSS_FILE)
+        assets.place()
+        if SHARED_STYLESHEET is None:
+            styles = {"css_href": assets.url(CSS_FILE.name)}
+        else:
+            # Dieselbe site.css wie in dist – der Purge hat die Unterseiten schon mitgescannt
+            styles = dict(STYLES, css_href=place_shared_css(sub_dir, assets))
+
+        for sub in pages:
+            if sub.page:
+                inputs = {"page": sub.digest, "styles": styles}
+                write_page(sub_dir, sub.rel_path, render_subpage, (sub.page, styles), inputs, manifest)
+                continue
+            # Ohne Eintrag in <name>/content/pages.json → Standard-Template
+            page_name = sub.filename.split(".")[0]
+            inputs = {"page": page_name, "styles": styles}
+            write_page(sub_dir, sub.rel_path, get_template, (page_name, styles), inputs, manifest)
+
+        manifest.prune()
+        manifest.save()
+        assets.finish()
+        log(f"Website '{BASE_DIR / subpage}' fertig: {manifest.built} gebaut, {manifest.skipped} unverändert → {sub_dir}")
+
+# ----------------------------
+# LANDINGPAGES
+# ----------------------------
+LANDINGPAGES = {
+    "ai-automation": {
+        "title": "KI Automatisierung für Unternehmen",
+        "hero": {
+            "headline": "KI Automatisierung, die sich rechnet",
+            "subline": "Wiederkehrende Aufgaben an KI-Agenten abgeben – messbar, sicher und in Wochen statt Monaten.",
+            "cta": "Kostenlose Analyse anfragen"
+        },
+        "problems": [
+            "Manuelle Dateneingabe bindet Ihr Team",
+            "Anfragen bleiben liegen, weil niemand Zeit hat",
+            "Prozesse hängen an einzelnen Personen",
+            "Tools arbeiten nebeneinander statt miteinander"
+        ],
+        "solution": {
+            "headline": "Unsere Lösung",
+            "text": "Wir analysieren Ihre Abläufe, bauen passende KI-Agenten und verbinden sie mit Ihren bestehenden Systemen."
+        },
+        "benefits": [
+            "Weniger Routinearbeit",
+            "Schnellere Reaktionszeiten",
+            "Skalierbare Prozesse ohne zusätzliches Personal",
+            "Transparentes Monitoring"
+        ],
+        "process": [
+            "Prozessanalyse",
+            "Prototyp in zwei Wochen",
+            "Integration in Ihre Systeme",
+            "Betrieb und Optimierung"
+        ],
+        "trust": "Über 100 automatisierte Prozesse im Einsatz.",
+        "cta_final": "Jetzt Strategie-Call buchen"
+    }
+}
+def iter_landingpage(slug, data, related=(), styles=None):
+    """Streaming-Renderer: liefert die Seite stückweise, Listen werden nie komplett zusammengebaut"""
+    if isinstance(data, dict):
+        data = LandingPage.from_dict(slug, data)
+    return stream_template("landingpage.html", slug=slug, data=data, related=related, **(styles or {}))
 def render_landingpage(slug, data):
-    return f"""
-<!DOCTYPE html>
-<html lang="de">
-<head>
-    <title>{data['title']}</title>
-    <meta name="description" content="{data['hero']['headline']}">
-</head>
-<body>
-
-<section class="hero">
-    <h1>{data['hero']['headline']}</h1>
-    <p>{data['hero']['subline']}</p>
-    <a class="cta">{data['hero']['cta']}</a>
-</section>
-
-<section class="problems">
-    <ul>
-        {''.join(f"<li>{p}</li>" for p in data['problems'])}
-    </ul>
-</section>
-
-<section class="solution">
-    <h2>{data['solution']['headline']}</h2>
-    <p>{data['solution']['text']}</p>
-</section>
-
-<section class="benefits">
-    <ul>
-        {''.join(f"<li>{b}</li>" for b in data['benefits'])}
-    </ul>
-</section>
-
-<section class="process">
-    <ol>
-        {''.join(f"<li>{step}</li>" for step in data['process'])}
-    </ol>
-</section>
-
-<section class="trust">
-    <p>{data['trust']}</p>
-</section>
-
-<section class="cta-final">
-    <a class="cta">{data['cta_final']}</a>
-</section>
-
-</body>
-</html>
-"""
-def build_landingpages(base_path):
-    for slug, data in LANDINGPAGES.items():
-        html = render_landingpage(slug, data)
-        path = base_path / slug
-        path.mkdir(parents=True, exist_ok=True)
-        (path / "index.html").write_text(html, encoding="utf-8")
+    return "".join(iter_landingpage(slug, data))
+def landingpage_specs(related=None):
+    related = related or {}
+    for page in site_content().landingpages.values():
+        links = related.get(page.slug, ())
+        styles = page_styles(page.rel_path)
+        inputs = {"page": page.digest, "related": links, "styles": styles}
+        yield page.rel_path, iter_landingpage, (page.slug, page, links, styles), inputs
+def build_landingpages(base_path, manifest=None, jobs=1, related=None):
+    render_pages(base_path, landingpage_specs(related), manifest, jobs, label="Landingpages")
 SEO_KEYWORDS = {
     "ki-automatisierung": {
         "base_title": "KI Automatisierung",
@@ -987,46 +581,55 @@ SEO_KEYWORDS = {
         "description_template": "Professionelle {kw} – Prozesse automatisieren, Kosten senken, skalieren."
     }
 }
-def render_seo_landingpage(base_slug, base_data, keyword, description_tpl):
-    title = f"{base_data['base_title']} {keyword}"
-    description = description_tpl.format(kw=title)
-
-    data = LANDINGPAGES["ai-automation"].copy()
-
-    data["title"] = title
-    data["hero"] = {
-        "headline": title,
-        "subline": description,
-        "cta": "Kostenlose Analyse anfragen"
-    }
+def seo_title(base_title, keyword, description_tpl):
+    title = f"{base_title} {keyword}"
+    return title, description_tpl.format(kw=title)
+def seo_landingpage_data(base_data, keyword, description_tpl):
+    title, description = seo_title(base_data['base_title'], keyword, description_tpl)
+
+    # Nur Titel + Hero sind neu, alle Listen werden mit "ai-automation" geteilt
+    data = site_content().landingpages["ai-automation"].replace(
+        title=title,
+        hero=Hero(title, description, "Kostenlose Analyse anfragen")
+    )
 
+    return data, title, description
+def render_seo_landingpage(base_slug, base_data, keyword, description_tpl):
+    data, title, description = seo_landingpage_data(base_data, keyword, description_tpl)
     return render_landingpage(f"{base_slug}-{keyword}", data), title, description
-def build_seo_pages(base_path):
-    for base_slug, seo in SEO_KEYWORDS.items():
-        for intent in seo["intents"]:
-            slug = f"{base_slug}-{intent.lower().replace(' ', '-')}"
-            html, title, description = render_seo_landingpage(
-                base_slug,
-                seo,
-                intent,
-                seo["description_template"]
-            )
-
-            path = base_path / slug
-            path.mkdir(parents=True, exist_ok=True)
-            (path / "index.html").write_text(html, encoding="utf-8")
-<section class="internal-links">
-    <h3>Weitere Lösungen</h3>
-    <ul>
-        <li><a href="/ki-automatisierung-fuer-unternehmen/">KI Automatisierung für Unternehmen</a></li>
-        <li><a href="/ki-automatisierung-prozesse-automatisieren/">Prozesse automatisieren</a></li>
-    </ul>
-</section>
-if __name__ == "__main__":
-    BASE_PATH = Path("dist")
-
-    build_landingpages(BASE_PATH)
-    build_seo_pages(BASE_PATH)
+def render_seo_page(slug, base_title, phrase, description_tpl, related=(), styles=None):
+    data, _, _ = seo_landingpage_data({"base_title": base_title}, phrase, description_tpl)
+    return iter_landingpage(slug, data, related, styles)
+def seo_pages(seen=None):
+    """(slug, phrase, seo, inputs) je Kombination – Slugs anderer Seiten gelten als vergeben"""
+    if seen is None:
+        seen = SlugSet(site_content().landingpages)
+    # SEO-Seiten erben den Inhalt von "ai-automation" → gehört zu den Eingaben
+    base = site_content().landingpages["ai-automation"].digest
+    for base_slug, seo, (slug, phrase, intent, industry, region) in expand_all(SEO_KEYWORDS, seen):
+        inputs = {
+            "base_title": seo["base_title"],
+            "description_template": seo["description_template"],
+            "intent": intent,
+            "industry": industry,
+            "region": region,
+            "base": base
+        }
+        yield slug, phrase, seo, inputs
+def seo_page_specs(seen=None, related=None):
+    related = related or {}
+    # Alle SEO-Seiten liegen eine Ebene tief → derselbe relative Stylesheet-Link
+    styles = page_styles("slug/index.html")
+    for slug, phrase, seo, inputs in seo_pages(seen):
+        links = related.get(slug, ())
+        # Worker bekommen nur, was sie zum Rendern brauchen – nicht das ganze Keyword-Dict
+        args = (slug, seo["base_title"], phrase, seo["description_template"], links, styles)
+        yield f"{slug}/index.html", render_seo_page, args, dict(inputs, related=links, styles=styles)
+def build_seo_pages(base_path, manifest=None, jobs=1, related=None):
+    seen = SlugSet(site_content().landingpages)
+    render_pages(base_path, seo_page_specs(seen, related), manifest, jobs, label="SEO-Seiten")
+    if seen.duplicates:
+        log(f"SEO-Seiten: {seen.duplicates} doppelte Slugs übersprungen")
 PRICING_PLANS = [
     {
         "name": "Starter",
@@ -1059,105 +662,68 @@ PRICING_PLANS = [
         "cta": "Kontakt aufnehmen"
     }
 ]
+def iter_pricing_page(styles=None):
+    return stream_template("pricing.html", plans=site_content().pricing, **(styles or {}))
 def render_pricing_page():
-    plans_html = ""
-    for plan in PRICING_PLANS:
-        plans_html += f"""
-        <div class="plan">
-            <h2>{plan['name']}</h2>
-            <p class="price">{plan['price']}</p>
-            <ul>
-                {''.join(f"<li>{f}</li>" for f in plan['features'])}
-            </ul>
-            <a class="cta">{plan['cta']}</a>
-        </div>
-        """
-
-    return f"""
-<!DOCTYPE html>
-<html lang="de">
-<head>
-    <title>Preise & Pakete</title>
-    <meta name="description" content="Klare Pakete für KI-Automatisierung und skalierbare Systeme.">
-</head>
-<body>
-<section class="pricing">
-    <h1>Preise & Pakete</h1>
-    <div class="plans">
-        {plans_html}
-    </div>
-</section>
-</body>
-</html>
-"""
-def build_pricing_page(base_path):
-    path = base_path / "preise"
-    path.mkdir(parents=True, exist_ok=True)
-    (path / "index.html").write_text(render_pricing_page(), encoding="utf-8")
-def build_saas_placeholders(base_path):
-    pages = {
-        "login": "Login – demnächst verfügbar",
-        "dashboard": "Dashboard – SaaS in Vorbereitung",
-        "api": "API – bald verfügbar"
-    }
-
-    for slug, headline in pages.items():
-        path = base_path / slug
-        path.mkdir(parents=True, exist_ok=True)
-        (path / "index.html").write_text(f"""
-<!DOCTYPE html>
-<html lang="de">
-<head>
-    <title>{headline}</title>
-</head>
-<body>
-<h1>{headline}</h1>
-<p>Dieses Produkt befindet sich aktuell im Aufbau.</p>
-</body>
-</html>
-""", encoding="utf-8")
-if __name__ == "__main__":
-    BASE_PATH = Path("dist")
-
-    build_landingpages(BASE_PATH)
-    build_seo_pages(BASE_PATH)
-    build_pricing_page(BASE_PATH)
-    build_saas_placeholders(BASE_PATH)
-from bs4 import BeautifulSoup
-
-def scan_html_files(base_path):
-    html_files = list(base_path.rglob("index.html"))
-    pages = []
-
-    for file in html_files:
-        content = file.read_text(encoding="utf-8")
-        soup = BeautifulSoup(content, "html.parser")
-
-        title = soup.title.string.strip() if soup.title else ""
-        description_tag = soup.find("meta", attrs={"name": "description"})
-        description = description_tag["content"].strip() if description_tag else ""
-
-        links = [a.get("href") for a in soup.find_all("a") if a.get("href")]
-
-        pages.append({
-            "file": file,
-            "title": title,
-            "description": description,
-            "links": links,
-            "content_length": len(soup.get_text(strip=True))
-        })
-
-    return pages
-def check_broken_links(pages, base_path):
-    existing_paths = {"/" + str(p["file"].parent.relative_to(base_path)).replace("\\", "/") + "/" for p in pages}
-    broken = []
-
-    for page in pages:
-        for link in page["links"]:
-            if link.startswith("/") and link not in existing_paths:
-                broken.append((page["file"], link))
-
-    return broken
+    return "".join(iter_pricing_page())
+def build_pricing_page(base_path, manifest=None):
+    styles = page_styles("preise/index.html")
+    inputs = {"plans": site_content().pricing, "styles": styles}
+    write_page(base_path, "preise/index.html", iter_pricing_page, (styles,), inputs, manifest)
+SAAS_PLACEHOLDERS = {
+    "login": "Login – demnächst verfügbar",
+    "dashboard": "Dashboard – SaaS in Vorbereitung",
+    "api": "API – bald verfügbar"
+}
+def render_saas_placeholder(headline, styles=None):
+    return render_template(
+        "placeholder.html",
+        title=headline,
+        headline=headline,
+        text="Dieses Produkt befindet sich aktuell im Aufbau.",
+        **(styles or {})
+    )
+def build_saas_placeholders(base_path, manifest=None):
+    for slug, headline in SAAS_PLACEHOLDERS.items():
+        styles = page_styles(f"{slug}/index.html")
+        inputs = {"headline": headline, "styles": styles}
+        write_page(base_path, f"{slug}/index.html", render_saas_placeholder, (headline, styles), inputs, manifest)
+def render_thankyou_page(styles=None):
+    return render_template(
+        "placeholder.html",
+        title="Danke für deine Anfrage",
+        headline="Anfrage erhalten",
+        text="Wir melden uns zeitnah.",
+        **(styles or {})
+    )
+def build_thankyou_page(base_path, manifest=None):
+    # Ziel der Weiterleitung im Lead-Server (lead_server.py)
+    styles = page_styles("danke/index.html")
+    write_page(base_path, "danke/index.html", render_thankyou_page, (styles,), {"styles": styles}, manifest)
+# ----------------------------
+# QA
+# ----------------------------
+# Absolute Links werden gegen den Deploy-Pfad geprüft (GitHub Pages: /website/)
+QA_BASE_PATH = urlsplit(BASE_URL).path
+# Berichte liegen neben dist/ bzw. neben dem Archiv – nicht im ausgelieferten Baum
+QA_REPORT_DIR = "reports"
+QA_JSON = "qa_report.json"
+QA_JUNIT = "qa_report.xml"
+# Grenzwerte für den Build (None = nur berichten); per --max-… überschreibbar
+QA_LIMITS = {"broken_links": 0, "duplicate_clusters": None, "empty_pages": None}
+
+def scan_html_files(base_path, jobs=1):
+    if isinstance(base_path, ArchiveReader):
+        pages, files, stats = scan_archive(base_path, ".html")
+    else:
+        # Fakten pro Datei aus dist/.qa_cache.json – nur geänderte Seiten werden geparst
+        pages, files, stats = scan_pages(base_path, ".html", jobs)
+    log(f"QA-Scan: {stats['pages']} Seiten, {stats['parsed']} geparst, {stats['cached']} aus dem Cache")
+    return pages, files
+def check_broken_links(pages, files):
+    # Relative und absolute Links, Assets (src/srcset) und #Anker gegen alle Ausgabedateien
+    index = LinkIndex(files, pages, QA_BASE_PATH)
+    return list(find_broken_links(pages, index))
 def check_duplicates(pages):
     titles = {}
     descriptions = {}
@@ -1177,309 +743,283 @@ def check_duplicates(pages):
             descriptions[p["description"]] = True
 
     return duplicate_titles, duplicate_descriptions
+def check_near_duplicates(pages, threshold=THRESHOLD):
+    # MinHash-Signaturen aus dem QA-Scan, LSH statt Paarvergleich
+    if not SIMILAR_NUMPY:
+        warn("NumPy fehlt – Near-Duplicate-Prüfung übersprungen (pip install -r requirements.txt)")
+        return []
+    return near_duplicates({p["rel"]: p["minhash"] for p in pages}, threshold)
 def check_empty_pages(pages, min_length=200):
     return [p["file"] for p in pages if p["content_length"] < min_length]
-def generate_build_report(pages, broken_links, dup_titles, dup_desc, empty_pages):
+def check_missing_pages(files, content):
+    """Seiten aus dem Seitenmodell, die im Output fehlen"""
+    return [rel_path for rel_path in content.outputs() if rel_path not in files]
+def generate_build_report(pages, broken_links, dup_titles, dup_desc, empty_pages, missing_pages=(), near_dups=()):
     report = []
     report.append(f"Gesamtseiten: {len(pages)}")
     report.append(f"Broken Links: {len(broken_links)}")
     report.append(f"Duplicate Titles: {len(set(dup_titles))}")
     report.append(f"Duplicate Descriptions: {len(set(dup_desc))}")
+    report.append(f"Near-Duplicate-Cluster: {len(near_dups)} ({sum(len(c[1]) for c in near_dups)} Seiten)")
     report.append(f"Leere Seiten: {len(empty_pages)}")
+    report.append(f"Fehlende Seiten: {len(missing_pages)}")
+
+    if broken_links:
+        report.append("")
+        report.append("Broken Links:")
+        for rel_path, line, url, reason in broken_links:
+            report.append(f"  {rel_path}:{line} → {url} ({reason})")
+
+    for similarity, members in near_dups:
+        report.append("")
+        report.append(f"Near-Duplicates (≥ {similarity:.0%} ähnlich, {len(members)} Seiten):")
+        report += [f"  {rel_path}" for rel_path in members]
 
     return "\n".join(report)
-def run_qa(base_path):
-    pages = scan_html_files(base_path)
+def qa_findings(pages, broken_links, dup_titles, dup_desc, empty_pages, missing_pages, near_dups):
+    """Check → Generator von (Seite, Zeile, Meldung) – die Berichte schreiben sie einzeln weg"""
+    titles, descriptions, empty = set(dup_titles), set(dup_desc), set(empty_pages)
 
-    broken_links = check_broken_links(pages, base_path)
-    dup_titles, dup_desc = check_duplicates(pages)
-    empty_pages = check_empty_pages(pages)
+    def duplicates():
+        for p in pages:
+            if p["title"] in titles:
+                yield p["rel"], None, f"Titel doppelt: {p['title']}"
+            if p["description"] in descriptions:
+                yield p["rel"], None, f"Description doppelt: {p['description']}"
+
+    return {
+        "broken_links": ((rel_path, line, f"{url} ({reason})") for rel_path, line, url, reason in broken_links),
+        "duplicates": duplicates(),
+        "near_duplicates": (
+            (rel_path, None, f"Cluster {n}: ≥ {similarity:.0%} ähnlich zu {len(members) - 1} weiteren Seiten")
+            for n, (similarity, members) in enumerate(near_dups, 1) for rel_path in members
+        ),
+        "empty_pages": ((p["rel"], None, f"Nur {p['content_length']} Zeichen Inhalt")
+                        for p in pages if p["file"] in empty),
+        "missing_pages": ((rel_path, None, "Fehlt im Output") for rel_path in missing_pages),
+    }
+def timed(timings, name, check, *args):
+    start = time.perf_counter()
+    result = check(*args)
+    timings[name] = time.perf_counter() - start
+    return result
+def run_qa(base_path, jobs=1, similarity=THRESHOLD, limits=None, report_dir=None):
+    """Gibt die überschrittenen Grenzwerte zurück – leer, wenn die QA bestanden ist.
+    base_path: dist-Verzeichnis oder ArchiveReader; Berichte landen in report_dir (sonst reports/ neben dist)."""
+    report_dir = Path(report_dir or Path(base_path).parent / QA_REPORT_DIR)
+    report_dir.mkdir(parents=True, exist_ok=True)
+    timings = {}
+    pages, files = timed(timings, "scan", scan_html_files, base_path, jobs)
+
+    broken_links = timed(timings, "broken_links", check_broken_links, pages, files)
+    dup_titles, dup_desc = timed(timings, "duplicates", check_duplicates, pages)
+    near_dups = timed(timings, "near_duplicates", check_near_duplicates, pages, similarity)
+    empty_pages = timed(timings, "empty_pages", check_empty_pages, pages)
+    missing_pages = timed(timings, "missing_pages", check_missing_pages, files, site_content())
 
     report = generate_build_report(
         pages,
         broken_links,
         dup_titles,
         dup_desc,
-        empty_pages
+        empty_pages,
+        missing_pages,
+        near_dups
     )
 
-    report_path = base_path / "build_report.txt"
+    report_path = report_dir / "build_report.txt"
     report_path.write_text(report, encoding="utf-8")
 
+    counts = {
+        "pages": len(pages),
+        "broken_links": len(broken_links),
+        "duplicate_titles": len(set(dup_titles)),
+        "duplicate_descriptions": len(set(dup_desc)),
+        "duplicate_clusters": len(near_dups),
+        "empty_pages": len(empty_pages),
+        "missing_pages": len(missing_pages),
+    }
+    limits = {**QA_LIMITS, **(limits or {})}
+    failures = check_thresholds(counts, limits)
+    if not SIMILAR_NUMPY and limits.get("duplicate_clusters") is not None:
+        # Ohne NumPy liefert die Prüfung nie Cluster – ein gesetzter Grenzwert wäre wirkungslos
+        failures.append("duplicate_clusters: NumPy fehlt, Near-Duplicate-Prüfung nicht möglich")
+    summary = {**counts, "limits": limits, "failures": failures}
+    findings = (pages, broken_links, dup_titles, dup_desc, empty_pages, missing_pages, near_dups)
+    # Generatoren lassen sich nur einmal durchlaufen → je Bericht neu erzeugen
+    write_json_report(report_dir / QA_JSON, summary, timings, qa_findings(*findings))
+    write_junit_report(report_dir / QA_JUNIT, timings, qa_findings(*findings))
+
     print("QA abgeschlossen")
     print(report)
-if __name__ == "__main__":
-    BASE_PATH = Path("dist")
-
-    build_landingpages(BASE_PATH)
-    build_seo_pages(BASE_PATH)
-    build_pricing_page(BASE_PATH)
-    build_saas_placeholders(BASE_PATH)
-
-    run_qa(BASE_PATH)
-<form method="POST" action="/lead">
-    <input type="text" name="name" placeholder="Name" required>
-    <input type="email" name="email" placeholder="E-Mail" required>
-
-    <!-- Tracking -->
-    <input type="hidden" name="source_page" value="{{PAGE_SLUG}}">
-    <input type="hidden" name="campaign" value="{{CAMPAIGN}}">
-    <input type="hidden" name="timestamp" value="{{TIMESTAMP}}">
-
-    <button type="submit">Anfrage senden</button>
-</form>
-from datetime import datetime
-
-def render_form(slug):
-    return f"""
-<form method="POST" action="/lead">
-    <input type="text" name="name" placeholder="Name" required>
-    <input type="email" name="email" placeholder="E-Mail" required>
-
-    <input type="hidden" name="source_page" value="{slug}">
-    <input type="hidden" name="campaign" value="organic">
-    <input type="hidden" name="timestamp" value="{datetime.utcnow().isoformat()}">
-
-    <button class="cta" type="submit">Anfrage senden</button>
-</form>
-"""
-<section class="cta-final">
-    {render_form(slug)}
-</section>
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from urllib.parse import parse_qs
-from pathlib import Path
-import json
-import csv
-from datetime import datetime
-
-BASE = Path("leads")
-BASE.mkdir(exist_ok=True)
-
-CSV_FILE = BASE / "leads.csv"
-JSON_FILE = BASE / "leads.json"
-
-class LeadHandler(BaseHTTPRequestHandler):
-    def do_POST(self):
-        if self.path != "/lead":
-            self.send_response(404)
-            self.end_headers()
-            return
-
-        length = int(self.headers["Content-Length"])
-        body = self.rfile.read(length).decode()
-        data = {k: v[0] for k, v in parse_qs(body).items()}
-        data["received_at"] = datetime.utcnow().isoformat()
-
-        # CSV
-        file_exists = CSV_FILE.exists()
-        with CSV_FILE.open("a", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=data.keys())
-            if not file_exists:
-                writer.writeheader()
-            writer.writerow(data)
-
-        # JSON
-        leads = []
-        if JSON_FILE.exists():
-            leads = json.loads(JSON_FILE.read_text(encoding="utf-8"))
-        leads.append(data)
-        JSON_FILE.write_text(json.dumps(leads, indent=2), encoding="utf-8")
-
-        self.send_response(302)
-        self.send_header("Location", "/danke")
-        self.end_headers()
-
-if __name__ == "__main__":
-    HTTPServer(("localhost", 8000), LeadHandler).serve_forever()
-def build_thankyou_page(base_path):
-    path = base_path / "danke"
-    path.mkdir(parents=True, exist_ok=True)
-    (path / "index.html").write_text("""
-<!DOCTYPE html>
-<html lang="de">
-<head>
-    <title>Danke für deine Anfrage</title>
-</head>
-<body>
-<h1>Anfrage erhalten</h1>
-<p>Wir melden uns zeitnah.</p>
-</body>
-</html>
-""", encoding="utf-8")
-import json
-import csv
-import smtplib
-from email.message import EmailMessage
-from pathlib import Path
-import requests
-
-# Basisordner für Leads
-LEAD_PATH = Path("leads")
-LEAD_PATH.mkdir(exist_ok=True)
-CSV_FILE = LEAD_PATH / "leads.csv"
-JSON_FILE = LEAD_PATH / "leads.json"
-
-# Beispiel: Mail-Benachrichtigung
-SMTP_SERVER = "smtp.example.com"
-SMTP_PORT = 587
-SMTP_USER = "dein@email.com"
-SMTP_PASS = "PASSWORT"
-
-def send_email_notification(lead):
-    msg = EmailMessage()
-    msg['Subject'] = f"Neuer Lead: {lead['name']}"
-    msg['From'] = SMTP_USER
-    msg['To'] = "sales@deinefirma.de"
-    msg.set_content(f"Neuer Lead:\nName: {lead['name']}\nEmail: {lead['email']}\nSeite: {lead['source_page']}\nZeit: {lead['received_at']}")
-
-    with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as smtp:
-        smtp.starttls()
-        smtp.login(SMTP_USER, SMTP_PASS)
-        smtp.send_message(msg)
-
-# Beispiel: Push in CRM via API (hier Pseudo-Code)
-CRM_API_URL = "https://api.mailerlite.com/api/v2/subscribers"
-CRM_API_KEY = "DEIN_API_KEY"
-
-def push_to_crm(lead):
-    headers = {"Content-Type": "application/json", "X-MailerLite-ApiKey": CRM_API_KEY}
-    data = {"email": lead["email"], "name": lead["name"], "fields": {"source_page": lead["source_page"]}}
-    response = requests.post(CRM_API_URL, headers=headers, json=data)
-    return response.status_code
-
-# Lead verarbeiten
-def process_new_leads():
-    if not JSON_FILE.exists():
-        return
+    log(f"QA-Berichte: {report_dir}")
+    for failure in failures:
+        print(f"❌ QA-Grenzwert überschritten – {failure}")
+    return failures
+# ----------------------------
+# WATCH MODE
+# ----------------------------
+def watch_paths() -> list:
+    return [
+        CSS_FILE, IMG_DIR, SITE_FILE, BASE_DIR / "pages.json", CONTENT_DIR, TEMPLATE_DIR,
+        *(BASE_DIR / subpage / "content" for subpage in SUBPAGES),
+    ]
+
+def watch_site(base_path=DIST_DIR, jobs=1, compress=True, minify=False):
+    """Beobachtet die Quellen; pro Speichervorgang ein Durchlauf, der nur Betroffenes anfasst"""
+    def rebuild(changed):
+        global TEMPLATE_VERSION
+        TRACER.reset()  # Stages nur pro Durchlauf sammeln
+        if touches(changed, TEMPLATE_DIR):
+            clear_cache()
+            TEMPLATE_VERSION = page_version(minify)
+        if touches(changed, CSS_FILE):
+            copy_css(base_path)
+            log("CSS synchronisiert")
+        if touches(changed, IMG_DIR):
+            copy_images(base_path)
+
+        # Der Manifest-Vergleich sorgt dafür, dass nur geänderte Einträge neu gerendert werden –
+        # bei neuer style.css also nur die Seiten, die sie über ihren Hash-Namen einbinden
+        manifest = BuildManifest(base_path)
+        assets = fingerprint_site(base_path)
+        assets.place()
+        build_all_pages(base_path, manifest, jobs)
+        if minify:
+            minify_pages(base_path, manifest.built_paths, jobs)
+        build_search(base_path, manifest)
+        removed = manifest.prune()
+        manifest.save()
+        assets.finish()
+        if manifest.built or removed:
+            build_sitemap(base_path, manifest)
+        log(f"Neu gebaut: {manifest.built} Seite(n), {len(removed)} entfernt")
+        build_subpages()
+        if compress:
+            # Sonst liefern Server mit gzip_static & Co. die alte .gz-Variante aus
+            stats = precompress(base_path, jobs)
+            log(f"Vorkomprimiert: {stats['compressed']} neu, {stats['removed']} entfernt")
+
+    watch(watch_paths(), rebuild)
 
-    leads = json.loads(JSON_FILE.read_text(encoding="utf-8"))
-    for lead in leads:
-        try:
-            send_email_notification(lead)
-        except Exception as e:
-            print(f"⚠️ E-Mail-Benachrichtigung fehlgeschlagen: {e}")
-        try:
-            status = push_to_crm(lead)
-            if status == 200 or status == 201:
-                print(f"✅ Lead {lead['email']} an CRM gesendet.")
-            else:
-                print(f"⚠️ CRM Push fehlgeschlagen: {status}")
-        except Exception as e:
-            print(f"⚠️ CRM Push Exception: {e}")
-# In lead_server.py nach Speicherung
-process_new_leads()
-# =====================================================
-# AI-FABRIK – Lead Server + CRM + E-Mail Automation
-# Phase 5 + 7 kombiniert
-# =====================================================
-
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from urllib.parse import parse_qs
-from pathlib import Path
-import json
-import csv
-from datetime import datetime
-import smtplib
-from email.message import EmailMessage
-import requests
-
-# ================== Konfiguration ==================
-BASE = Path("leads")
-BASE.mkdir(exist_ok=True)
-
-CSV_FILE = BASE / "leads.csv"
-JSON_FILE = BASE / "leads.json"
-
-# E-Mail
-SMTP_SERVER = "smtp.example.com"
-SMTP_PORT = 587
-SMTP_USER = "dein@email.com"
-SMTP_PASS = "PASSWORT"
-EMAIL_TARGET = "sales@deinefirma.de"
-
-# CRM
-CRM_API_URL = "https://api.mailerlite.com/api/v2/subscribers"
-CRM_API_KEY = "DEIN_API_KEY"
-
-# ================== Helper-Funktionen ==================
-def send_email_notification(lead):
-    msg = EmailMessage()
-    msg['Subject'] = f"Neuer Lead: {lead['name']}"
-    msg['From'] = SMTP_USER
-    msg['To'] = EMAIL_TARGET
-    msg.set_content(
-        f"Neuer Lead:\n"
-        f"Name: {lead['name']}\n"
-        f"Email: {lead['email']}\n"
-        f"Seite: {lead['source_page']}\n"
-        f"Zeit: {lead['received_at']}"
-    )
-    with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as smtp:
-        smtp.starttls()
-        smtp.login(SMTP_USER, SMTP_PASS)
-        smtp.send_message(msg)
-
-def push_to_crm(lead):
-    headers = {"Content-Type": "application/json", "X-MailerLite-ApiKey": CRM_API_KEY}
-    data = {"email": lead["email"], "name": lead["name"], "fields": {"source_page": lead["source_page"]}}
-    response = requests.post(CRM_API_URL, headers=headers, json=data)
-    return response.status_code
-
-def process_new_lead(lead):
-    # CSV speichern
-    file_exists = CSV_FILE.exists()
-    with CSV_FILE.open("a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=lead.keys())
-        if not file_exists:
-            writer.writeheader()
-        writer.writerow(lead)
-
-    # JSON speichern
-    leads = []
-    if JSON_FILE.exists():
-        leads = json.loads(JSON_FILE.read_text(encoding="utf-8"))
-    leads.append(lead)
-    JSON_FILE.write_text(json.dumps(leads, indent=2), encoding="utf-8")
-
-    # E-Mail & CRM
-    try:
-        send_email_notification(lead)
-        print(f"✅ E-Mail an {EMAIL_TARGET} gesendet.")
-    except Exception as e:
-        print(f"⚠️ E-Mail Versand fehlgeschlagen: {e}")
-
-    try:
-        status = push_to_crm(lead)
-        if status in [200, 201]:
-            print(f"✅ Lead {lead['email']} an CRM gesendet.")
-        else:
-            print(f"⚠️ CRM Push fehlgeschlagen: Status {status}")
-    except Exception as e:
-        print(f"⚠️ CRM Push Exception: {e}")
-
-# ================== HTTP Server ==================
-class LeadHandler(BaseHTTPRequestHandler):
-    def do_POST(self):
-        if self.path != "/lead":
-            self.send_response(404)
-            self.end_headers()
-            return
-
-        length = int(self.headers["Content-Length"])
-        body = self.rfile.read(length).decode()
-        data = {k: v[0] for k, v in parse_qs(body).items()}
-        data["received_at"] = datetime.utcnow().isoformat()
-
-        # Lead verarbeiten
-        process_new_lead(data)
-
-        # Weiterleitung zur Danke-Seite
-        self.send_response(302)
-        self.send_header("Location", "/danke")
-        self.end_headers()
-
-# ================== Server starten ==================
 if __name__ == "__main__":
-    print("🚀 Lead Server läuft auf http://localhost:8000")
-    HTTPServer(("localhost", 8000), LeadHandler).serve_forever()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Website bauen")
+    parser.add_argument("command", nargs="?", choices=["build", "watch"], default="build")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="Parallele Render-Prozesse (0 = alle Kerne)")
+    parser.add_argument("--trace", type=Path, help="Build-Trace als JSON schreiben")
+    parser.add_argument("--chrome-trace", type=Path, help="Trace-Event-Datei für chrome://tracing schreiben")
+    parser.add_argument("--archive", type=Path, help="Direkt in ein Archiv bauen (.zip, .tar, .tar.gz, .tar.xz)")
+    parser.add_argument("--no-compress", action="store_true", help="Archiv ohne Kompression schreiben (nur .zip und .tar)")
+    parser.add_argument("--no-precompress", action="store_true", help="Keine .gz/.zst/.br-Varianten erzeugen")
+    parser.add_argument("--minify", action="store_true", help="Neu gebaute HTML-Seiten minifizieren")
+    parser.add_argument("--critical-css", action="store_true", help="Critical CSS zusätzlich in den head inlinen")
+    parser.add_argument("--similarity", type=float, default=THRESHOLD,
+                        help="Ab dieser Ähnlichkeit (0–1) gelten Seiten in der QA als Near-Duplicates")
+    parser.add_argument("--max-broken-links", type=int, default=QA_LIMITS["broken_links"],
+                        help="Mehr Broken Links lassen den Build fehlschlagen (-1 = keine Grenze)")
+    parser.add_argument("--max-duplicate-clusters", type=int, default=QA_LIMITS["duplicate_clusters"],
+                        help="Höchstzahl Near-Duplicate-Cluster (Standard: keine Grenze)")
+    parser.add_argument("--max-empty-pages", type=int, default=QA_LIMITS["empty_pages"],
+                        help="Höchstzahl Seiten mit zu wenig Inhalt (Standard: keine Grenze)")
+    args = parser.parse_args()
+
+    BASE_PATH = DIST_DIR
+    INLINE_CRITICAL_CSS = args.critical_css
+    TRACER.record_pages = bool(args.trace or args.chrome_trace)
+    if args.no_compress and args.archive and not args.archive.name.lower().endswith((".tar", ".zip")):
+        parser.error("--no-compress geht nur mit .tar- oder .zip-Archiven")
+    qa_limits = {
+        "broken_links": args.max_broken_links,
+        "duplicate_clusters": args.max_duplicate_clusters,
+        "empty_pages": args.max_empty_pages,
+    }
+    qa_limits = {name: None if limit is not None and limit < 0 else limit for name, limit in qa_limits.items()}
+
+    if args.archive:
+        # Kein loser dist-Baum → kein Manifest-Vergleich, das Archiv wird immer komplett geschrieben
+        with ArchiveWriter(args.archive, compress=not args.no_compress) as archive:
+            # Kein dist-Baum zum Nachlesen → Suchterme entstehen beim Schreiben der Seiten
+            search = SearchCollector(exclude={SEARCH_PAGE})
+            archive.observers.append(search)
+            with TRACER.stage("asset copy"):
+                if CSS_FILE.exists():
+                    archive.add_file(CSS_FILE, CSS_FILE.name)
+                if IMG_DIR.exists():
+                    archive.add_tree(IMG_DIR, "images")
+                for src, hashed in fingerprint_site(BASE_PATH).files():
+                    archive.add_file(src, hashed)
+            build_all_pages(archive, None, args.jobs)
+            with TRACER.stage("search"):
+                archive.observers.remove(search)
+                archive.add_file(SEARCH_JS, f"{INDEX_DIR}/{SEARCH_JS.name}")
+                stats = search.write(archive)
+            log(f"Suchindex: {stats['docs']} Seiten, {stats['terms']} Terme in {stats['shards']} Shards")
+            with TRACER.stage("sitemap"):
+                build_sitemap(archive)
+        log(f"Archiv gebaut: {len(archive.written)} Dateien → {args.archive}")
+        # QA liest das fertige Archiv – geprüft wird genau das, was ausgeliefert wird
+        with TRACER.stage("qa"):
+            reader = ArchiveReader(args.archive)
+            try:
+                qa_failures = run_qa(reader, args.jobs, args.similarity, qa_limits,
+                                     args.archive.parent / QA_REPORT_DIR)
+            finally:
+                reader.close()
+        print(TRACER.report())
+        if args.trace:
+            TRACER.write_json(args.trace)
+        if args.chrome_trace:
+            TRACER.write_chrome_trace(args.chrome_trace)
+        raise SystemExit(1 if qa_failures else 0)
+    manifest = BuildManifest(BASE_PATH)
+    # Umschalten von --minify baut einmal alles neu
+    TEMPLATE_VERSION = page_version(args.minify)
+
+    assets = build_website(BASE_PATH, manifest, args.jobs)
+    fragments = FRAGMENTS.stats()
+    log(f"Fragment-Cache: {fragments['hits']} Treffer, {fragments['misses']} neu gerendert, "
+        f"{fragments['uncached']} ungecacht ({fragments['hit_rate']:.0%})")
+    if args.minify:
+        # Vor manifest.save(): bricht der Build hier ab, werden die Seiten beim nächsten Mal neu gebaut
+        with TRACER.stage("minify"):
+            stats = minify_pages(BASE_PATH, manifest.built_paths, args.jobs)
+            TRACER.add_bytes(stats["bytes_out"])
+        log(f"Minifiziert: {stats['files']} Seiten, {stats['saved']} Bytes gespart "
+            f"({stats['bytes_in']} → {stats['bytes_out']})")
+    # Nach dem Minify: der Index liest die Seiten so, wie sie ausgeliefert werden
+    with TRACER.stage("search"):
+        build_search(BASE_PATH, manifest)
+
+    removed = manifest.prune()
+    manifest.save()
+    log(f"Inkrementeller Build: {manifest.built} gebaut, {manifest.skipped} unverändert, {len(removed)} entfernt")
+    # Alte Hash-Namen erst löschen, wenn keine Seite mehr auf sie zeigt
+    stale_assets = assets.finish()
+    log(f"Asset-Fingerprints: {len(assets.current)} Assets, {assets.placed} neu, {len(stale_assets)} veraltet entfernt")
+
+    with TRACER.stage("sitemap"):
+        build_sitemap(BASE_PATH, manifest)
+    with TRACER.stage("subpages"):
+        build_subpages()
+    with TRACER.stage("qa"):
+        qa_failures = run_qa(BASE_PATH, args.jobs, args.similarity, qa_limits, BASE_DIR / QA_REPORT_DIR)
+    if not args.no_precompress:
+        with TRACER.stage("precompress"):
+            stats = precompress(BASE_PATH, args.jobs)
+            TRACER.add_bytes(stats["bytes_out"])
+        log(f"Vorkomprimiert ({', '.join(ENCODERS)}): {stats['compressed']} neu, "
+            f"{stats['unchanged']} unverändert, {stats['removed']} entfernt")
+
+    print(TRACER.report())
+    if args.trace:
+        TRACER.write_json(args.trace)
+    if args.chrome_trace:
+        TRACER.write_chrome_trace(args.chrome_trace)
+
+    if args.command == "watch":
+        watch_site(BASE_PATH, args.jobs, not args.no_precompress, args.minify)
+    elif qa_failures:
+        # CI bricht ab, bevor deployt wird – die Berichte liegen in reports/
+        raise SystemExit(1)
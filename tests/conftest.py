@@ -0,0 +1,27 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Die Build-Module liegen flach im Repo-Root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import build_templates  # noqa: E402
+
+
+@pytest.fixture
+def templates(tmp_path, monkeypatch):
+    """Eigenes Template-Verzeichnis + Bytecode-Cache pro Test; liefert eine Schreibfunktion"""
+    template_dir = tmp_path / "templates"
+    template_dir.mkdir()
+    monkeypatch.setattr(build_templates, "TEMPLATE_DIR", template_dir)
+    monkeypatch.setattr(build_templates, "CACHE_DIR", tmp_path / "cache")
+    build_templates.clear_cache()
+
+    def write(name, source):
+        path = template_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source, encoding="utf-8")
+
+    yield write
+    build_templates.clear_cache()
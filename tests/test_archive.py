@@ -0,0 +1,37 @@
+import pytest
+
+import build_website as site
+from build_archive import ArchiveReader, ArchiveWriter
+
+
+@pytest.mark.parametrize("name", ["site.zip", "site.tar", "site.tar.gz"])
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_archive_round_trip_matches_dist_build(tmp_path, monkeypatch, name, jobs):
+    # Ohne Bilder ist die Bildauswahl kein Zufall → beide Builds sind bytegleich
+    monkeypatch.setattr(site, "IMG_DIR", tmp_path / "images")
+    dist = tmp_path / "dist"
+    site.build_all_pages(dist, None, 1)
+
+    with ArchiveWriter(tmp_path / name) as archive:
+        site.build_all_pages(archive, None, jobs)
+        site.build_sitemap(archive)
+
+    reader = ArchiveReader(tmp_path / name)
+    try:
+        # Build-Zustand (.related_index.npz, ...) bleibt im dist-Verzeichnis, nicht im Archiv
+        files = {p.relative_to(dist).as_posix() for p in dist.rglob("*") if p.is_file() and not p.name.startswith(".")}
+        assert reader.names == files | {"sitemap_index.xml", "sitemap-1.xml.gz"}
+        for rel in files:
+            assert reader.read(rel) == (dist / rel).read_bytes(), rel
+        assert reader.resolve("/preise/") == "preise/index.html"
+        assert reader.resolve("/ai-automation?utm=x") == "ai-automation/index.html"
+        assert reader.resolve("/fehlt") is None
+    finally:
+        reader.close()
+
+
+def test_compressed_tar_suffix_requires_compression(tmp_path):
+    with pytest.raises(ValueError):
+        ArchiveWriter(tmp_path / "site.tar.gz", compress=False)
+    with pytest.raises(ValueError):
+        ArchiveWriter(tmp_path / "site.rar")
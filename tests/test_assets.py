@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+from build_assets import atomic_open, sync_file, sync_tree, write_atomic
+
+
+def make_tree(root, files):
+    for rel, data in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+
+def test_second_sync_touches_nothing(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dist" / "images"
+    make_tree(src, {"a.png": b"A", "sub/b.jpg": b"B"})
+
+    first = sync_tree(src, dst)
+    assert first["unchanged"] == 0
+    assert (dst / "sub" / "b.jpg").read_bytes() == b"B"
+    assert (tmp_path / "dist" / ".assets-images.json").exists()
+
+    second = sync_tree(src, dst)
+    assert second["unchanged"] == 2
+    assert second["linked"] + second["reflinked"] + second["copied"] == 0
+
+
+def test_new_files_are_hardlinked_when_possible(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    make_tree(src, {"a.png": b"A"})
+    sync_tree(src, dst)
+    st_src, st_dst = (src / "a.png").stat(), (dst / "a.png").stat()
+    if (st_src.st_dev, st_src.st_ino) != (st_dst.st_dev, st_dst.st_ino):
+        pytest.skip("Dateisystem ohne Hardlinks")
+    assert st_dst.st_nlink == 2
+
+
+def test_changed_and_removed_sources(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    make_tree(src, {"a.png": b"A", "b.png": b"B"})
+    sync_tree(src, dst)
+
+    (src / "b.png").unlink()
+    (src / "a.png").unlink()  # neue Datei statt in-place ändern, wie ein Editor beim Speichern
+    (src / "a.png").write_bytes(b"AA")
+    stats = sync_tree(src, dst)
+    assert stats["removed"] == 1
+    assert not (dst / "b.png").exists()
+    assert (dst / "a.png").read_bytes() == b"AA"
+
+
+def test_mtime_only_change_is_detected_by_hash(tmp_path):
+    src, dst = tmp_path / "src.css", tmp_path / "dst.css"
+    src.write_bytes(b"body{}")
+    dst.write_bytes(b"body{}")
+    os.utime(src, ns=(1, 1))
+    assert sync_file(src, dst) == "unchanged"
+
+
+def test_atomic_write_keeps_old_file_on_error(tmp_path):
+    target = tmp_path / "out" / "report.json"
+    write_atomic(target, "alt")
+    with pytest.raises(RuntimeError):
+        with atomic_open(target, "w", encoding="utf-8") as f:
+            f.write("halb")
+            raise RuntimeError("Abbruch")
+    assert target.read_text(encoding="utf-8") == "alt"
+    assert [p.name for p in target.parent.iterdir()] == ["report.json"]
@@ -0,0 +1,45 @@
+import gzip
+
+import pytest
+
+from build_compress import STATE_NAME, precompress
+
+PAGE = "<html><body>" + "Automatisierung " * 50 + "</body></html>"
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_siblings_are_written_once(tmp_path, jobs):
+    (tmp_path / "a.html").write_text(PAGE, encoding="utf-8")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.css").write_text("body{margin:0}" * 30, encoding="utf-8")
+    (tmp_path / "tiny.html").write_text("<p>x</p>", encoding="utf-8")
+    (tmp_path / "bild.png").write_bytes(b"\x89PNG" * 100)
+
+    stats = precompress(tmp_path, jobs)
+    assert stats["compressed"] == 2
+    assert gzip.decompress((tmp_path / "a.html.gz").read_bytes()).decode("utf-8") == PAGE
+    assert not (tmp_path / "tiny.html.gz").exists()
+    assert not (tmp_path / "bild.png.gz").exists()
+    assert (tmp_path / STATE_NAME).exists()
+
+    again = precompress(tmp_path, jobs)
+    assert (again["compressed"], again["unchanged"]) == (0, 2)
+
+
+def test_rewritten_identical_file_is_not_recompressed(tmp_path):
+    page = tmp_path / "a.html"
+    page.write_text(PAGE, encoding="utf-8")
+    precompress(tmp_path)
+    page.unlink()
+    page.write_text(PAGE, encoding="utf-8")
+    assert precompress(tmp_path)["compressed"] == 0
+
+
+def test_siblings_of_removed_files_are_deleted(tmp_path):
+    (tmp_path / "seite").mkdir()
+    (tmp_path / "seite" / "index.html").write_text(PAGE, encoding="utf-8")
+    precompress(tmp_path)
+    (tmp_path / "seite" / "index.html").unlink()
+    stats = precompress(tmp_path)
+    assert stats["removed"] == 1
+    assert not (tmp_path / "seite").exists()
@@ -0,0 +1,69 @@
+import json
+import pickle
+
+import build_website as site
+from build_content import Card, ContentPage, Hero, clear_content_cache, load_content
+
+
+def write_sources(tmp_path):
+    first, second = tmp_path / "pages.json", tmp_path / "content" / "pages.json"
+    second.parent.mkdir()
+    first.write_text(json.dumps([
+        {"file": "index.html", "title": "Start", "headline": "Willkommen", "content": "Hallo"},
+        {"file": "about.html", "title": "Über", "content": "Wir"},
+    ]), encoding="utf-8")
+    # Windows-Editoren speichern mit BOM
+    second.write_text(json.dumps([{"slug": "index", "title": "Neu", "description": "D"}]), encoding="utf-8-sig")
+    (tmp_path / "content.json").write_text(json.dumps({"description": "Site"}), encoding="utf-8")
+    return [first, second]
+
+
+def test_json_sources_merge_over_legacy_pages(tmp_path):
+    clear_content_cache()
+    content = load_content(tmp_path / "content.json", write_sources(tmp_path), site.PAGES, {}, [])
+
+    index = content.pages["index.html"]
+    assert (index.title, index.headline, index.description, index.body) == ("Neu", "Willkommen", "D", "<p>Hallo</p>")
+    assert content.description_for(content.pages["about.html"]) == "Site"
+    # PAGES ohne JSON-Eintrag bleiben, wie sie sind
+    services = content.pages["services.html"]
+    assert isinstance(services.cards[0], Card) and len(services.cards) == 3
+    assert content.pages["contact.html"].title == "Kontakt – Lukas AI Solutions"
+
+
+def test_content_is_cached_until_a_source_changes(tmp_path):
+    clear_content_cache()
+    sources = write_sources(tmp_path)
+    args = (tmp_path / "content.json", sources, site.PAGES, site.LANDINGPAGES, site.PRICING_PLANS)
+    first = load_content(*args)
+    assert load_content(*args) is first
+
+    sources[0].write_text(json.dumps([{"file": "about.html", "title": "Team", "content": "Länger"}]), encoding="utf-8")
+    second = load_content(*args)
+    assert second is not first
+    assert second.pages["about.html"].title == "Team"
+
+
+def test_replace_shares_lists_and_pickle_drops_caches():
+    clear_content_cache()
+    base = site.site_content().landingpages["ai-automation"]
+    seo = base.replace(title="X", hero=Hero("X", "Y", "Z"))
+    assert seo.benefits is base.benefits and seo.problems is base.problems
+    assert seo.digest != base.digest
+
+    page = ContentPage.from_legacy("contact.html", site.PAGES["contact.html"])
+    assert page.text == "Jetzt anfragen: info@lukawebsite.de"
+    clone = pickle.loads(pickle.dumps(page))
+    assert clone == page and clone._text is None
+
+
+def test_subpages_without_entry_fall_back_to_template(tmp_path):
+    clear_content_cache()
+    source = tmp_path / "sub" / "pages.json"
+    source.parent.mkdir()
+    source.write_text(json.dumps([{"file": "a.html", "title": "A", "body": "<p>a</p>"}]), encoding="utf-8")
+    content = load_content(tmp_path / "none.json", [], {}, {}, [], [("demo", ["a.html", "b.html"], source)])
+
+    a, b = content.subpages["demo"]
+    assert a.page.body == "<p>a</p>" and a.rel_path == "a.html"
+    assert b.page is None
@@ -0,0 +1,59 @@
+from build_css import build_stylesheet, dedupe_rules, parse_css, purge_rules, scan_usage, serialize
+
+
+def dedupe(css):
+    return serialize(dedupe_rules(parse_css(css)))
+
+
+def test_duplicate_rules_keep_the_last_position():
+    assert dedupe("a{color:red}p{margin:0}a{color:red}") == "p{margin:0}a{color:red}"
+
+
+def test_duplicate_declarations_and_selectors_collapse():
+    assert dedupe("h1, h1 ,h2 { color: red; color: red; margin: 0 }") == "h1,h2{color:red;margin:0}"
+
+
+def test_rules_inside_media_queries_are_deduped_separately():
+    css = "p{margin:0}@media (max-width: 600px){p{margin:0}p{margin:0}}"
+    assert dedupe(css) == "p{margin:0}@media (max-width: 600px){p{margin:0}}"
+
+
+def test_statements_move_to_the_front():
+    css = "p{margin:0}@import url(\"a.css\");@import url(\"a.css\");"
+    assert dedupe(css).startswith('@import url("a.css");p{')
+    assert dedupe(css).count("@import") == 1
+
+
+def test_comments_and_strings_with_separators_survive_parsing():
+    css = "/* a{} */ a::after { content: \"x;y\"; background: url(a;b.png) }"
+    assert dedupe(css) == 'a::after{content:"x;y";background:url(a;b.png)}'
+
+
+def test_scan_usage_ignores_style_and_script_contents():
+    used = scan_usage(['<div class="hero big" id="top"><style>.ghost{}</style>'
+                       '<script>document.body.className = "x"</script></div>'])
+    assert {"div", ".hero", ".big", "#top"} <= used
+    assert ".ghost" not in used and "span" not in used
+
+
+def test_purge_drops_unused_selectors_and_empty_media_groups():
+    rules = parse_css(".hero h1{a:1}.unused{b:2}.hero:hover,.gone{c:3}@media print{.gone{d:4}}")
+    used = {".hero", "h1"}
+    assert serialize(purge_rules(rules, used)) == ".hero h1{a:1}.hero:hover{c:3}"
+
+
+def test_purge_keeps_at_rules_without_selectors():
+    rules = parse_css("@font-face{font-family:x}@keyframes spin{to{transform:rotate(1turn)}}")
+    assert serialize(purge_rules(rules, set())) == serialize(rules)
+
+
+def test_build_stylesheet_dedupes_across_sources_and_purges():
+    css, critical = build_stylesheet(["body{margin:0}.a{x:1}", "body{margin:0}.b{y:2}"], {"body", ".b"})
+    assert css == "body{margin:0}.b{y:2}"
+    assert critical == ""
+
+
+def test_critical_css_only_contains_head_rules():
+    css, critical = build_stylesheet(["body{margin:0}nav a{color:red}.card{x:1}"], {"body", "nav", "a", ".card"}, True)
+    assert critical == "body{margin:0}nav a{color:red}"
+    assert ".card" in css and "body{margin:0}" in css
@@ -0,0 +1,62 @@
+import json
+
+import build_website as site
+from build_fingerprint import MANIFEST_NAME, fingerprint_assets, fingerprinted_name
+from build_manifest import BuildManifest
+
+
+def test_hashed_name_changes_only_with_content(tmp_path):
+    css = tmp_path / "style.css"
+    css.write_text("body{}", encoding="utf-8")
+    dist = tmp_path / "dist"
+    first = fingerprint_assets(dist, css)
+    first.place()
+    first.finish()
+    href = first.url("style.css")
+    assert href.startswith("style.") and href.endswith(".css") and (dist / href).read_text() == "body{}"
+    assert fingerprint_assets(dist, css).url("style.css") == href
+    assert json.loads((dist / MANIFEST_NAME).read_text(encoding="utf-8")) == {"style.css": href}
+
+    css.write_text("body{color:red}", encoding="utf-8")
+    second = fingerprint_assets(dist, css)
+    second.place()
+    # Die alte Datei bleibt, bis die Seiten umgeschrieben sind
+    assert (dist / href).exists()
+    assert second.finish() == [href]
+    assert not (dist / href).exists() and (dist / second.url("style.css")).exists()
+
+
+def test_fingerprinted_name_keeps_directory():
+    assert fingerprinted_name("images/hero.png", "abcdef0123456789") == "images/hero.abcdef0123.png"
+
+
+def test_css_change_rebuilds_only_when_the_shared_stylesheet_changes(tmp_path, monkeypatch):
+    css = tmp_path / "style.css"
+    css.write_text("body{}", encoding="utf-8")
+    monkeypatch.setattr(site, "CSS_FILE", css)
+    monkeypatch.setattr(site, "IMG_DIR", tmp_path / "images")
+    monkeypatch.setattr(site, "ASSETS", None)
+    dist = tmp_path / "dist"
+
+    def build():
+        manifest = BuildManifest(dist)
+        assets = site.build_website(dist, manifest)
+        manifest.prune()
+        manifest.save()
+        assets.finish()
+        return manifest, assets
+
+    build()
+    # Regel ohne passendes Element → fliegt beim Purge raus, site.css bleibt gleich
+    css.write_text("body{}.unbenutzt{color:red}", encoding="utf-8")
+    manifest, _ = build()
+    assert manifest.built == 0
+
+    css.write_text("body{margin:0}", encoding="utf-8")
+    manifest, assets = build()
+    href = assets.url(site.SHARED_CSS)
+    assert f'href="{href}"' in (dist / "index.html").read_text(encoding="utf-8")
+    assert f'href="../{href}"' in (dist / "preise" / "index.html").read_text(encoding="utf-8")
+    # Alle Seiten binden site.css ein → alle neu, die alte Hash-Datei ist weg
+    assert manifest.built > 0 and manifest.skipped == 0
+    assert [p.name for p in dist.glob("site.*.css")] == [href]
@@ -0,0 +1,69 @@
+import json
+import struct
+
+import build_website as site
+from build_content import ContentPage
+from build_images import INDEX_NAME, pick_image, read_header, scan_images
+
+
+def png(width, height):
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">II", width, height) + b"\x08\x02\0\0\0"
+
+
+def jpeg(width, height):
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\0" + b"\0" * 9
+    sof = b"\xff\xc2" + struct.pack(">HBHH", 17, 8, height, width) + b"\0" * 10
+    return b"\xff\xd8" + app0 + sof
+
+
+def webp_vp8x(width, height):
+    return b"RIFF\0\0\0\0WEBPVP8X" + b"\0" * 8 + (width - 1).to_bytes(3, "little") + (height - 1).to_bytes(3, "little")
+
+
+def test_dimensions_come_from_headers(tmp_path):
+    for name, data, expected in [("a.png", png(640, 480), ("png", 640, 480)),
+                                 ("b.jpg", jpeg(1200, 800), ("jpeg", 1200, 800)),
+                                 ("c.webp", webp_vp8x(300, 200), ("webp", 300, 200)),
+                                 ("d.png", b"kaputt", (None, None, None))]:
+        (tmp_path / name).write_bytes(data)
+        assert read_header(tmp_path / name) == expected
+
+
+def test_index_reuses_entries_and_finds_renamed_files(tmp_path):
+    images, cache = tmp_path / "images", tmp_path / "dist"
+    images.mkdir()
+    (images / "a.png").write_bytes(png(10, 20))
+    first = scan_images(images, cache)
+    assert (first["a.png"].width, first["a.png"].height) == (10, 20)
+
+    (images / "a.png").rename(images / "b.png")
+    index = json.loads((cache / INDEX_NAME).read_text(encoding="utf-8"))
+    renamed = scan_images(images, cache)
+    assert list(renamed) == ["b.png"] and renamed["b.png"].sha256 == index["a.png"][2]
+
+
+def test_assignment_is_stable_when_images_are_added(tmp_path):
+    names = [f"{n}.png" for n in range(5)]
+    for name in names:
+        (tmp_path / name).write_bytes(png(1, 1))
+    images = list(scan_images(tmp_path).values())
+    keys = [f"seite-{n}.html" for n in range(50)]
+    before = {key: pick_image(images, key).name for key in keys}
+    assert before == {key: pick_image(list(reversed(images)), key).name for key in keys}
+
+    (tmp_path / "neu.png").write_bytes(png(1, 1))
+    after = {key: pick_image(list(scan_images(tmp_path).values()), key).name for key in keys}
+    # Nur Seiten, die das neue Bild gewinnen, wechseln
+    assert all(after[key] in (before[key], "neu.png") for key in keys)
+    assert pick_image([], "x") is None
+
+
+def test_content_pages_get_image_dimensions(tmp_path, monkeypatch):
+    images = tmp_path / "images"
+    images.mkdir()
+    (images / "hero.png").write_bytes(png(800, 600))
+    monkeypatch.setattr(site, "IMG_DIR", images)
+    page = ContentPage.from_legacy("services.html", site.PAGES["services.html"])
+    site.build_page(page, "D", site.get_all_images(tmp_path), tmp_path / "dist")
+    html = (tmp_path / "dist" / "services.html").read_text(encoding="utf-8")
+    assert html.count("width='800' height='600'") == len(page.cards)
@@ -0,0 +1,50 @@
+import build_website as site
+from build_manifest import BuildManifest, MANIFEST_NAME
+
+
+def build(base, pages):
+    """Mini-Pipeline wie im Hauptprogramm: rendern, verwaiste Outputs löschen, Manifest speichern"""
+    manifest = BuildManifest(base)
+    for rel_path, text in pages.items():
+        site.write_page(base, rel_path, str, (text,), {"text": text}, manifest)
+    removed = manifest.prune()
+    manifest.save()
+    return manifest, removed
+
+
+def test_unchanged_pages_are_skipped(tmp_path):
+    first, _ = build(tmp_path, {"a.html": "A", "b/index.html": "B"})
+    assert (first.built, first.skipped) == (2, 0)
+    assert (tmp_path / MANIFEST_NAME).exists()
+
+    second, _ = build(tmp_path, {"a.html": "A", "b/index.html": "B"})
+    assert (second.built, second.skipped) == (0, 2)
+
+
+def test_changed_inputs_rebuild_only_that_page(tmp_path):
+    build(tmp_path, {"a.html": "A", "b/index.html": "B"})
+    manifest, _ = build(tmp_path, {"a.html": "A2", "b/index.html": "B"})
+    assert (manifest.built, manifest.skipped) == (1, 1)
+    assert (tmp_path / "a.html").read_text(encoding="utf-8") == "A2"
+
+
+def test_deleted_output_is_rebuilt(tmp_path):
+    build(tmp_path, {"a.html": "A"})
+    (tmp_path / "a.html").unlink()
+    manifest, _ = build(tmp_path, {"a.html": "A"})
+    assert manifest.built == 1
+    assert (tmp_path / "a.html").exists()
+
+
+def test_outputs_without_source_are_pruned(tmp_path):
+    build(tmp_path, {"a.html": "A", "b/index.html": "B"})
+    _, removed = build(tmp_path, {"a.html": "A"})
+    assert removed == ["b/index.html"]
+    assert not (tmp_path / "b").exists()
+
+
+def test_template_version_invalidates_all_pages(tmp_path, monkeypatch):
+    build(tmp_path, {"a.html": "A"})
+    monkeypatch.setattr(site, "TEMPLATE_VERSION", "neu")
+    manifest, _ = build(tmp_path, {"a.html": "A"})
+    assert manifest.built == 1
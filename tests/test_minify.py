@@ -0,0 +1,41 @@
+from build_minify import minify_html
+
+
+def test_collapses_whitespace_and_drops_it_at_block_boundaries():
+    html = "<ul>\n    <li>  Eins  </li>\n    <li>Zwei</li>\n</ul>\n"
+    assert minify_html(html) == "<ul><li>Eins</li><li>Zwei</li></ul>"
+
+
+def test_keeps_single_space_between_inline_elements():
+    html = "<p><a href=\"x\">Link</a>\n   <span>Text</span></p>"
+    assert minify_html(html) == '<p><a href="x">Link</a> <span>Text</span></p>'
+
+
+def test_raw_blocks_are_preserved_byte_for_byte():
+    html = ("<div>\n<pre>  a\n    b</pre>\n<textarea>\n  x  </textarea>\n"
+            "<script>if (a  <  b) {\n  f();\n}</script>\n<style>p  {  color: red }</style>\n</div>")
+    out = minify_html(html)
+    for raw in ("<pre>  a\n    b</pre>", "<textarea>\n  x  </textarea>",
+                "<script>if (a  <  b) {\n  f();\n}</script>", "<style>p  {  color: red }</style>"):
+        assert raw in out
+
+
+def test_removes_comments_but_keeps_conditional_comments():
+    html = "<p>a<!-- weg -->b</p><!--[if IE]><p>alt</p><![endif]-->"
+    assert minify_html(html) == "<p>ab</p><!--[if IE]><p>alt</p><![endif]-->"
+
+
+def test_whitespace_inside_attribute_values_is_kept():
+    html = '<a   title="zwei  Leerzeichen"\n   href=\'a  b\' >x</a>'
+    assert minify_html(html) == '<a title="zwei  Leerzeichen" href=\'a  b\'>x</a>'
+
+
+def test_greater_than_inside_attribute_value_does_not_end_the_tag():
+    html = '<div data-x="a > b"   class="c">\n  y\n</div>'
+    assert minify_html(html) == '<div data-x="a > b" class="c">y</div>'
+
+
+def test_minify_is_idempotent():
+    html = "<html>\n<body>\n  <p>Hallo <b>Welt</b> !</p>\n</body>\n</html>\n"
+    once = minify_html(html)
+    assert minify_html(once) == once
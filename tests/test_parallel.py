@@ -0,0 +1,26 @@
+import build_website as site
+from build_parallel import parallel_map
+
+
+def square(x):
+    return x * x
+
+
+def test_parallel_map_keeps_order():
+    items = list(range(50))
+    assert list(parallel_map(square, items, jobs=2)) == [x * x for x in items]
+    assert list(parallel_map(square, iter(items), jobs=2, batch=7)) == [x * x for x in items]
+
+
+def test_parallel_map_runs_serial_for_one_job():
+    assert list(parallel_map(square, iter([3]), jobs=1)) == [9]
+
+
+def test_parallel_render_matches_serial(tmp_path):
+    serial, parallel = tmp_path / "serial", tmp_path / "parallel"
+    assert site.render_pages(serial, site.seo_page_specs(), jobs=1) == len(list(site.seo_page_specs()))
+    site.render_pages(parallel, site.seo_page_specs(), jobs=2)
+    files = sorted(p.relative_to(serial) for p in serial.rglob("*.html"))
+    assert files == sorted(p.relative_to(parallel) for p in parallel.rglob("*.html"))
+    for rel_path in files:
+        assert (serial / rel_path).read_bytes() == (parallel / rel_path).read_bytes()
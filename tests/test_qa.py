@@ -0,0 +1,251 @@
+import json
+import os
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import build_website as site
+from build_manifest import BuildManifest
+from build_archive import ArchiveReader, ArchiveWriter
+from build_qa import (CACHE_NAME, LinkIndex, check_thresholds, extract_page, find_broken_links, scan_pages,
+                     write_json_report, write_junit_report)
+
+try:
+    import bs4
+except ImportError:  # nur für die Paritätstests nötig (requirements-dev.txt)
+    bs4 = None
+
+needs_bs4 = pytest.mark.skipif(bs4 is None, reason="beautifulsoup4 fehlt")
+
+SAMPLES = [
+    "<html><head><title> Preise &amp; Pakete </title>"
+    '<meta name="description" content="  Klare Pakete  "></head>'
+    '<body><a href="a.html">A</a><a href="">leer</a><a>ohne</a><a href="#x">B</a></body></html>',
+    "<title>Erster</title><title>Zweiter</title>"
+    '<meta name="description" content="eins"><meta name="description" content="zwei">',
+    "<p>Text <script>var x = '<p>kein Text</p>';</script><style>p { color: red }</style>"
+    "<template><p>versteckt</p></template><!-- Kommentar --> sichtbar &uuml;&nbsp;</p>",
+    "<div>\n  <p>  viel   Whitespace  </p>\n\n  <ul><li>a</li><li> b </li></ul>\n</div>",
+    "<body><header><nav><a href='/'>Home</a></nav></header><main><h1>Titel</h1></main>"
+    "<footer>© 2024</footer></body>",
+    "<p>ungeschlossen <b>fett <i>kursiv</p> <br/> ende",
+]
+
+
+def soup_facts(html):
+    """QA-Fakten wie vor dem eigenen Extractor (BeautifulSoup + html.parser)"""
+    soup = bs4.BeautifulSoup(html, "html.parser")
+    title = soup.title.string.strip() if soup.title and soup.title.string else ""
+    description_tag = soup.find("meta", attrs={"name": "description"})
+    return {
+        "title": title,
+        "description": description_tag["content"].strip() if description_tag else "",
+        "links": [a.get("href") for a in soup.find_all("a") if a.get("href")],
+        "content_length": len(soup.get_text(strip=True)),
+    }
+
+
+def own_facts(html):
+    facts = extract_page(html)
+    return {key: facts[key] for key in ("title", "description", "links", "content_length")}
+
+
+@needs_bs4
+@pytest.mark.parametrize("html", SAMPLES)
+def test_extractor_matches_beautifulsoup(html):
+    assert own_facts(html) == soup_facts(html)
+
+
+@needs_bs4
+def test_extractor_matches_beautifulsoup_on_built_pages(tmp_path, monkeypatch):
+    monkeypatch.setattr(site, "IMG_DIR", tmp_path / "images")
+    site.build_all_pages(tmp_path / "dist", None, 1)
+    pages = sorted((tmp_path / "dist").rglob("*.html"))
+    assert pages
+    for path in pages:
+        html = path.read_text(encoding="utf-8")
+        assert own_facts(html) == soup_facts(html), path.name
+
+
+def write_site(dist, pages):
+    for rel, html in pages.items():
+        path = dist / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(html, encoding="utf-8")
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_scan_parses_only_unknown_content(tmp_path, jobs):
+    dist = tmp_path / "dist"
+    write_site(dist, {
+        "index.html": "<title>Start</title><a href='/a/'>a</a>",
+        "a/index.html": "<title>A</title>",
+        "b/index.html": "<title>A</title>",  # gleicher Inhalt → nur einmal geparst
+    })
+    pages, files, stats = scan_pages(dist, jobs=jobs)
+    assert stats == {"pages": 3, "parsed": 2, "cached": 1}
+    assert [p["title"] for p in pages] == ["A", "A", "Start"]
+    assert pages[2]["links"] == ["/a/"] and (dist / CACHE_NAME).exists()
+
+    _, _, stats = scan_pages(dist, jobs=jobs)
+    assert stats["parsed"] == 0
+
+    # Neu geschrieben mit gleichem Inhalt → Hash stimmt, kein Parse
+    (dist / "a" / "index.html").write_text("<title>A</title>", encoding="utf-8")
+    os.utime(dist / "a" / "index.html", ns=(1, 1))
+    write_site(dist, {"b/index.html": "<title>B</title>"})
+    (dist / "index.html").unlink()
+    pages, files, stats = scan_pages(dist, jobs=jobs)
+    assert stats == {"pages": 2, "parsed": 1, "cached": 1}
+    assert [p["title"] for p in pages] == ["A", "B"]
+    assert files == {CACHE_NAME, "a/index.html", "b/index.html"}
+
+
+def test_extractor_collects_refs_ids_and_srcset():
+    facts = extract_page('<a id="top" href="x.html">x</a>\n<img src="a.png" srcset="a-1.png 1x, a-2.png 2x">'
+                         '\n<a name="alt"></a><link rel="stylesheet" href="s.css"><div href="nein"></div>')
+    assert facts["refs"] == [["x.html", 1], ["a.png", 2], ["a-1.png", 2], ["a-2.png", 2], ["s.css", 3]]
+    assert facts["ids"] == ["top", "alt"]
+
+
+# ----------------------------
+# LinkIndex
+# ----------------------------
+FILES = ["index.html", "about.html", "blog/index.html", "blog/post.html", "site.css", "images/a b.png"]
+PAGES = [{"rel": "index.html", "ids": ["top"]}, {"rel": "blog/post.html", "ids": ["kommentare"]}]
+
+
+@pytest.fixture
+def index():
+    return LinkIndex(FILES, PAGES, "/website/")
+
+
+@pytest.mark.parametrize("source, url", [
+    ("index.html", "about.html"),
+    ("index.html", "blog/"),
+    ("index.html", "blog"),
+    ("blog/post.html", "../site.css"),
+    ("blog/post.html", "./"),
+    ("blog/post.html", "#kommentare"),
+    ("blog/index.html", "post.html#kommentare"),
+    ("blog/post.html", "../images/a%20b.png"),
+    ("index.html", "about.html?utm=x"),
+    ("blog/post.html", "/website/"),
+    ("blog/post.html", "/website"),
+    ("blog/post.html", "/website/index.html#top"),
+    ("blog/post.html", "/website/blog/"),
+    ("index.html", "https://example.com/nirgends"),
+    ("index.html", "mailto:info@example.com"),
+    ("index.html", "#"),
+])
+def test_resolves(index, source, url):
+    assert index.resolve(source, url) is None
+
+
+@pytest.mark.parametrize("source, url, reason", [
+    ("index.html", "fehlt.html", "Ziel fehlt"),
+    ("index.html", "../index.html", "Ziel fehlt"),
+    ("blog/post.html", "about.html", "Ziel fehlt"),
+    ("index.html", "#unten", "Anker #unten fehlt"),
+    ("index.html", "blog/post.html#oben", "Anker #oben fehlt"),
+    ("index.html", "/about.html", "außerhalb von /website/"),
+    ("index.html", "/websitex/", "außerhalb von /website/"),
+    ("index.html", "/website/fehlt/", "Ziel fehlt"),
+])
+def test_reports(index, source, url, reason):
+    assert index.resolve(source, url) == reason
+
+
+def test_relative_results_depend_on_the_source_directory(index):
+    # Gleiche URL, anderes Verzeichnis → darf nicht aus dem Memo der ersten Auflösung kommen
+    assert index.resolve("index.html", "site.css") is None
+    assert index.resolve("blog/post.html", "site.css") == "Ziel fehlt"
+
+
+def test_root_deploy_path_by_default():
+    assert LinkIndex(FILES, PAGES).resolve("blog/post.html", "/about.html") is None
+
+
+def test_find_broken_links_reports_line_numbers(index):
+    pages = [{"rel": "index.html", "refs": [["about.html", 3], ["fehlt.html", 7]]}]
+    assert list(find_broken_links(pages, index)) == [("index.html", 7, "fehlt.html", "Ziel fehlt")]
+
+
+def test_built_site_has_no_broken_links(tmp_path, monkeypatch):
+    monkeypatch.setattr(site, "IMG_DIR", tmp_path / "images")
+    dist = tmp_path / "dist"
+    manifest = BuildManifest(dist)
+    site.build_all_pages(dist, manifest, 1)
+    site.build_search(dist, manifest)  # suche.html bindet search/search.js ein
+    pages, files = site.scan_html_files(dist)
+    assert site.check_broken_links(pages, files) == []
+
+    page = dist / "preise" / "index.html"
+    page.write_text(page.read_text(encoding="utf-8") + '\n<a href="../fehlt/">x</a>\n', encoding="utf-8")
+    pages, files = site.scan_html_files(dist)
+    [(rel, line, url, reason)] = site.check_broken_links(pages, files)
+    assert (rel, url, reason) == ("preise/index.html", "../fehlt/", "Ziel fehlt")
+    assert line == page.read_text(encoding="utf-8").count("\n")
+
+
+def test_check_thresholds_ignores_unset_limits():
+    counts = {"broken_links": 2, "empty_pages": 5}
+    assert check_thresholds(counts, {"broken_links": 0, "empty_pages": None}) == ["broken_links: 2 > 0"]
+    assert check_thresholds(counts, {"broken_links": 2, "duplicate_clusters": 0}) == []
+
+
+def test_reports_group_findings_per_page(tmp_path):
+    def results():
+        # Generatoren wie in run_qa – jeder Bericht bekommt eigene
+        return {
+            "broken_links": iter([("a.html", 3, "x.html (Ziel fehlt)"), ("a.html", 9, "#y (Anker #y fehlt)"),
+                                  ("b.html", 1, "z.html (Ziel fehlt)")]),
+            "empty_pages": iter([]),
+        }
+    timings = {"broken_links": 0.5}
+    write_json_report(tmp_path / "qa.json", {"broken_links": 3}, timings, results())
+    write_junit_report(tmp_path / "qa.xml", timings, results())
+
+    report = json.loads((tmp_path / "qa.json").read_text(encoding="utf-8"))
+    assert report["summary"] == {"broken_links": 3} and report["timings"] == timings
+    assert report["findings"][1] == {"check": "broken_links", "page": "a.html", "line": 9,
+                                     "message": "#y (Anker #y fehlt)"}
+
+    broken, empty = ET.parse(tmp_path / "qa.xml").getroot()
+    assert (broken.get("tests"), broken.get("failures")) == ("2", "2")
+    assert [case.get("name") for case in broken] == ["a.html", "b.html"]
+    assert broken[0].find("failure").text == "a.html:3: x.html (Ziel fehlt)\na.html:9: #y (Anker #y fehlt)"
+    assert (empty.get("failures"), empty[0].get("name")) == ("0", "alle Seiten")
+
+
+def test_run_qa_fails_on_broken_link_and_keeps_reports_out_of_dist(tmp_path, monkeypatch):
+    monkeypatch.setattr(site, "IMG_DIR", tmp_path / "images")
+    dist = tmp_path / "dist"
+    manifest = BuildManifest(dist)
+    site.build_all_pages(dist, manifest, 1)
+    site.build_search(dist, manifest)
+    assert site.run_qa(dist) == []
+
+    page = dist / "preise" / "index.html"
+    page.write_text(page.read_text(encoding="utf-8") + '<a href="fehlt.html">x</a>', encoding="utf-8")
+    assert site.run_qa(dist) == ["broken_links: 1 > 0"]
+    assert site.run_qa(dist, limits={"broken_links": None}) == []
+
+    reports = tmp_path / site.QA_REPORT_DIR
+    assert sorted(p.name for p in reports.iterdir()) == ["build_report.txt", site.QA_JSON, site.QA_JUNIT]
+    assert not any((dist / name).exists() for name in ("build_report.txt", site.QA_JSON, site.QA_JUNIT))
+    summary = json.loads((reports / site.QA_JSON).read_text(encoding="utf-8"))["summary"]
+    assert summary["broken_links"] == 1 and summary["failures"] == []
+
+
+def test_run_qa_reads_archive(tmp_path):
+    with ArchiveWriter(tmp_path / "site.zip") as archive:
+        archive.write_chunks("index.html", ['<title>Start</title><a href="fehlt.html">x</a>'])
+    reader = ArchiveReader(tmp_path / "site.zip")
+    try:
+        failures = site.run_qa(reader, limits={"broken_links": 0}, report_dir=tmp_path / "reports")
+    finally:
+        reader.close()
+    assert failures == ["broken_links: 1 > 0"]
+    findings = json.loads((tmp_path / "reports" / site.QA_JSON).read_text(encoding="utf-8"))["findings"]
+    assert {"check": "broken_links", "page": "index.html", "line": 1, "message": "fehlt.html (Ziel fehlt)"} in findings
@@ -0,0 +1,28 @@
+import pytest
+
+from build_related import CACHE_NAME, build_related
+
+pytest.importorskip("numpy")
+
+
+def docs():
+    shared = "KI Automatisierung Prozesse Workflows Agenten Monitoring Integration " * 5
+    yield "kueche", "Küche", "d1", ("Rezepte Kochen Backen Zutaten Ofen Pfanne",)
+    yield "backen", "Backen", "d2", ("Rezepte Backen Zutaten Ofen Teig Kuchen",)
+    for n in range(6):
+        yield f"ki-{n}", f"KI {n}", f"k{n}", (f"Variante{n}", shared)
+
+
+def test_pages_link_to_similar_pages_relatively():
+    related = build_related(docs(), k=2)
+    assert set(related) == {"kueche", "backen"} | {f"ki-{n}" for n in range(6)}
+    assert related["kueche"][0] == ("../backen/", "Backen")
+    assert all(url.startswith("../ki-") for url, _ in related["ki-0"])
+    assert all(len(links) <= 2 for links in related.values())
+
+
+def test_unchanged_corpus_reuses_cached_result(tmp_path):
+    first = build_related(docs(), tmp_path)
+    assert (tmp_path / CACHE_NAME).exists()
+    assert build_related(docs(), tmp_path) == first
+    assert build_related([("a", "A", "x", ("text",))], tmp_path) == {}
@@ -0,0 +1,67 @@
+import json
+
+from build_archive import ArchiveReader, ArchiveWriter
+from build_search import INDEX_DIR, SearchCollector, build_search_index, page_terms
+
+PAGE = "<html><head><title>{title}</title></head><body><nav>Menü</nav><p>{text}</p><footer>Impressum</footer></body></html>"
+
+
+def write_pages(dist, pages):
+    for rel, (title, text) in pages.items():
+        path = dist / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(PAGE.format(title=title, text=text), encoding="utf-8")
+
+
+def read_index(dist, name):
+    return json.loads((dist / INDEX_DIR / name).read_text(encoding="utf-8"))
+
+
+def test_page_terms_skip_chrome_and_keep_positions():
+    title, terms = page_terms(PAGE.format(title="KI Büro", text="Die Automatisierung für Büros"))
+    assert title == "KI Büro"
+    assert "menue" not in terms and "impressum" not in terms
+    # Stoppwörter zählen bei den Positionen mit, damit Phrasen passen
+    assert terms["ki"] == [0] and terms["buero"] == [1] and terms["automatisierung"] == [3]
+
+
+def test_incremental_index_reads_only_changed_pages(tmp_path):
+    dist = tmp_path / "dist"
+    pages = {"index.html": ("Start", "Prozesse automatisieren"), "preise/index.html": ("Preise", "Starter Paket")}
+    write_pages(dist, pages)
+    first = build_search_index(dist, {"index.html": "a", "preise/index.html": "b"})
+    assert first["parsed"] == 2 and first["docs"] == 2
+    # URLs relativ zur Site-Wurzel – die Site läuft unter einem Unterpfad
+    assert read_index(dist, "docs-0.json") == [["", "Start"], ["preise/", "Preise"]]
+    assert read_index(dist, "terms-pa.json") == {"paket": [[1, 2]]}
+
+    second = build_search_index(dist, {"index.html": "a", "preise/index.html": "b"})
+    assert second["parsed"] == 0 and second["written"] == 0
+
+    write_pages(dist, {"preise/index.html": ("Preise", "Pro Abo")})
+    third = build_search_index(dist, {"index.html": "a", "preise/index.html": "c"})
+    assert third["parsed"] == 1 and third["removed"] == 1
+    assert not (dist / INDEX_DIR / "terms-pa.json").exists()
+    assert read_index(dist, "terms-ab.json") == {"abo": [[1, 2]]}
+
+
+def test_archive_index_matches_dist_index(tmp_path):
+    pages = {"index.html": ("Start", "Prozesse automatisieren"), "ki/index.html": ("KI", "Agenten einsetzen")}
+    dist = tmp_path / "dist"
+    write_pages(dist, pages)
+    build_search_index(dist, dict.fromkeys(pages, "x"))
+
+    search = SearchCollector()
+    with ArchiveWriter(tmp_path / "site.zip") as archive:
+        archive.observers.append(search)
+        for rel, (title, text) in pages.items():
+            archive.write_chunks(rel, [PAGE.format(title=title, text=text)])
+        archive.observers.remove(search)
+        search.write(archive)
+
+    reader = ArchiveReader(tmp_path / "site.zip")
+    try:
+        for path in (dist / INDEX_DIR).iterdir():
+            assert reader.read(f"{INDEX_DIR}/{path.name}") == path.read_bytes(), path.name
+    finally:
+        reader.close()
@@ -0,0 +1,34 @@
+import build_website as site
+from build_seo import SlugSet, expand_all, expand_keyword, normalize_slug
+
+
+def test_slugs_are_transliterated():
+    assert normalize_slug("ki-automatisierung", "für KMU") == "ki-automatisierung-fuer-kmu"
+    assert normalize_slug("Größe", "Café & Bar", None) == "groesse-cafe-bar"
+
+
+def test_expansion_is_lazy_and_covers_all_dimensions():
+    seo = {"intents": ["A", "B"], "industries": ["Handwerk"], "regions": ["Berlin", "Köln"]}
+    combos = expand_keyword("kw", seo)
+    assert next(combos) == ("kw-a-handwerk-berlin", "A – Handwerk in Berlin", "A", "Handwerk", "Berlin")
+    assert len(list(combos)) == 3
+    # Fehlende Dimensionen leeren das Produkt nicht
+    assert [c[0] for c in expand_keyword("kw", {"intents": ["X"]})] == ["kw-x"]
+
+
+def test_duplicates_and_reserved_slugs_are_skipped():
+    keywords = {
+        "kw": {"intents": ["Für KMU", "für kmu", "neu"]},
+        "kw-neu": {"intents": [None]},
+    }
+    seen = SlugSet(["kw-neu"])
+    slugs = [combo[0] for _, _, combo in expand_all(keywords, seen)]
+    assert slugs == ["kw-fuer-kmu"]
+    assert seen.duplicates == 3
+
+
+def test_seo_pages_never_overwrite_landingpages(monkeypatch):
+    monkeypatch.setattr(site, "SEO_KEYWORDS", {"ai": {"base_title": "AI", "intents": ["automation", "x"],
+                                                      "description_template": "{kw}"}})
+    paths = [spec[0] for spec in site.seo_page_specs()]
+    assert paths == ["ai-x/index.html"]
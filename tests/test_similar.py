@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import build_website as site  # noqa: E402
+from build_qa import extract_page  # noqa: E402
+from build_similar import NUM_PERM, lsh_rows, minhash, near_duplicates  # noqa: E402
+
+WORDS = ("ki automatisierung prozess workflow agent daten kunde angebot analyse system "
+         "team kosten zeit qualitaet bericht projekt support skalierung schnittstelle modell").split()
+
+
+def text(seed, length=300):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) + str(rng.randrange(50)) for _ in range(length))
+
+
+def variant(base, changes, seed=0):
+    """base mit `changes` ersetzten Wörtern"""
+    rng = random.Random(seed)
+    words = base.split()
+    for i in rng.sample(range(len(words)), changes):
+        words[i] = f"neu{i}"
+    return " ".join(words)
+
+
+def test_signature_is_deterministic_hex_of_num_perm_uint32():
+    sig = minhash(text(1))
+    assert sig == minhash(text(1))
+    assert len(sig) == NUM_PERM * 8
+    assert minhash("zu kurz") == ""
+
+
+def test_identical_pages_form_one_cluster():
+    base = text(1)
+    clusters = near_duplicates({"a.html": minhash(base), "b.html": minhash(base), "c.html": minhash(text(2))})
+    assert clusters == [(1.0, ["a.html", "b.html"])]
+
+
+def test_small_edits_cluster_but_distinct_pages_do_not():
+    base = text(3)
+    signatures = {
+        "original.html": minhash(base),
+        "kopie.html": minhash(variant(base, 3)),
+        "umgeschrieben.html": minhash(variant(base, 150)),
+        "anders.html": minhash(text(4)),
+    }
+    clusters = near_duplicates(signatures, threshold=0.8)
+    assert [members for _, members in clusters] == [["kopie.html", "original.html"]]
+    assert 0.8 <= clusters[0][0] < 1.0
+
+
+def test_clusters_are_transitive_and_sorted_by_size():
+    first, second = text(5), text(6)
+    signatures = {f"a{i}.html": minhash(first) for i in range(3)}
+    signatures.update({f"b{i}.html": minhash(second) for i in range(2)})
+    signatures["leer.html"] = ""
+    clusters = near_duplicates(signatures)
+    assert [members for _, members in clusters] == [["a0.html", "a1.html", "a2.html"], ["b0.html", "b1.html"]]
+
+
+def test_too_few_signatures():
+    assert near_duplicates({}) == []
+    assert near_duplicates({"a.html": minhash(text(7)), "b.html": ""}) == []
+
+
+@pytest.mark.parametrize("threshold", [0.5, 0.8, 0.9, 0.95])
+def test_lsh_bands_divide_signature(threshold):
+    rows = lsh_rows(threshold)
+    assert NUM_PERM % rows == 0
+    # Kandidaten-Schwelle liegt unter dem Grenzwert → echte Treffer werden nicht verpasst
+    assert (rows / NUM_PERM) ** (1 / rows) <= threshold
+
+
+def test_seo_pages_of_one_landing_page_form_one_cluster(tmp_path, monkeypatch):
+    monkeypatch.setattr(site, "IMG_DIR", tmp_path / "images")
+    dist = tmp_path / "dist"
+    site.build_all_pages(dist, None, 1)
+    pages, _ = site.scan_html_files(dist)
+
+    seo = {f"{slug}/index.html" for slug, *_ in site.seo_pages()}
+    clusters = site.check_near_duplicates(pages)
+    # Alle SEO-Seiten erben den Text von ai-automation – nur Titel und Hero unterscheiden sich
+    assert [set(members) for _, members in clusters] == [seo | {"ai-automation/index.html"}]
+    assert clusters[0][0] < 1.0
+
+
+def test_internal_links_do_not_count_as_content():
+    body = "<main><p>{}</p></main>".format(text(8, 60))
+    links = "<aside class='internal-links'><ul><li><a href='../x/'>{}</a></li></ul></aside>".format(text(9, 40))
+    assert extract_page(body + links)["minhash"] == extract_page(body)["minhash"]
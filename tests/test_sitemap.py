@@ -0,0 +1,63 @@
+import gzip
+import re
+
+import build_website as site
+from build_archive import ArchiveReader, ArchiveWriter
+from build_manifest import BuildManifest
+from build_sitemap import INDEX_NAME, page_url, write_sitemaps
+
+BASE = "https://example.org/site/"
+
+
+def locs(path):
+    return re.findall(r"<loc>([^<]+)</loc>", gzip.decompress(path.read_bytes()).decode("utf-8"))
+
+
+def test_page_urls_are_directory_style_and_encoded():
+    assert page_url("index.html", BASE) == "https://example.org/site/"
+    assert page_url("ki-für-kmu/index.html", BASE) == "https://example.org/site/ki-f%C3%BCr-kmu/"
+    assert page_url("about.html", BASE) == "https://example.org/site/about.html"
+
+
+def test_entries_are_split_into_shards_and_stale_shards_removed(tmp_path):
+    entries = [(f"p{i}/index.html", "2026-01-01T00:00:00Z") for i in range(5)] + [("site.css", None)]
+    result = write_sitemaps(tmp_path, entries, BASE, limit=2)
+    assert (result["urls"], result["shards"]) == (5, 3)
+    assert locs(tmp_path / "sitemap-3.xml.gz") == ["https://example.org/site/p4/"]
+    index = (tmp_path / INDEX_NAME).read_text(encoding="utf-8")
+    assert index.count("<sitemap>") == 3 and "<lastmod>2026-01-01T00:00:00Z</lastmod>" in index
+
+    first = (tmp_path / "sitemap-1.xml.gz").read_bytes()
+    write_sitemaps(tmp_path, entries[:2], BASE, limit=2)
+    assert sorted(p.name for p in tmp_path.glob("sitemap-*")) == ["sitemap-1.xml.gz"]
+    # Gleicher Inhalt → byte-identischer Shard (kein Zeitstempel im gzip-Header)
+    assert (tmp_path / "sitemap-1.xml.gz").read_bytes() == first
+
+
+def test_lastmod_survives_for_unchanged_pages(tmp_path):
+    first = BuildManifest(tmp_path)
+    first.started = "2026-01-01T00:00:00Z"
+    for rel in ("a.html", "b.html"):
+        first.needs_build(rel, rel)
+        (tmp_path / rel).write_text(rel)
+    first.save()
+
+    second = BuildManifest(tmp_path)
+    second.needs_build("a.html", "a.html")
+    second.needs_build("b.html", "neu")
+    lastmod = dict(second.entries())
+    assert lastmod["a.html"] == "2026-01-01T00:00:00Z"
+    assert lastmod["b.html"] == second.started
+
+
+def test_archive_build_contains_sitemap(tmp_path):
+    with ArchiveWriter(tmp_path / "site.zip") as archive:
+        site.build_landingpages(archive)
+        site.build_sitemap(archive)
+    reader = ArchiveReader(tmp_path / "site.zip")
+    try:
+        shard = gzip.decompress(reader.read("sitemap-1.xml.gz")).decode("utf-8")
+        assert "ai-automation/</loc>" in shard
+        assert "sitemap-1.xml.gz" in reader.read(INDEX_NAME).decode("utf-8")
+    finally:
+        reader.close()
@@ -0,0 +1,76 @@
+import pytest
+
+import build_templates
+from build_templates import FRAGMENTS, TemplateError, clear_cache, render_template
+
+
+def test_extends_overrides_blocks_and_keeps_defaults(templates):
+    templates("base.html", "<title>{% block title %}Standard{% endblock %}</title>\n"
+                           "<main>{% block body %}{% endblock %}</main>\n")
+    templates("page.html", '{% extends "base.html" %}\n{% block body %}{{ text }}{% endblock %}\n')
+    assert render_template("page.html", text="Hallo") == "<title>Standard</title>\n<main>Hallo</main>\n"
+
+
+def test_multi_level_inheritance_uses_nearest_override(templates):
+    templates("base.html", "[{% block a %}base{% endblock %}|{% block b %}base{% endblock %}]")
+    templates("mid.html", '{% extends "base.html" %}{% block a %}mid{% endblock %}{% block b %}mid{% endblock %}')
+    templates("leaf.html", '{% extends "mid.html" %}{% block b %}leaf{% endblock %}')
+    assert render_template("leaf.html") == "[mid|leaf]"
+
+
+def test_include_loops_and_conditions(templates):
+    templates("partials/item.html", "<li>{{ item }}</li>")
+    templates("list.html", "{% for item in items %}{% include \"partials/item.html\" %}{% endfor %}"
+                           "{% if not items %}leer{% endif %}")
+    assert render_template("list.html", items=["a", "b"]) == "<li>a</li><li>b</li>"
+    assert render_template("list.html", items=[]) == "leer"
+
+
+def test_block_tags_swallow_their_line(templates):
+    templates("lines.html", "<ul>\n    {% for x in xs %}\n<li>{{ x }}</li>\n    {% endfor %}\n</ul>\n")
+    assert render_template("lines.html", xs=[1, 2]) == "<ul>\n<li>1</li>\n<li>2</li>\n</ul>\n"
+
+
+def test_missing_template_raises(templates):
+    templates("broken.html", '{% extends "fehlt.html" %}')
+    with pytest.raises(TemplateError):
+        render_template("broken.html")
+
+
+def test_fragment_cache_keys_on_expression_values(templates):
+    templates("page.html", "{% cache %}<link href=\"{{ css }}\">{% endcache %}{{ body }}")
+    FRAGMENTS.drain()
+    assert render_template("page.html", css="a.css", body="1") == '<link href="a.css">1'
+    assert render_template("page.html", css="a.css", body="2") == '<link href="a.css">2'
+    assert render_template("page.html", css="b.css", body="3") == '<link href="b.css">3'
+    stats = FRAGMENTS.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+def test_fragment_cache_ignores_loop_variables_but_not_loop_source(templates):
+    templates("nav.html", "{% cache %}{% for link in links %}[{{ link }}]{% endfor %}{% endcache %}")
+    FRAGMENTS.drain()
+    assert render_template("nav.html", links=("a", "b")) == "[a][b]"
+    assert render_template("nav.html", links=("c",)) == "[c]"
+    assert FRAGMENTS.stats()["misses"] == 2
+
+
+def test_fragment_cache_renders_unhashable_inputs_directly(templates):
+    templates("page.html", "{% cache %}{{ items }}{% endcache %}")
+    FRAGMENTS.drain()
+    assert render_template("page.html", items=["x"]) == "['x']"
+    assert render_template("page.html", items=["y"]) == "['y']"
+    assert FRAGMENTS.stats()["uncached"] == 2
+
+
+def test_bytecode_cache_is_invalidated_by_parent_changes(templates):
+    templates("base.html", "A{% block x %}{% endblock %}")
+    templates("page.html", '{% extends "base.html" %}{% block x %}1{% endblock %}')
+    assert render_template("page.html") == "A1"
+    assert list(build_templates.CACHE_DIR.glob("*.bin"))
+
+    clear_cache()  # nur noch der Platten-Cache
+    assert render_template("page.html") == "A1"
+    templates("base.html", "B{% block x %}{% endblock %}")
+    clear_cache()
+    assert render_template("page.html") == "B1"
@@ -0,0 +1,26 @@
+import json
+
+from build_trace import BuildTracer
+
+
+def test_nested_stages_roll_up_pages_and_bytes(tmp_path):
+    tracer = BuildTracer()
+    tracer.record_pages = True
+    with tracer.stage("render"):
+        tracer.page("a.html", 0.1, 0.01, 100)
+        with tracer.stage("seo"):
+            tracer.page("b/index.html", 0.2, 0.02, 50)
+    assert [(s["name"], s["pages"], s["bytes"]) for s in tracer.stages] == [("seo", 1, 50), ("render", 2, 150)]
+    assert [p["stage"] for p in tracer.pages] == ["render", "seo"]
+
+    tracer.write_chrome_trace(tmp_path / "trace.json")
+    events = json.loads((tmp_path / "trace.json").read_text(encoding="utf-8"))["traceEvents"]
+    assert {e["cat"] for e in events} == {"stage", "page"}
+
+
+def test_pages_are_only_kept_on_request():
+    tracer = BuildTracer()
+    with tracer.stage("render"):
+        tracer.page("a.html", 0.1, 0.01, 100)
+    assert tracer.pages == []
+    assert tracer.stages[0]["pages"] == 1
@@ -0,0 +1,39 @@
+import build_watch
+from build_watch import diff_snapshots, snapshot, touches, watch
+
+
+def test_snapshot_diff_reports_changed_new_and_deleted_files(tmp_path):
+    (tmp_path / "a.css").write_text("a")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.html").write_text("b")
+    old = snapshot([tmp_path])
+
+    (tmp_path / "a.css").write_text("aa")
+    (tmp_path / "sub" / "b.html").unlink()
+    (tmp_path / "sub" / "c.html").write_text("c")
+    changed = diff_snapshots(old, snapshot([tmp_path]))
+    assert changed == {tmp_path / "a.css", tmp_path / "sub" / "b.html", tmp_path / "sub" / "c.html"}
+
+
+def test_touches_matches_files_and_directories(tmp_path):
+    changed = {tmp_path / "templates" / "partials" / "nav.html"}
+    assert touches(changed, tmp_path / "templates")
+    assert touches(changed, tmp_path / "templates" / "partials" / "nav.html")
+    assert not touches(changed, tmp_path / "images")
+
+
+def test_one_rebuild_per_batch(tmp_path, monkeypatch):
+    css, images = tmp_path / "style.css", tmp_path / "images"
+    css.write_text("a")
+    images.mkdir()
+    calls = []
+
+    def edit(_seconds):
+        # Erster Poll: Editor speichert CSS und ein Bild in einem Rutsch
+        if not calls and not (images / "x.png").exists():
+            css.write_text("body{}")
+            (images / "x.png").write_bytes(b"x")
+
+    monkeypatch.setattr(build_watch.time, "sleep", edit)
+    watch([css, images], calls.append, once=True)
+    assert calls == [{css, images / "x.png"}]